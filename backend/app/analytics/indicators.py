@@ -0,0 +1,165 @@
+"""
+Vectorized technical indicators.
+
+Every function takes a 2D float array shaped (stocks, days), oldest day
+first, with NaN for missing days, and computes the indicator for all
+stocks in one pass. A window that contains a missing value yields NaN.
+"""
+import numpy as np
+
+TRADING_DAYS_PER_YEAR = 252
+
+
+def _rolling_sum(values: np.ndarray, window: int):
+    """
+    Rolling sum and count of non-NaN values over the last `window` days.
+    """
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    zeros = np.zeros((values.shape[0], 1))
+    csum = np.concatenate([zeros, np.cumsum(filled, axis=1)], axis=1)
+    ccount = np.concatenate([zeros, np.cumsum(valid, axis=1)], axis=1)
+    sums = np.full(values.shape, np.nan)
+    counts = np.zeros(values.shape)
+    if values.shape[1] >= window:
+        sums[:, window - 1:] = csum[:, window:] - csum[:, :-window]
+        counts[:, window - 1:] = ccount[:, window:] - ccount[:, :-window]
+    return sums, counts
+
+
+def returns(close: np.ndarray) -> np.ndarray:
+    """
+    Daily simple returns.
+
+    Args:
+        close (np.ndarray): Closing prices.
+
+    Returns:
+        np.ndarray: close[t] / close[t-1] - 1, NaN on the first day.
+    """
+    result = np.full(close.shape, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result[:, 1:] = close[:, 1:] / close[:, :-1] - 1.0
+    result[~np.isfinite(result)] = np.nan
+    return result
+
+
+def moving_average(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Simple moving average.
+
+    Args:
+        values (np.ndarray): The input series.
+        window (int): The number of days.
+
+    Returns:
+        np.ndarray: The mean of the last `window` days.
+    """
+    sums, counts = _rolling_sum(values, window)
+    return np.where(counts == window, sums / window, np.nan)
+
+
+def rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Rolling sample standard deviation.
+
+    Args:
+        values (np.ndarray): The input series.
+        window (int): The number of days.
+
+    Returns:
+        np.ndarray: The standard deviation (ddof=1) of the last `window` days.
+    """
+    sums, counts = _rolling_sum(values, window)
+    square_sums, _ = _rolling_sum(values * values, window)
+    with np.errstate(invalid="ignore"):
+        variance = (square_sums - sums * sums / window) / (window - 1)
+    variance = np.maximum(variance, 0.0)
+    return np.where(counts == window, np.sqrt(variance), np.nan)
+
+
+def volatility(close: np.ndarray, window: int) -> np.ndarray:
+    """
+    Annualized rolling volatility of daily returns.
+
+    Args:
+        close (np.ndarray): Closing prices.
+        window (int): The number of days.
+
+    Returns:
+        np.ndarray: The annualized standard deviation of returns.
+    """
+    return rolling_std(returns(close), window) * np.sqrt(TRADING_DAYS_PER_YEAR)
+
+
+def rsi(close: np.ndarray, window: int = 14) -> np.ndarray:
+    """
+    Relative Strength Index with Wilder's smoothing.
+
+    The smoothing is recursive in time, so it steps over days while
+    computing all stocks at once. Each stock's averages are seeded from its
+    first `window` consecutive price changes and seeded again after a
+    missing day, so a listing or a halt inside the lookback only hides RSI
+    until `window` changes follow it.
+
+    Args:
+        close (np.ndarray): Closing prices.
+        window (int, optional): The smoothing period. Defaults to 14.
+
+    Returns:
+        np.ndarray: RSI between 0 and 100.
+    """
+    stocks, days = close.shape
+    result = np.full(close.shape, np.nan)
+    if days <= window:
+        return result
+    delta = np.diff(close, axis=1)
+    valid = ~np.isnan(delta)
+    gains = np.where(delta > 0, delta, 0.0)
+    losses = np.where(delta < 0, -delta, 0.0)
+    gains[~valid] = np.nan
+    losses[~valid] = np.nan
+    # 시드 값: 각 날짜로 끝나는 window개 변화의 평균 (결측이 있으면 NaN)
+    seed_gain = _rolling_sum(gains, window)[0] / window
+    seed_loss = _rolling_sum(losses, window)[0] / window
+
+    # 결측 없이 이어진 변화의 수. window에 닿으면 평균을 새로 시작한다.
+    run = np.zeros(stocks, dtype=int)
+    average_gain = np.full(stocks, np.nan)
+    average_loss = np.full(stocks, np.nan)
+    for step in range(days - 1):
+        run = np.where(valid[:, step], run + 1, 0)
+        seeded = run == window
+        average_gain = np.where(
+            seeded, seed_gain[:, step],
+            np.where(run > window, (average_gain * (window - 1) + gains[:, step]) / window, np.nan)
+        )
+        average_loss = np.where(
+            seeded, seed_loss[:, step],
+            np.where(run > window, (average_loss * (window - 1) + losses[:, step]) / window, np.nan)
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            strength = average_gain / average_loss
+        value = 100.0 - 100.0 / (1.0 + strength)
+        value = np.where(average_loss == 0, np.where(average_gain == 0, 50.0, 100.0), value)
+        result[:, step + 1] = np.where(run >= window, value, np.nan)
+    return result
+
+
+def zscore(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Rolling z-score of each day against the last `window` days.
+
+    Args:
+        values (np.ndarray): The input series, e.g. traded volume.
+        window (int): The number of days.
+
+    Returns:
+        np.ndarray: (value - rolling mean) / rolling standard deviation.
+    """
+    mean = moving_average(values, window)
+    std = rolling_std(values, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = (values - mean) / std
+    result[~np.isfinite(result)] = np.nan
+    return result
@@ -0,0 +1,247 @@
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, List, Dict, Optional, Tuple
+
+import asyncpg
+
+from dao.stock_info_queries import escape_like, select_columns
+from models.stock_info import StockInfoRecord
+from monitoring.metrics import DB_ACQUIRE_SECONDS, observe_query
+
+# 순위: 코드 완전 일치(0) > 종목명 접두 일치(1) > 부분 일치(2).
+# 정렬과 커서 비교는 "C" collation으로 해서 메모리 색인과 같은 순서를 쓴다.
+SEARCH_QUERY = """
+    SELECT {columns}, rank
+    FROM (
+        SELECT short_code, isin_code, market_category, item_name, corporate_number, corporate_name,
+            CASE
+                WHEN lower(short_code) = lower($1) OR lower(isin_code) = lower($1) THEN 0
+                WHEN item_name ILIKE $2 THEN 1
+                ELSE 2
+            END AS rank
+        FROM stock_info
+        WHERE short_code ILIKE $3 OR isin_code ILIKE $3 OR market_category ILIKE $3 OR item_name ILIKE $3
+            OR corporate_number ILIKE $3 OR corporate_name ILIKE $3
+    ) ranked
+    WHERE $4::int IS NULL
+        OR (rank, item_name COLLATE "C", short_code COLLATE "C") > ($4::int, $5::text, $6::text)
+    ORDER BY rank, item_name COLLATE "C", short_code COLLATE "C"
+    LIMIT $7
+"""
+
+_pool: Optional[asyncpg.Pool] = None
+_pool_lock = asyncio.Lock()
+
+
+async def get_async_pool() -> asyncpg.Pool:
+    """
+    Get the process-wide asyncpg pool, creating it on first use.
+
+    Returns:
+        asyncpg.Pool: The shared pool configured from environment variables.
+    """
+    global _pool
+    if _pool is None:
+        async with _pool_lock:
+            if _pool is None:
+                _pool = await asyncpg.create_pool(
+                    host=os.getenv("POSTGRES_HOST", "db"),  # docker-compose 서비스 이름
+                    database=os.getenv("POSTGRES_DB"),
+                    user=os.getenv("POSTGRES_USER"),
+                    password=os.getenv("POSTGRES_PASSWORD"),
+                    min_size=int(os.getenv("DB_POOL_MIN_SIZE", "1")),
+                    max_size=int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+                    timeout=float(os.getenv("DB_POOL_TIMEOUT", "5")),
+                )
+    return _pool
+
+
+def async_pool_stats() -> Optional[Dict]:
+    """
+    Get the size of the shared asyncpg pool without creating it.
+
+    Returns:
+        Dict: The pool size, idle connections and maximum size, or None if
+        the pool has not been created yet.
+    """
+    if _pool is None:
+        return None
+    return {"size": _pool.get_size(), "idle": _pool.get_idle_size(), "max_size": _pool.get_max_size()}
+
+
+async def close_async_pool():
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+
+@asynccontextmanager
+async def acquire_connection(pool: asyncpg.Pool) -> AsyncIterator[asyncpg.Connection]:
+    """
+    Check out a pooled connection, recording how long the checkout waited.
+
+    Args:
+        pool (asyncpg.Pool): The pool to borrow from.
+
+    Yields:
+        asyncpg.Connection: The connection, returned to the pool on exit.
+    """
+    started = time.perf_counter()
+    async with pool.acquire() as connection:
+        DB_ACQUIRE_SECONDS.labels("asyncpg").observe(time.perf_counter() - started)
+        yield connection
+
+
+async def fetch_rows(pool: asyncpg.Pool, name: str, query: str, *args) -> List[asyncpg.Record]:
+    """
+    Run a query on a pooled connection and record its duration and row count.
+
+    Args:
+        pool (asyncpg.Pool): The pool to borrow from.
+        name (str): The query name used as the metrics label.
+        query (str): The query.
+        *args: The query arguments.
+
+    Returns:
+        List[asyncpg.Record]: The rows.
+    """
+    async with acquire_connection(pool) as connection:
+        started = time.perf_counter()
+        rows = await connection.fetch(query, *args)
+    observe_query(name, time.perf_counter() - started, len(rows))
+    return rows
+
+
+async def fetch_row(pool: asyncpg.Pool, name: str, query: str, *args) -> Optional[asyncpg.Record]:
+    """Same as fetch_rows for a query that returns at most one row."""
+    async with acquire_connection(pool) as connection:
+        started = time.perf_counter()
+        row = await connection.fetchrow(query, *args)
+    observe_query(name, time.perf_counter() - started, 0 if row is None else 1)
+    return row
+
+
+async def fetch_value(pool: asyncpg.Pool, name: str, query: str, *args) -> Any:
+    """Same as fetch_rows for a query that returns a single value."""
+    row = await fetch_row(pool, name, query, *args)
+    return row[0] if row is not None else None
+
+
+class AsyncStockInfoDAO:
+    """
+    asyncio counterpart of StockInfoDAO. Queries borrow a connection from the
+    asyncpg pool only while they run, so waiting on Postgres does not hold a
+    threadpool slot. The shared pool is created on the first query, so
+    requests that never reach the database do not need it.
+    """
+
+    def __init__(self, pool: Optional[asyncpg.Pool] = None):
+        self._pool = pool
+
+    async def get_pool(self) -> asyncpg.Pool:
+        if self._pool is None:
+            self._pool = await get_async_pool()
+        return self._pool
+
+    async def _fetch_stock_info_rows(self, limit: Optional[int], after_short_code: Optional[str],
+                                     columns: Optional[List[str]] = None) -> List[asyncpg.Record]:
+        query = f"""
+            SELECT {', '.join(select_columns(columns, required=["short_code"]))}
+            FROM stock_info
+            WHERE $1::text IS NULL OR short_code COLLATE "C" > $1
+            ORDER BY short_code COLLATE "C"
+            LIMIT $2
+        """
+        pool = await self.get_pool()
+        return await fetch_rows(pool, "fetch_stock_info", query, after_short_code, limit)
+
+    async def fetch_stock_info(self, limit: Optional[int] = None, after_short_code: Optional[str] = None,
+                               columns: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Fetch stock information ordered by short_code, one keyset page at a time.
+
+        Args:
+            limit (int, optional): The maximum number of rows. Defaults to all rows.
+            after_short_code (str, optional): Return rows after this short_code.
+            columns (List[str], optional): Columns to select. short_code is
+                always included. Defaults to all columns.
+
+        Returns:
+            List[Dict]: A list of dictionaries containing stock information.
+        """
+        rows = await self._fetch_stock_info_rows(limit, after_short_code, columns)
+        return [dict(row) for row in rows]
+
+    async def fetch_stock_info_records(self, limit: Optional[int] = None, after_short_code: Optional[str] = None) -> List[StockInfoRecord]:
+        """
+        Same as fetch_stock_info, but returns compact StockInfoRecord objects.
+
+        Returns:
+            List[StockInfoRecord]: Stock information records.
+        """
+        rows = await self._fetch_stock_info_rows(limit, after_short_code)
+        return [StockInfoRecord(*row) for row in rows]
+
+    async def search_stock_info(self, query: str, limit: Optional[int] = None, after: Optional[Tuple] = None,
+                                columns: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Search stock information by query, best matches first.
+
+        Args:
+            query (str): The search query.
+            limit (int, optional): The maximum number of rows. Defaults to all matches.
+            after (Tuple, optional): The (rank, item_name, short_code) key of
+                the last row of the previous page.
+            columns (List[str], optional): Columns to select. item_name and
+                short_code are always included. Defaults to all columns.
+
+        Returns:
+            List[Dict]: A list of dictionaries containing stock information
+            and the match rank.
+        """
+        after_rank, after_name, after_code = after if after is not None else (None, None, None)
+        pool = await self.get_pool()
+        sql = SEARCH_QUERY.format(columns=", ".join(select_columns(columns, required=["item_name", "short_code"])))
+        rows = await fetch_rows(
+            pool, "search_stock_info", sql, query, f"{escape_like(query)}%", f"%{escape_like(query)}%",
+            after_rank, after_name, after_code, limit
+        )
+        return [dict(row) for row in rows]
+
+    async def fetch_stock_info_by_keys(self, short_codes: List[str], isin_codes: List[str],
+                                       item_names: List[str]) -> List[Dict]:
+        """
+        Fetch the stocks matching any of the given codes or exact names.
+
+        Args:
+            short_codes (List[str]): Short codes to look up.
+            isin_codes (List[str]): ISIN codes to look up.
+            item_names (List[str]): Exact item names to look up.
+
+        Returns:
+            List[Dict]: The matching rows, in no particular order.
+        """
+        pool = await self.get_pool()
+        rows = await fetch_rows(pool, "fetch_stock_info_by_keys", f"""
+            SELECT {', '.join(select_columns(None))}
+            FROM stock_info
+            WHERE short_code = ANY($1::text[]) OR isin_code = ANY($2::text[]) OR item_name = ANY($3::text[])
+        """, short_codes, isin_codes, item_names)
+        return [dict(row) for row in rows]
+
+    async def fetch_data_version(self) -> str:
+        """
+        Fetch a token that changes whenever stock_info is modified.
+
+        Returns:
+            str: The data version built from the row count and the latest update time.
+        """
+        pool = await self.get_pool()
+        count, last_update = await fetch_row(
+            pool, "fetch_data_version", "SELECT count(*), max(update_datetime) FROM stock_info"
+        )
+        last_update = last_update.isoformat() if last_update else ""
+        return f"{count}-{last_update}"
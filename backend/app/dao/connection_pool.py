@@ -0,0 +1,239 @@
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+import psycopg2
+
+from monitoring.metrics import DB_ACQUIRE_SECONDS
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection becomes available within the acquire timeout."""
+
+
+class ConnectionPool:
+    """
+    Thread-safe psycopg2 connection pool.
+
+    Connections are health-checked when they are checked out and replaced
+    when they turn out to be broken, so a dropped database connection is
+    re-established on the next request instead of failing forever.
+    """
+
+    def __init__(self, min_size: int = 1, max_size: int = 10, acquire_timeout: float = 5.0,
+                 health_check_interval: float = 30.0, **connect_kwargs):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError(f"Invalid pool size: min={min_size}, max={max_size}")
+        self.min_size = min_size
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.health_check_interval = health_check_interval
+        self.connect_kwargs = connect_kwargs
+
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_size)
+        # (connection, last_used) 쌍. 가장 최근에 반납된 연결을 먼저 재사용한다.
+        self._idle = deque()
+        self._size = 0
+        self._in_use = 0
+
+        self._acquire_count = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+        self._timeouts = 0
+        self._broken = 0
+
+        for _ in range(min_size):
+            self._idle.append((self._connect(), time.monotonic()))
+
+    def _connect(self):
+        connection = psycopg2.connect(**self.connect_kwargs)
+        with self._lock:
+            self._size += 1
+        return connection
+
+    def _discard(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+        with self._lock:
+            self._size -= 1
+
+    def _is_healthy(self, connection, last_used: float) -> bool:
+        if connection.closed:
+            return False
+        if time.monotonic() - last_used < self.health_check_interval:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            connection.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def getconn(self):
+        """
+        Check out a connection, waiting up to acquire_timeout for a free slot.
+
+        Returns:
+            connection: A healthy psycopg2 connection.
+
+        Raises:
+            PoolTimeout: If the pool stays exhausted for the whole timeout.
+        """
+        started = time.perf_counter()
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            with self._lock:
+                self._timeouts += 1
+            raise PoolTimeout(f"No database connection available within {self.acquire_timeout}s")
+
+        try:
+            connection = None
+            while connection is None:
+                with self._lock:
+                    idle = self._idle.pop() if self._idle else None
+                if idle is None:
+                    connection = self._connect()
+                elif self._is_healthy(*idle):
+                    connection = idle[0]
+                else:
+                    self._discard(idle[0])
+                    with self._lock:
+                        self._broken += 1
+        except Exception:
+            self._slots.release()
+            raise
+
+        waited = time.perf_counter() - started
+        DB_ACQUIRE_SECONDS.labels("psycopg2").observe(waited)
+        with self._lock:
+            self._in_use += 1
+            self._acquire_count += 1
+            self._wait_time_total += waited
+            self._wait_time_max = max(self._wait_time_max, waited)
+        return connection
+
+    def putconn(self, connection, discard: bool = False):
+        """
+        Return a connection to the pool.
+
+        Args:
+            connection: The connection checked out with getconn.
+            discard (bool, optional): Close the connection instead of reusing it.
+        """
+        try:
+            if not discard and not connection.closed:
+                try:
+                    if connection.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                        connection.rollback()
+                except psycopg2.Error:
+                    discard = True
+            if discard or connection.closed:
+                self._discard(connection)
+                with self._lock:
+                    self._broken += 1
+            else:
+                with self._lock:
+                    self._idle.append((connection, time.monotonic()))
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        """
+        Check out a connection for the duration of a with block.
+
+        Connections that fail with a connection-level error are discarded
+        so the next checkout opens a fresh one.
+        """
+        connection = self.getconn()
+        discard = False
+        try:
+            yield connection
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            discard = True
+            raise
+        finally:
+            self.putconn(connection, discard=discard)
+
+    def stats(self) -> Dict:
+        """
+        Get pool usage metrics.
+
+        Returns:
+            Dict: Pool size, connections in use and checkout wait times.
+        """
+        with self._lock:
+            return {
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "size": self._size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "acquire_count": self._acquire_count,
+                "wait_time_total": self._wait_time_total,
+                "wait_time_avg": self._wait_time_total / self._acquire_count if self._acquire_count else 0.0,
+                "wait_time_max": self._wait_time_max,
+                "timeouts": self._timeouts,
+                "broken_connections": self._broken,
+            }
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for connection, _ in idle:
+            self._discard(connection)
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_connection_pool() -> ConnectionPool:
+    """
+    Get the process-wide connection pool, creating it on first use.
+
+    Returns:
+        ConnectionPool: The shared pool configured from environment variables.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    min_size=int(os.getenv("DB_POOL_MIN_SIZE", "1")),
+                    max_size=int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+                    acquire_timeout=float(os.getenv("DB_POOL_TIMEOUT", "5")),
+                    health_check_interval=float(os.getenv("DB_POOL_HEALTH_CHECK_INTERVAL", "30")),
+                    host=os.getenv("POSTGRES_HOST", "db"),  # docker-compose 서비스 이름
+                    database=os.getenv("POSTGRES_DB"),
+                    user=os.getenv("POSTGRES_USER"),
+                    password=os.getenv("POSTGRES_PASSWORD")
+                )
+    return _pool
+
+
+def connection_pool_stats() -> Optional[Dict]:
+    """
+    Get the shared pool's metrics without creating it.
+
+    Returns:
+        Dict: See ConnectionPool.stats(), or None if the pool has not been created yet.
+    """
+    pool = _pool
+    return pool.stats() if pool is not None else None
+
+
+def close_connection_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
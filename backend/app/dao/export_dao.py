@@ -0,0 +1,149 @@
+import asyncio
+import os
+import time
+from datetime import date
+from decimal import Decimal
+from typing import AsyncIterator, List, Optional, Tuple
+
+import asyncpg
+import orjson
+
+from dao.async_stock_info_dao import acquire_connection, get_async_pool
+from dao.stock_info_queries import STOCK_INFO_COLUMNS
+from monitoring.metrics import observe_query
+
+STOCK_PRICE_COLUMNS = [
+    "bas_dt", "short_code", "isin_code", "item_name", "market_category", "clpr", "vs", "flt_rt",
+    "mkp", "hipr", "lopr", "trqu", "tr_prc", "lstg_st_cnt", "mrkt_tot_amt",
+]
+# NDJSON은 서버 측 커서에서 이만큼씩 읽어 한 덩어리로 보낸다.
+EXPORT_FETCH_ROWS = int(os.getenv("EXPORT_FETCH_ROWS", "2000"))
+# COPY 출력이 클라이언트보다 빠를 때 메모리에 쌓아 두는 최대 덩어리 수
+EXPORT_QUEUE_SIZE = int(os.getenv("EXPORT_QUEUE_SIZE", "8"))
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError
+
+
+def build_export_query(dataset: str, start: Optional[date] = None, end: Optional[date] = None) -> Tuple[str, List]:
+    """
+    Build the query of an export.
+
+    Args:
+        dataset (str): "stock_info" or "prices".
+        start (date, optional): For prices, the first bas_dt, inclusive.
+        end (date, optional): For prices, the last bas_dt, inclusive.
+
+    Returns:
+        Tuple[str, List]: The query and its arguments.
+
+    Raises:
+        ValueError: If the dataset is unknown.
+    """
+    if dataset == "stock_info":
+        return f"SELECT {', '.join(STOCK_INFO_COLUMNS)} FROM stock_info ORDER BY short_code", []
+    if dataset != "prices":
+        raise ValueError(f"Unknown export dataset: {dataset}")
+    # 조건을 있는 것만 붙여야 파티션 제외(pruning)가 된다.
+    conditions, args = [], []
+    if start is not None:
+        args.append(start)
+        conditions.append(f"bas_dt >= ${len(args)}")
+    if end is not None:
+        args.append(end)
+        conditions.append(f"bas_dt <= ${len(args)}")
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    return f"SELECT {', '.join(STOCK_PRICE_COLUMNS)} FROM stock_price{where} ORDER BY short_code, bas_dt", args
+
+
+class ExportDAO:
+    """
+    Streams whole tables out of Postgres without materializing them.
+
+    Each export holds one pooled connection for as long as the client keeps
+    reading, and the database is read only as fast as the client consumes
+    the stream.
+    """
+
+    def __init__(self, pool: Optional[asyncpg.Pool] = None):
+        self._pool = pool
+
+    async def get_pool(self) -> asyncpg.Pool:
+        if self._pool is None:
+            self._pool = await get_async_pool()
+        return self._pool
+
+    async def stream_csv(self, query: str, *args) -> AsyncIterator[bytes]:
+        """
+        Stream a query as CSV with a header row, using COPY ... TO STDOUT.
+
+        Args:
+            query (str): The query to export.
+            *args: The query arguments.
+
+        Yields:
+            bytes: CSV chunks as Postgres sends them.
+        """
+        pool = await self.get_pool()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=EXPORT_QUEUE_SIZE)
+        error = None
+
+        async def write(chunk):
+            # 큐가 차면 여기서 기다리므로 COPY도 클라이언트 속도에 맞춰 진행된다.
+            await queue.put(bytes(chunk))
+
+        async def produce():
+            nonlocal error
+            try:
+                async with acquire_connection(pool) as connection:
+                    started = time.perf_counter()
+                    await connection.copy_from_query(query, *args, output=write, format="csv", header=True)
+                    observe_query("export_csv", time.perf_counter() - started)
+            except Exception as e:
+                error = e
+            await queue.put(None)
+
+        task = asyncio.create_task(produce())
+        try:
+            while True:
+                chunk = await queue.get()
+                if chunk is None:
+                    break
+                yield chunk
+            if error is not None:
+                raise error
+        finally:
+            # 클라이언트가 끊으면 COPY를 중단하고 연결을 풀에 돌려준다.
+            task.cancel()
+
+    async def stream_ndjson(self, query: str, *args) -> AsyncIterator[bytes]:
+        """
+        Stream a query as newline-delimited JSON through a server-side cursor.
+
+        Args:
+            query (str): The query to export.
+            *args: The query arguments.
+
+        Yields:
+            bytes: Chunks of up to EXPORT_FETCH_ROWS JSON lines.
+        """
+        pool = await self.get_pool()
+        async with acquire_connection(pool) as connection:
+            started = time.perf_counter()
+            row_count = 0
+            # 서버 측 커서는 트랜잭션 안에서만 쓸 수 있다.
+            async with connection.transaction(readonly=True):
+                cursor = await connection.cursor(query, *args)
+                while True:
+                    rows = await cursor.fetch(EXPORT_FETCH_ROWS)
+                    if not rows:
+                        break
+                    row_count += len(rows)
+                    yield b"".join(
+                        orjson.dumps(dict(row), default=_json_default, option=orjson.OPT_APPEND_NEWLINE)
+                        for row in rows
+                    )
+            observe_query("export_ndjson", time.perf_counter() - started, row_count)
@@ -0,0 +1,45 @@
+from typing import Dict, List, Optional
+
+import asyncpg
+import orjson
+
+from dao.async_stock_info_dao import fetch_rows, get_async_pool
+
+
+class IngestionRunDAO:
+    """
+    Read access to ingestion_run, which the ingestion scheduler writes once
+    per download attempt.
+    """
+
+    def __init__(self, pool: Optional[asyncpg.Pool] = None):
+        self._pool = pool
+
+    async def get_pool(self) -> asyncpg.Pool:
+        if self._pool is None:
+            self._pool = await get_async_pool()
+        return self._pool
+
+    async def fetch_latest_runs(self) -> List[Dict]:
+        """
+        Fetch the most recent run of every status.
+
+        Returns:
+            List[Dict]: One run per status ('success', 'failed') with the run
+            count of that status and the decoded metrics object.
+        """
+        pool = await self.get_pool()
+        rows = await fetch_rows(pool, "fetch_latest_runs", """
+            SELECT DISTINCT ON (status)
+                status, finished_at, duration_ms, inserted, updated, unchanged, prices, metrics,
+                count(*) OVER (PARTITION BY status) AS runs
+            FROM ingestion_run
+            ORDER BY status, started_at DESC
+        """)
+        runs = []
+        for row in rows:
+            run = dict(row)
+            # asyncpg는 jsonb를 문자열로 돌려준다.
+            run["metrics"] = orjson.loads(run["metrics"]) if run["metrics"] else {}
+            runs.append(run)
+        return runs
@@ -0,0 +1,115 @@
+import asyncio
+import os
+from typing import Awaitable, Callable, Optional
+
+import asyncpg
+
+# 적재 프로세스(backend/db/db_utils.py)가 NOTIFY 하는 채널
+DATA_CHANGED_CHANNEL = "stock_data_changed"
+RECONNECT_MIN_DELAY = 1.0
+RECONNECT_MAX_DELAY = 60.0
+# 반쯤 열린 TCP 연결(NAT/유휴 타임아웃, RST 없는 장애 조치)은 종료 콜백이 오지 않으므로 주기적으로 확인한다.
+PING_INTERVAL = float(os.getenv("STOCK_LISTENER_PING_SECONDS", "30"))
+PING_TIMEOUT = float(os.getenv("STOCK_LISTENER_PING_TIMEOUT", "5"))
+
+
+class NotificationListener:
+    """
+    Background LISTEN on a Postgres channel.
+
+    The listener holds its own connection (not a pool connection) for the
+    lifetime of the worker. Notifications are coalesced: while the callback
+    runs, further notifications only keep the latest payload, and the
+    callback is skipped when the payload equals the last one handled. After
+    every (re)connect the callback runs once with None, because
+    notifications sent while disconnected are lost.
+
+    The connection is pinged every PING_INTERVAL seconds. A connection that
+    does not answer within PING_TIMEOUT is treated as lost and reconnected,
+    since a half-open connection never reports that it was closed.
+    """
+
+    def __init__(self, callback: Callable[[Optional[str]], Awaitable[None]], channel: str = DATA_CHANGED_CHANNEL):
+        self.callback = callback
+        self.channel = channel
+        self.last_payload = None
+        self._payload = None
+        self._changed = asyncio.Event()
+        self._tasks = []
+
+    async def _connect(self) -> asyncpg.Connection:
+        return await asyncpg.connect(
+            host=os.getenv("POSTGRES_HOST", "db"),  # docker-compose 서비스 이름
+            database=os.getenv("POSTGRES_DB"),
+            user=os.getenv("POSTGRES_USER"),
+            password=os.getenv("POSTGRES_PASSWORD"),
+        )
+
+    async def _watch(self, connection: asyncpg.Connection, closed: asyncio.Event):
+        # 연결이 닫히면 돌아오고, 핑에 답이 없으면 예외를 낸다.
+        while True:
+            try:
+                await asyncio.wait_for(closed.wait(), PING_INTERVAL)
+                return
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await asyncio.wait_for(connection.fetchval("SELECT 1"), PING_TIMEOUT)
+            except asyncio.TimeoutError:
+                raise ConnectionError(f"No answer to a ping within {PING_TIMEOUT} s")
+
+    def _on_notification(self, connection, pid, channel, payload):
+        self._payload = payload
+        self._changed.set()
+
+    async def _listen(self):
+        delay = RECONNECT_MIN_DELAY
+        while True:
+            connection = None
+            try:
+                connection = await self._connect()
+                closed = asyncio.Event()
+                connection.add_termination_listener(lambda _: closed.set())
+                await connection.add_listener(self.channel, self._on_notification)
+                print(f"Listening for data changes on '{self.channel}'")
+                delay = RECONNECT_MIN_DELAY
+                # 연결 전이나 끊겨 있던 동안의 알림은 유실되므로 한 번 강제로 확인한다.
+                self._payload = None
+                self._changed.set()
+                await self._watch(connection, closed)
+                print(f"Lost the '{self.channel}' listener connection")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error listening on '{self.channel}': {e}")
+            finally:
+                if connection is not None and not connection.is_closed():
+                    try:
+                        await asyncio.wait_for(connection.close(), PING_TIMEOUT)
+                    except Exception:
+                        # 응답 없는 연결은 정상 종료를 기다리지 않고 끊는다.
+                        connection.terminate()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_DELAY)
+
+    async def _dispatch(self):
+        while True:
+            await self._changed.wait()
+            self._changed.clear()
+            payload = self._payload
+            if payload is not None and payload == self.last_payload:
+                continue
+            try:
+                await self.callback(payload)
+                self.last_payload = payload
+            except Exception as e:
+                print(f"Error handling '{self.channel}' notification: {e}")
+
+    def start(self):
+        self._tasks = [asyncio.create_task(self._listen()), asyncio.create_task(self._dispatch())]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
@@ -1,74 +1,178 @@
-import psycopg2
-import os
-from typing import List, Dict
+import time
+from typing import List, Dict, Optional, Tuple
+from dao.connection_pool import ConnectionPool, get_connection_pool
+from dao.stock_info_queries import escape_like, select_columns
+from models.stock_info import StockInfoRecord
+from monitoring.metrics import observe_query
 
 class StockInfoDAO:
-    _instance = None
+    """
+    Data access for stock_info.
 
-    def __new__(cls, *args, **kwargs):
-        if cls._instance is None:
-            cls._instance = super(StockInfoDAO, cls).__new__(cls, *args, **kwargs)
-        return cls._instance
+    Each DAO checks out one connection from the shared pool on first use
+    and keeps it until close() is called, so a request runs all of its
+    queries on a single connection while other requests use their own.
+    The shared pool is also created on first use, so requests answered from
+    memory work while the database is unreachable.
+    """
 
-    def __init__(self):
+    def __init__(self, pool: Optional[ConnectionPool] = None):
+        self.pool = pool
         self.connection = None
 
     def get_db_connection(self):
         if self.connection is None:
-            self.connection = psycopg2.connect(
-                host="db",  # docker-compose 서비스 이름
-                database=os.getenv("POSTGRES_DB"),
-                user=os.getenv("POSTGRES_USER"),
-                password=os.getenv("POSTGRES_PASSWORD")
-            )
+            if self.pool is None:
+                self.pool = get_connection_pool()
+            self.connection = self.pool.getconn()
         return self.connection
 
-    def fetch_stock_info(self) -> List[Dict]:
+    def _fetch_stock_info_rows(self, limit: Optional[int], after_short_code: Optional[str],
+                               columns: List[str]) -> List[tuple]:
+        with self.get_db_connection() as connection:
+            with connection.cursor() as cursor:
+                query = f"""
+                    SELECT {', '.join(columns)}
+                    FROM stock_info
+                    WHERE %s::text IS NULL OR short_code COLLATE "C" > %s
+                    ORDER BY short_code COLLATE "C"
+                    LIMIT %s
+                """
+                started = time.perf_counter()
+                cursor.execute(query, (after_short_code, after_short_code, limit))
+                rows = cursor.fetchall()
+                observe_query("fetch_stock_info", time.perf_counter() - started, len(rows))
+                return rows
+
+    def fetch_stock_info(self, limit: Optional[int] = None, after_short_code: Optional[str] = None,
+                         columns: Optional[List[str]] = None) -> List[Dict]:
         """
-        Fetch all stock information from the database.
+        Fetch stock information ordered by short_code, one keyset page at a time.
+
+        Args:
+            limit (int, optional): The maximum number of rows. Defaults to all rows.
+            after_short_code (str, optional): Return rows after this short_code.
+            columns (List[str], optional): Columns to select. short_code is
+                always included. Defaults to all columns.
 
         Returns:
             List[Dict]: A list of dictionaries containing stock information.
         """
+        columns = select_columns(columns, required=["short_code"])
+        rows = self._fetch_stock_info_rows(limit, after_short_code, columns)
+        stock_info = [dict(zip(columns, row)) for row in rows]
+        return stock_info
+
+    def fetch_stock_info_records(self, limit: Optional[int] = None, after_short_code: Optional[str] = None) -> List[StockInfoRecord]:
+        """
+        Same as fetch_stock_info, but returns compact StockInfoRecord objects.
+
+        Returns:
+            List[StockInfoRecord]: Stock information records.
+        """
+        rows = self._fetch_stock_info_rows(limit, after_short_code, select_columns(None))
+        return [StockInfoRecord(*row) for row in rows]
+
+    def search_stock_info(self, query: str, limit: Optional[int] = None, after: Optional[Tuple] = None,
+                          columns: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Search stock information by query, best matches first.
+
+        Args:
+            query (str): The search query.
+            limit (int, optional): The maximum number of rows. Defaults to all matches.
+            after (Tuple, optional): The (rank, item_name, short_code) key of
+                the last row of the previous page.
+            columns (List[str], optional): Columns to select. item_name and
+                short_code are always included. Defaults to all columns.
+
+        Returns:
+            List[Dict]: A list of dictionaries containing stock information
+            and the match rank.
+        """
+        after_rank, after_name, after_code = after if after is not None else (None, None, None)
+        columns = select_columns(columns, required=["item_name", "short_code"])
         with self.get_db_connection() as connection:
             with connection.cursor() as cursor:
-                query = """
-                    SELECT short_code, isin_code, market_category, item_name, corporate_number, corporate_name
-                    FROM stock_info
+                # 순위: 코드 완전 일치(0) > 종목명 접두 일치(1) > 부분 일치(2)
+                search_query = f"""
+                    SELECT {', '.join(columns)}, rank
+                    FROM (
+                        SELECT short_code, isin_code, market_category, item_name, corporate_number, corporate_name,
+                            CASE
+                                WHEN lower(short_code) = lower(%(query)s) OR lower(isin_code) = lower(%(query)s) THEN 0
+                                WHEN item_name ILIKE %(prefix)s THEN 1
+                                ELSE 2
+                            END AS rank
+                        FROM stock_info
+                        WHERE short_code ILIKE %(substring)s OR isin_code ILIKE %(substring)s
+                            OR market_category ILIKE %(substring)s OR item_name ILIKE %(substring)s
+                            OR corporate_number ILIKE %(substring)s OR corporate_name ILIKE %(substring)s
+                    ) ranked
+                    WHERE %(after_rank)s::int IS NULL
+                        OR (rank, item_name COLLATE "C", short_code COLLATE "C") > (%(after_rank)s::int, %(after_name)s::text, %(after_code)s::text)
+                    ORDER BY rank, item_name COLLATE "C", short_code COLLATE "C"
+                    LIMIT %(limit)s
                 """
-                cursor.execute(query)
+                started = time.perf_counter()
+                cursor.execute(search_query, {
+                    "query": query,
+                    "prefix": f"{escape_like(query)}%",
+                    "substring": f"%{escape_like(query)}%",
+                    "after_rank": after_rank,
+                    "after_name": after_name,
+                    "after_code": after_code,
+                    "limit": limit,
+                })
                 rows = cursor.fetchall()
+                observe_query("search_stock_info", time.perf_counter() - started, len(rows))
 
-                columns = ["short_code", "isin_code", "market_category", "item_name", "corporate_number", "corporate_name"]
-                stock_info = [dict(zip(columns, row)) for row in rows]
+                stock_info = [dict(zip(columns + ["rank"], row)) for row in rows]
                 return stock_info
-            
-    def search_stock_info(self, query: str) -> List[Dict]:
+
+    def fetch_stock_info_by_keys(self, short_codes: List[str], isin_codes: List[str],
+                                 item_names: List[str]) -> List[Dict]:
         """
-        Search stock information by query.
+        Fetch the stocks matching any of the given codes or exact names.
 
         Args:
-            query (str): The search query.
+            short_codes (List[str]): Short codes to look up.
+            isin_codes (List[str]): ISIN codes to look up.
+            item_names (List[str]): Exact item names to look up.
 
         Returns:
-            List[Dict]: A list of dictionaries containing stock information.
+            List[Dict]: The matching rows, in no particular order.
         """
+        columns = select_columns(None)
         with self.get_db_connection() as connection:
             with connection.cursor() as cursor:
-                search_query = f"%{query}%"
-                query = """
-                    SELECT short_code, isin_code, market_category, item_name, corporate_number, corporate_name
+                started = time.perf_counter()
+                cursor.execute(f"""
+                    SELECT {', '.join(columns)}
                     FROM stock_info
-                    WHERE short_code ILIKE %s OR isin_code ILIKE %s OR market_category ILIKE %s OR item_name ILIKE %s OR corporate_number ILIKE %s OR corporate_name ILIKE %s
-                """
-                cursor.execute(query, (search_query, search_query, search_query, search_query, search_query, search_query))
+                    WHERE short_code = ANY(%s::text[]) OR isin_code = ANY(%s::text[]) OR item_name = ANY(%s::text[])
+                """, (short_codes, isin_codes, item_names))
                 rows = cursor.fetchall()
+                observe_query("fetch_stock_info_by_keys", time.perf_counter() - started, len(rows))
+                return [dict(zip(columns, row)) for row in rows]
 
-                columns = ["short_code", "isin_code", "market_category", "item_name", "corporate_number", "corporate_name"]
-                stock_info = [dict(zip(columns, row)) for row in rows]
-                return stock_info
+    def fetch_data_version(self) -> str:
+        """
+        Fetch a token that changes whenever stock_info is modified.
+
+        Returns:
+            str: The data version built from the row count and the latest update time.
+        """
+        with self.get_db_connection() as connection:
+            with connection.cursor() as cursor:
+                started = time.perf_counter()
+                cursor.execute("SELECT count(*), max(update_datetime) FROM stock_info")
+                count, last_update = cursor.fetchone()
+                observe_query("fetch_data_version", time.perf_counter() - started, 1)
+                last_update = last_update.isoformat() if last_update else ""
+                return f"{count}-{last_update}"
 
     def close(self):
-        if self.connection:
-            self.connection.close()
+        if self.connection is not None:
+            self.pool.putconn(self.connection, discard=bool(self.connection.closed))
             self.connection = None
@@ -0,0 +1,40 @@
+from typing import Iterable, List, Optional
+
+STOCK_INFO_COLUMNS = ["short_code", "isin_code", "market_category", "item_name", "corporate_number", "corporate_name"]
+
+
+def escape_like(text: str) -> str:
+    """
+    Escape LIKE/ILIKE wildcards so user input is matched literally.
+
+    Args:
+        text (str): The raw search text.
+
+    Returns:
+        str: The text with backslash, % and _ escaped.
+    """
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def select_columns(columns: Optional[Iterable[str]], required: Iterable[str] = ()) -> List[str]:
+    """
+    Build the SELECT column list for a projection.
+
+    Args:
+        columns (Iterable[str], optional): The requested columns. None selects all.
+        required (Iterable[str], optional): Columns always selected, e.g. keyset columns.
+
+    Returns:
+        List[str]: The selected columns in STOCK_INFO_COLUMNS order.
+
+    Raises:
+        ValueError: If an unknown column is requested.
+    """
+    if columns is None:
+        return list(STOCK_INFO_COLUMNS)
+    wanted = set(columns)
+    unknown = wanted - set(STOCK_INFO_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown stock_info columns: {', '.join(sorted(unknown))}")
+    wanted.update(required)
+    return [column for column in STOCK_INFO_COLUMNS if column in wanted]
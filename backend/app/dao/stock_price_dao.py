@@ -0,0 +1,109 @@
+from datetime import date
+from typing import List, Dict, Optional
+
+import asyncpg
+
+from dao.async_stock_info_dao import fetch_rows, fetch_value, get_async_pool
+
+
+class StockPriceDAO:
+    """
+    Data access for the stock_price daily history table.
+    """
+
+    def __init__(self, pool: Optional[asyncpg.Pool] = None):
+        self._pool = pool
+
+    async def get_pool(self) -> asyncpg.Pool:
+        if self._pool is None:
+            self._pool = await get_async_pool()
+        return self._pool
+
+    async def fetch_prices(self, short_code: str, start: date, end: date) -> List[Dict]:
+        """
+        Fetch the daily prices of one stock for a date range.
+
+        The (short_code, bas_dt) primary key and partition pruning on bas_dt
+        keep this an index range scan over the partitions that cover the range.
+
+        Args:
+            short_code (str): The stock short code.
+            start (date): The first date, inclusive.
+            end (date): The last date, inclusive.
+
+        Returns:
+            List[Dict]: Daily prices ordered by bas_dt.
+        """
+        query = """
+            SELECT bas_dt, short_code, clpr, vs, flt_rt, mkp, hipr, lopr, trqu, tr_prc, lstg_st_cnt, mrkt_tot_amt
+            FROM stock_price
+            WHERE short_code = $1 AND bas_dt BETWEEN $2 AND $3
+            ORDER BY bas_dt
+        """
+        pool = await self.get_pool()
+        rows = await fetch_rows(pool, "fetch_prices", query, short_code, start, end)
+        return [dict(row) for row in rows]
+
+    async def fetch_latest_bas_dt(self) -> Optional[date]:
+        """
+        Fetch the most recent trading date in stock_price.
+
+        Returns:
+            date: The latest bas_dt, or None if the table is empty.
+        """
+        pool = await self.get_pool()
+        return await fetch_value(pool, "fetch_latest_bas_dt", "SELECT max(bas_dt) FROM stock_price")
+
+    async def fetch_market_history(self, start: date, end: date) -> List[asyncpg.Record]:
+        """
+        Fetch closing price and volume of every stock for a date range.
+
+        Args:
+            start (date): The first date, inclusive.
+            end (date): The last date, inclusive.
+
+        Returns:
+            List[asyncpg.Record]: (short_code, bas_dt, clpr, trqu) records.
+        """
+        query = """
+            SELECT short_code, bas_dt, clpr, trqu
+            FROM stock_price
+            WHERE bas_dt BETWEEN $1 AND $2
+        """
+        pool = await self.get_pool()
+        return await fetch_rows(pool, "fetch_market_history", query, start, end)
+
+    async def fetch_item_names(self, bas_dt: date) -> Dict[str, str]:
+        """
+        Fetch the item name of every stock traded on a date.
+
+        Args:
+            bas_dt (date): The trading date.
+
+        Returns:
+            Dict[str, str]: item_name by short_code.
+        """
+        pool = await self.get_pool()
+        rows = await fetch_rows(
+            pool, "fetch_item_names", "SELECT short_code, item_name FROM stock_price WHERE bas_dt = $1", bas_dt
+        )
+        return {row["short_code"]: row["item_name"] for row in rows}
+
+    async def fetch_day(self, bas_dt: date) -> List[Dict]:
+        """
+        Fetch the prices of every stock on one trading date.
+
+        Args:
+            bas_dt (date): The trading date.
+
+        Returns:
+            List[Dict]: One row per stock.
+        """
+        query = """
+            SELECT short_code, item_name, market_category, clpr, flt_rt, trqu, mrkt_tot_amt
+            FROM stock_price
+            WHERE bas_dt = $1
+        """
+        pool = await self.get_pool()
+        rows = await fetch_rows(pool, "fetch_day", query, bas_dt)
+        return [dict(row) for row in rows]
@@ -1,12 +1,157 @@
 
-from fastapi import FastAPI, Depends, Query
-from typing import List, Dict, Optional
-from services.stock_info_service import StockInfoService
+import asyncio
+import os
+from functools import partial
+import orjson
+from datetime import date
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, Query, Response, HTTPException, Header
+from fastapi.responses import FileResponse, PlainTextResponse, StreamingResponse
+from pydantic import TypeAdapter
+from fastapi.concurrency import run_in_threadpool
+from typing import List, Dict, Optional, Literal
+from services.stock_info_service import StockInfoService, SearchIndexUnavailable
+from services.admission import AdmissionController, ExportLimiter, ExportSlot, Overloaded
+from services.stock_search_index import StockSearchIndex
+from services.fuzzy_index import MAX_FUZZY_DISTANCE
+from services.query_cache import SearchResultCache
+from services.snapshot import SNAPSHOT_PATH, read_snapshot, write_snapshot
+from services.cursor import InvalidCursor
+from services.http_cache import VersionedResponseCache, make_etag, etag_matches
+from services.stock_price_service import StockPriceService
+from services.export_service import ExportService, EXPORT_FORMATS
+from services.metrics_service import MetricsService, cache_families, pool_families
+from services.indicator_service import IndicatorService, INDICATOR_FIELDS, LOOKBACK_DAYS
+from services.leaderboard_service import LeaderboardService, LEADERBOARD_METRICS, MAX_LEADERBOARD_SIZE
 from dao.stock_info_dao import StockInfoDAO
-from models.stock_info import StockInfo, StockItem
+from dao.stock_info_queries import STOCK_INFO_COLUMNS
+from dao.async_stock_info_dao import AsyncStockInfoDAO, close_async_pool
+from dao.connection_pool import close_connection_pool
+from dao.notification_listener import NotificationListener
+from dao.stock_price_dao import StockPriceDAO
+from dao.export_dao import ExportDAO
+from dao.ingestion_run_dao import IngestionRunDAO
+from models.stock_info import StockInfo, StockInfoRecord, StockItem, StockLookup, StockLookupKeys
+from models.stock_price import StockPrice
+from models.indicator import IndicatorSeries, IndicatorSnapshot
+from models.market import MarketTop
 from fastapi.middleware.cors import CORSMiddleware
+from middleware.compression import CompressionMiddleware, MIN_COMPRESS_SIZE, choose_encoding, compress, compress_stream
+from middleware.metrics import MetricsMiddleware
+from middleware.profiling import (
+    ADMIN_TOKEN, PROFILE_INTERVAL_MS, PROFILE_MAX_SECONDS, ProfilerBusy, ProfilingMiddleware, ProfilingState, is_admin, profile_path
+)
+from monitoring.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, REGISTRY
+
+# DAO 구현 선택: "async" (asyncpg) 또는 "sync" (psycopg2 + 스레드풀). 벤치마크 비교용.
+DAO_MODE = os.getenv("STOCK_DAO_MODE", "async")
+# 적재 프로세스의 NOTIFY를 받아 캐시를 다시 만든다. 끄면 아래 주기적 확인만 사용한다.
+LISTEN_FOR_CHANGES = os.getenv("STOCK_LISTEN_FOR_CHANGES", "1") == "1"
+# 주기적 갱신 확인 (초). 0이면 끈다. LISTEN을 쓸 수 없는 환경의 대안.
+INDEX_REFRESH_SECONDS = float(os.getenv("STOCK_INDEX_REFRESH_SECONDS", "0"))
+# 0이면 메모리 검색 색인을 만들지 않고 DB 검색 + 질의 캐시만 사용한다.
+SEARCH_INDEX_ENABLED = os.getenv("STOCK_SEARCH_INDEX", "1") == "1"
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 1000
+MAX_LOOKUP_KEYS = 5000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+# 목록은 적재 때만 바뀌므로 짧게 캐시하고 이후에는 ETag로 재검증한다.
+CACHE_CONTROL = f"public, max-age={int(os.getenv('STOCK_CACHE_MAX_AGE', '60'))}, must-revalidate"
+# DB가 포화 상태일 때 이 시간(초) 안에 바뀐 이전 버전의 캐시 응답은 그대로 내보낸다.
+STALE_MAX_AGE = float(os.getenv("STOCK_STALE_MAX_AGE", "600"))
+STALE_HEADER = "X-Stale-Response"
+STOCK_INFO_LIST = TypeAdapter(List[StockInfo])
+# 고속 응답 모드: Pydantic 검증을 건너뛰고 orjson으로 직접 인코딩 (응답 스키마는 동일)
+FAST_RESPONSES = os.getenv("STOCK_FAST_RESPONSES", "0") == "1"
+
+response_cache = VersionedResponseCache(max_entries=int(os.getenv("STOCK_RESPONSE_CACHE_SIZE", "256")))
+# 캐시와 연결 풀 상태는 /metrics 요청 때만 읽는다.
+REGISTRY.add_collector(lambda: cache_families(response_cache, StockSearchIndex() if SEARCH_INDEX_ENABLED else None))
+REGISTRY.add_collector(pool_families)
+
+
+async def load_snapshot():
+    # DB나 외부 API 상태와 상관없이 기동 직후부터 검색을 서비스하기 위해 디스크 스냅샷을 먼저 올린다.
+    search_index = await get_search_index()
+    if search_index is None or search_index.is_ready or not SNAPSHOT_PATH:
+        return
+    try:
+        snapshot = await run_in_threadpool(read_snapshot, SNAPSHOT_PATH)
+        if snapshot is not None:
+            await run_in_threadpool(search_index.load, *snapshot)
+    except Exception as e:
+        print(f"Error loading stock snapshot: {e}")
+
+
+async def refresh_search_index():
+    try:
+        search_index = await get_search_index()
+        async for dao in get_dao():
+            rebuilt = await StockInfoService(dao, search_index, SearchResultCache()).refresh_search_index()
+        if rebuilt and SNAPSHOT_PATH:
+            await run_in_threadpool(write_snapshot, search_index.rows, search_index.version, SNAPSHOT_PATH)
+    except Exception as e:
+        print(f"Error refreshing stock search index: {e}")
+
+
+async def refresh_indicators():
+    try:
+        await IndicatorService(StockPriceDAO()).refresh()
+    except Exception as e:
+        print(f"Error refreshing indicators: {e}")
+
+
+async def refresh_leaderboards():
+    try:
+        await LeaderboardService(StockPriceDAO()).refresh()
+    except Exception as e:
+        print(f"Error refreshing leaderboards: {e}")
+
+
+async def refresh_caches():
+    await refresh_search_index()
+    await refresh_indicators()
+    await refresh_leaderboards()
+
+
+async def refresh_caches_periodically():
+    while True:
+        await asyncio.sleep(INDEX_REFRESH_SECONDS)
+        await refresh_caches()
+
+
+async def on_data_changed(payload: Optional[str]):
+    # payload는 적재 프로세스가 보낸 데이터 버전. 재연결 직후에는 None.
+    if payload is not None:
+        print(f"Stock data changed: {payload}")
+    await refresh_caches()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await load_snapshot()
+    # DB 조회는 모두 백그라운드에서 한다. DB가 늦게 뜨거나 내려가 있어도 기동은 기다리지 않는다.
+    tasks = []
+    listener = NotificationListener(on_data_changed) if LISTEN_FOR_CHANGES else None
+    if listener is not None:
+        # 연결될 때마다 refresh_caches()가 한 번 실행된다.
+        listener.start()
+    else:
+        tasks.append(asyncio.create_task(refresh_caches()))
+    if INDEX_REFRESH_SECONDS > 0:
+        tasks.append(asyncio.create_task(refresh_caches_periodically()))
+    yield
+    if listener is not None:
+        await listener.stop()
+    for task in tasks:
+        task.cancel()
+    if DAO_MODE == "sync":
+        await run_in_threadpool(close_connection_pool)
+    else:
+        await close_async_pool()
 
-app = FastAPI()
+
+app = FastAPI(lifespan=lifespan)
 
 # CORS 설정 추가
 app.add_middleware(
@@ -15,33 +160,409 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # 모든 HTTP 메소드 허용
     allow_headers=["*"],  # 모든 HTTP 헤더 허용
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag", STALE_HEADER],
 )
+# ADMIN_TOKEN이 없으면 아무것도 하지 않는다.
+app.add_middleware(ProfilingMiddleware)
+# /stocks는 직접 압축해서 캐시하고, 나머지 JSON 응답은 미들웨어가 압축한다.
+app.add_middleware(CompressionMiddleware)
+# 가장 바깥에 두어 압축까지 포함한 응답 시간을 잰다.
+app.add_middleware(MetricsMiddleware)
+
+
+async def get_dao():
+    if DAO_MODE == "sync":
+        # 요청마다 풀에서 연결을 빌려 쓰고 응답이 끝나면 반납한다.
+        dao = StockInfoDAO()
+        try:
+            yield dao
+        finally:
+            await run_in_threadpool(dao.close)
+    else:
+        yield AsyncStockInfoDAO()
+
+# 의존성도 async로 선언해야 FastAPI가 스레드풀로 보내지 않는다.
+async def get_search_index():
+    return StockSearchIndex() if SEARCH_INDEX_ENABLED else None
 
+async def get_query_cache():
+    return SearchResultCache()
 
-def get_dao():
-    return StockInfoDAO()
+async def get_service(
+    dao = Depends(get_dao),
+    search_index: Optional[StockSearchIndex] = Depends(get_search_index),
+    query_cache: SearchResultCache = Depends(get_query_cache),
+):
+    return StockInfoService(dao, search_index, query_cache, AdmissionController())
 
-def get_service(dao: StockInfoDAO = Depends(get_dao)):
-    return StockInfoService(dao)
+def _json_response(body: bytes, headers: Dict[str, str], next_cursor: Optional[str],
+                   encoding: Optional[str] = None) -> Response:
+    headers = dict(headers, Vary="Accept-Encoding")
+    if next_cursor:
+        headers[NEXT_CURSOR_HEADER] = next_cursor
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def _parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    if not fields:
+        return None
+    selected = list(dict.fromkeys(field.strip() for field in fields.split(",") if field.strip()))
+    unknown = [field for field in selected if field not in STOCK_INFO_COLUMNS]
+    if unknown or not selected:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(STOCK_INFO_COLUMNS)}"
+        )
+    return selected
 
 @app.get("/stocks", response_model=List[StockInfo])
-def get_stocks(query: Optional[str] = Query(None), service: StockInfoService = Depends(get_service)):
+async def get_stocks(
+    query: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. item_name,short_code"),
+    mode: Literal["substring", "fuzzy"] = Query("substring", description="fuzzy matches item_name and corporate_name allowing typos"),
+    max_distance: int = Query(2, ge=0, le=MAX_FUZZY_DISTANCE, description="Largest edit distance in fuzzy mode, counted in jamo for Hangul"),
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
+    service: StockInfoService = Depends(get_service),
+):
     """
-    Get all stock information from the database.
+    Get stock information from the database, one page at a time.
+
+    Search results are ranked (exact short_code/ISIN, then item_name prefix,
+    then substring matches); the full listing is ordered by short_code. When
+    more rows are available the X-Next-Cursor response header carries the
+    cursor for the next page.
+
+    Responses carry an ETag derived from the stock_info data version. A
+    request whose If-None-Match matches gets 304 without touching the
+    database, and encoded bodies are reused until the data changes.
+
+    `fields` limits the response to the given columns; the projection is
+    pushed down into the query. Bodies above a size threshold are compressed
+    with brotli or gzip according to Accept-Encoding.
+
+    `mode=fuzzy` tolerates typos in item_name and corporate_name: rows within
+    `max_distance` edits of the query are returned closest first. Hangul is
+    compared jamo by jamo, so 종묵 finds 종목. Fuzzy search is answered from
+    the in-memory search index only and returns 503 until it is loaded; the
+    same goes for 초성 queries such as ㅅㅅ.
+
+    Database queries go through admission control. When the database is
+    saturated the request is answered from the previous data version's
+    cached response if one is recent enough (marked with X-Stale-Response),
+    otherwise it gets 503 with Retry-After right away.
 
     Returns:
         List[StockInfo]: A list of dictionaries containing stock information.
     """
+    columns = _parse_fields(fields)
+    encoding = choose_encoding(accept_encoding)
+    version = service.data_version
+    headers = {}
+    fuzzy = bool(query) and mode == "fuzzy"
+    cache_key = (query, limit, cursor, tuple(columns) if columns else None, encoding, max_distance if fuzzy else None)
+    if version:
+        headers = {"ETag": make_etag(version), "Cache-Control": CACHE_CONTROL}
+        if etag_matches(if_none_match, headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+        cached = response_cache.get(version, cache_key)
+        if cached is not None:
+            return _json_response(cached[0], headers, cached[1], cached[2])
+
+    search_stocks = partial(service.fuzzy_search_stocks, max_distance=max_distance) if fuzzy else service.search_stocks
     try:
-        if query:
-            stock_info = service.search_stocks(query)
+        if columns:
+            # 프로젝션은 DAO 조회 컬럼까지 줄이고, 결과 dict를 그대로 인코딩한다.
+            if query:
+                stock_info, next_cursor = await search_stocks(query, limit, cursor, columns)
+            else:
+                stock_info, next_cursor = await service.get_all_stocks(limit, cursor, columns)
+            body = orjson.dumps(stock_info)
+        elif FAST_RESPONSES:
+            # DAO 레코드를 검증 없이 바로 JSON 바이트로 인코딩
+            if query:
+                stock_info, next_cursor = await search_stocks(query, limit, cursor)
+                stock_info = [StockInfoRecord.from_dict(row) for row in stock_info]
+            else:
+                stock_info, next_cursor = await service.get_all_stock_records(limit, cursor)
+            body = orjson.dumps(stock_info)
         else:
-            stock_info = service.get_all_stocks()
-        return stock_info
+            if query:
+                stock_info, next_cursor = await search_stocks(query, limit, cursor)
+            else:
+                stock_info, next_cursor = await service.get_all_stocks(limit, cursor)
+            body = STOCK_INFO_LIST.dump_json(STOCK_INFO_LIST.validate_python(stock_info))
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except SearchIndexUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except Overloaded as e:
+        stale = response_cache.get_stale(cache_key, STALE_MAX_AGE)
+        if stale is None:
+            raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+        # 이전 버전 응답은 브라우저가 재사용하지 않도록 매번 재검증하게 한다.
+        stale_version, (body, next_cursor, encoding) = stale
+        stale_headers = {"ETag": make_etag(stale_version), "Cache-Control": "no-cache", STALE_HEADER: "1"}
+        return _json_response(body, stale_headers, next_cursor, encoding)
     except Exception as e:
         print(f"Error fetching stock information: {e}")
         return {"error": "Failed to fetch stock information"}
 
+    if encoding and len(body) < MIN_COMPRESS_SIZE:
+        encoding = None
+    elif encoding:
+        body = await run_in_threadpool(compress, body, encoding)
+    if version:
+        response_cache.put(version, cache_key, (body, next_cursor, encoding))
+    return _json_response(body, headers, next_cursor, encoding)
+
+@app.post("/stocks/lookup", response_model=StockLookup)
+async def lookup_stocks(keys: StockLookupKeys, service: StockInfoService = Depends(get_service)):
+    """
+    Resolve many short codes, ISIN codes or exact item names in one request.
+
+    Keys are resolved from in-memory hash maps when the search index is
+    loaded, otherwise with a single query. Keys that match nothing are
+    returned under `unresolved`.
+
+    Returns:
+        StockLookup: The resolved stocks in request order and the unresolved keys.
+    """
+    total = len(keys.short_codes) + len(keys.isin_codes) + len(keys.item_names)
+    if total > MAX_LOOKUP_KEYS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_LOOKUP_KEYS} keys can be looked up at once")
+    try:
+        stocks, unresolved = await service.lookup_stocks(keys.short_codes, keys.isin_codes, keys.item_names)
+    except Overloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    # 행이 이미 StockInfo 형태이므로 검증 없이 바로 인코딩한다.
+    return Response(content=orjson.dumps({"stocks": stocks, "unresolved": unresolved}), media_type="application/json")
+
+async def get_export_service():
+    return ExportService(ExportDAO())
+
+class ExportResponse(StreamingResponse):
+    """
+    StreamingResponse that gives its export slot back when the response
+    ends, also when the client disconnects before the stream has started.
+    """
+
+    def __init__(self, content, slot: ExportSlot, **kwargs):
+        super().__init__(content, **kwargs)
+        self.slot = slot
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            # 스트림을 먼저 닫아 풀 연결을 돌려준 뒤 자리를 반납한다.
+            await self.body_iterator.aclose()
+            self.slot.release()
+
+@app.get("/stocks/export")
+async def export_stocks(
+    dataset: Literal["stock_info", "prices"] = Query("stock_info"),
+    export_format: Literal["csv", "ndjson"] = Query("csv", alias="format"),
+    start: Optional[date] = Query(None, alias="from", description="For prices, the first date (YYYY-MM-DD)"),
+    end: Optional[date] = Query(None, alias="to", description="For prices, the last date (YYYY-MM-DD)"),
+    accept_encoding: Optional[str] = Header(None),
+    service: ExportService = Depends(get_export_service),
+):
+    """
+    Export the stock listing or the daily price history in one streamed response.
+
+    Rows are streamed from Postgres (COPY for CSV, a server-side cursor for
+    NDJSON) as the client reads them, so memory use does not grow with the
+    export size. The stream is compressed on the fly according to
+    Accept-Encoding.
+
+    Each export holds a database connection until it ends, so only
+    STOCK_MAX_CONCURRENT_EXPORTS run at once; further exports get 503 with
+    Retry-After instead of taking connections from /stocks.
+
+    Returns:
+        StreamingResponse: CSV with a header row, or one JSON object per line.
+    """
+    try:
+        chunks = service.export(dataset, export_format, start, end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        slot = ExportLimiter().acquire()
+    except Overloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    headers = {"Content-Disposition": f'attachment; filename="{dataset}.{export_format}"', "Vary": "Accept-Encoding"}
+    encoding = choose_encoding(accept_encoding)
+    if encoding:
+        chunks = compress_stream(chunks, encoding)
+        headers["Content-Encoding"] = encoding
+    return ExportResponse(chunks, slot, media_type=EXPORT_FORMATS[export_format], headers=headers)
+
+async def get_price_service():
+    return StockPriceService(StockPriceDAO())
+
+@app.get("/stocks/{short_code}/prices", response_model=List[StockPrice])
+async def get_stock_prices(
+    short_code: str,
+    start: Optional[date] = Query(None, alias="from", description="First date (YYYY-MM-DD). Defaults to one year before 'to'."),
+    end: Optional[date] = Query(None, alias="to", description="Last date (YYYY-MM-DD). Defaults to today."),
+    service: StockPriceService = Depends(get_price_service),
+):
+    """
+    Get the daily price history of one stock.
+
+    Returns:
+        List[StockPrice]: Daily prices ordered by date.
+    """
+    try:
+        return await service.get_prices(short_code, start, end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+async def get_indicator_service():
+    return IndicatorService(StockPriceDAO())
+
+@app.get("/stocks/screen", response_model=List[IndicatorSnapshot])
+async def screen_stocks(
+    rsi_min: Optional[float] = Query(None, ge=0, le=100),
+    rsi_max: Optional[float] = Query(None, ge=0, le=100),
+    volume_z_min: Optional[float] = Query(None),
+    return_min: Optional[float] = Query(None, description="Minimum daily return, e.g. 0.05 for +5%"),
+    return_max: Optional[float] = Query(None),
+    sort_by: str = Query("rsi_14", pattern="^(" + "|".join(INDICATOR_FIELDS) + ")$"),
+    descending: bool = Query(False),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    service: IndicatorService = Depends(get_indicator_service),
+):
+    """
+    Screen the whole market on the latest day's technical indicators.
+
+    Returns:
+        List[IndicatorSnapshot]: Matching stocks sorted by sort_by.
+    """
+    filters = {
+        "rsi_14": (rsi_min, rsi_max),
+        "volume_z_20": (volume_z_min, None),
+        "return_1d": (return_min, return_max),
+    }
+    return await service.screen(filters, sort_by, descending, limit)
+
+@app.get("/stocks/{short_code}/indicators", response_model=IndicatorSeries)
+async def get_stock_indicators(
+    short_code: str,
+    days: int = Query(60, ge=1, le=LOOKBACK_DAYS),
+    service: IndicatorService = Depends(get_indicator_service),
+):
+    """
+    Get returns, moving averages, volatility, RSI and volume z-scores of one stock.
+
+    Returns:
+        IndicatorSeries: The indicator values of the most recent trading days.
+    """
+    series = await service.get_indicators(short_code, days)
+    if series is None:
+        raise HTTPException(status_code=404, detail=f"No price history for {short_code}")
+    return series
+
+async def get_leaderboard_service():
+    return LeaderboardService(StockPriceDAO())
+
+@app.get("/market/top", response_model=MarketTop)
+async def get_market_top(
+    metric: str = Query("fltRt", pattern="^(" + "|".join(LEADERBOARD_METRICS) + ")$"),
+    n: int = Query(10, ge=1, le=MAX_LEADERBOARD_SIZE),
+    service: LeaderboardService = Depends(get_leaderboard_service),
+):
+    """
+    Get the top and bottom stocks of the latest trading day by change rate,
+    traded volume or market capitalization.
+
+    Returns:
+        MarketTop: The precomputed rankings for the metric.
+    """
+    market_top = await service.get_top(metric, n)
+    if market_top is None:
+        raise HTTPException(status_code=404, detail="No price data loaded")
+    return market_top
+
+async def get_metrics_service():
+    return MetricsService(IngestionRunDAO())
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics(service: MetricsService = Depends(get_metrics_service)):
+    """
+    Expose request latency, DAO query timings, connection pool and cache
+    statistics of this worker, and the latest ingestion runs, in the
+    Prometheus text format.
+
+    Each worker process keeps its own counters, so scrape every worker (or
+    run a single worker) to see all of them.
+
+    Returns:
+        Response: The metrics as text/plain.
+    """
+    return Response(content=await service.render(), media_type=METRICS_CONTENT_TYPE)
+
+async def require_admin(x_admin_token: Optional[str] = Header(None)):
+    if not ADMIN_TOKEN:
+        # 관리 API는 ADMIN_TOKEN을 설정했을 때만 존재한다.
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not is_admin(x_admin_token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+@app.post("/admin/profile", include_in_schema=False, dependencies=[Depends(require_admin)])
+async def profile_worker(
+    seconds: float = Query(10, gt=0, le=PROFILE_MAX_SECONDS),
+    interval_ms: float = Query(PROFILE_INTERVAL_MS, ge=1, le=1000),
+    path: Optional[str] = Query(None, description="Only sample requests whose path starts with this, e.g. /stocks"),
+    output: Literal["summary", "collapsed"] = Query("summary", alias="format"),
+):
+    """
+    Sample the stacks of this worker for a time window and return where the
+    time went.
+
+    Without `path` every thread is sampled; with it, only the time the event
+    loop spends on matching requests (plus threadpool threads while such a
+    request is in flight). Idle threads are left out. The profile is also
+    saved under PROFILE_DIR and can be fetched again by its id. Only one
+    profile runs at a time per worker.
+
+    Returns:
+        The summary (sample counts, sampler overhead, top functions by self
+        and total samples) as JSON, or the collapsed stacks as text.
+    """
+    state = ProfilingState()
+    try:
+        session = state.start("window" if path is None else "requests", interval_ms, seconds, path)
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    try:
+        await asyncio.sleep(seconds)
+        report = await run_in_threadpool(session.finish)
+    finally:
+        session.profiler.stop()
+        state.end(session)
+    if output == "collapsed":
+        return PlainTextResponse(session.profiler.collapsed())
+    return report
+
+@app.get("/admin/profile/{profile_id}", include_in_schema=False, dependencies=[Depends(require_admin)])
+async def get_profile(profile_id: str, output: Literal["summary", "collapsed"] = Query("summary", alias="format")):
+    """
+    Get a saved profile by the id returned by POST /admin/profile or in the
+    X-Profile-Id header.
+
+    Returns:
+        The JSON summary or the collapsed stacks.
+    """
+    path = profile_path(profile_id, "json" if output == "summary" else "collapsed")
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"No profile {profile_id}")
+    return FileResponse(path, media_type="application/json" if output == "summary" else "text/plain")
+
 
 # 주식 데이터 리스트
         # "response": {
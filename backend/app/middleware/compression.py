@@ -0,0 +1,170 @@
+import gzip
+import os
+import zlib
+from typing import AsyncIterator, Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # brotli가 없으면 gzip만 지원
+    brotli = None
+
+# 이 크기보다 작은 응답은 압축 이득보다 CPU 비용이 커서 그대로 보낸다.
+MIN_COMPRESS_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "500"))
+GZIP_LEVEL = int(os.getenv("COMPRESS_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", "5"))
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+
+def supported_encodings():
+    """
+    List the content codings this server can produce, most preferred first.
+
+    Returns:
+        list: Coding names such as "br" and "gzip".
+    """
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Pick a content coding from an Accept-Encoding header.
+
+    Args:
+        accept_encoding (str, optional): The request header value.
+
+    Returns:
+        str: "br" or "gzip", or None to send the body uncompressed.
+    """
+    if not accept_encoding:
+        return None
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name.strip().lower()] = weight
+    best, best_weight = None, 0.0
+    for encoding in supported_encodings():
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """
+    Compress a body with the given content coding.
+
+    Args:
+        body (bytes): The uncompressed body.
+        encoding (str): "br" or "gzip".
+
+    Returns:
+        bytes: The compressed body.
+    """
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+async def compress_stream(chunks: AsyncIterator[bytes], encoding: str) -> AsyncIterator[bytes]:
+    """
+    Compress a streamed body chunk by chunk.
+
+    Every chunk is flushed, so the client can decode each piece as soon as
+    it arrives instead of waiting for the compressor's buffer to fill.
+
+    Args:
+        chunks (AsyncIterator[bytes]): The uncompressed body chunks.
+        encoding (str): "br" or "gzip".
+
+    Yields:
+        bytes: The compressed stream.
+    """
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+        def process(chunk):
+            return compressor.process(chunk) + compressor.flush()
+
+        finish = compressor.finish
+    else:
+        # wbits=31: gzip 헤더와 트레일러를 붙인다.
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+        def process(chunk):
+            return compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+        def finish():
+            return compressor.flush(zlib.Z_FINISH)
+
+    async for chunk in chunks:
+        compressed = await run_in_threadpool(process, chunk)
+        if compressed:
+            yield compressed
+    yield finish()
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    return bool(content_type) and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    """
+    Compress complete responses with brotli or gzip, as negotiated through
+    Accept-Encoding.
+
+    Bodies below minimum_size, streamed responses and responses that are
+    already encoded are passed through unchanged.
+    """
+
+    def __init__(self, app, minimum_size: int = MIN_COMPRESS_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            body = message.get("body", b"")
+            if (message.get("more_body", False) or "content-encoding" in headers
+                    or not is_compressible(headers.get("content-type")) or len(body) < self.minimum_size):
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            body = compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,47 @@
+import time
+
+from monitoring.metrics import HTTP_REQUEST_SECONDS, Gauge
+
+# 라우트를 찾지 못한 요청(404)은 경로별로 나누지 않는다.
+UNMATCHED_ROUTE = "<unmatched>"
+
+HTTP_REQUESTS_IN_PROGRESS = Gauge("stock_http_requests_in_progress", "Requests being served right now.")
+
+
+class MetricsMiddleware:
+    """
+    Record the latency of every request per route template, method and
+    status code.
+
+    The route is read after the router has matched it, so /stocks/005930/prices
+    is counted as /stocks/{short_code}/prices and label cardinality stays
+    bounded by the number of routes.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        # 처리 중 예외가 나면 바깥의 ServerErrorMiddleware가 500을 보낸다.
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_PROGRESS.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_PROGRESS.dec()
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.labels(
+                scope["method"], route.path if route is not None else UNMATCHED_ROUTE, str(status)
+            ).observe(time.perf_counter() - started)
@@ -0,0 +1,214 @@
+import asyncio
+import hmac
+import os
+import re
+import threading
+from datetime import datetime
+from typing import Dict, Optional, Set
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+
+from monitoring.profiler import DEFAULT_MAX_OVERHEAD, SamplingProfiler, save_profile
+
+# 설정하지 않으면 프로파일링(관리 API와 X-Profile 헤더)은 꺼져 있다.
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+ADMIN_TOKEN_HEADER = "X-Admin-Token"
+PROFILE_HEADER = "X-Profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+PROFILE_DIR = os.getenv("PROFILE_DIR", "/app/data/profiles")
+PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", "60"))
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "10"))
+# 요청 하나는 수 ms 안에 끝나므로 헤더로 켠 프로파일은 더 촘촘히 샘플링한다.
+PROFILE_REQUEST_INTERVAL_MS = float(os.getenv("PROFILE_REQUEST_INTERVAL_MS", "1"))
+PROFILE_MAX_OVERHEAD = float(os.getenv("PROFILE_MAX_OVERHEAD", str(DEFAULT_MAX_OVERHEAD)))
+PROFILE_TOP = 20
+PROFILE_ID_PATTERN = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+
+class ProfilerBusy(RuntimeError):
+    """Raised when a profile is requested while another one is running."""
+
+
+def is_admin(token: Optional[str]) -> bool:
+    return bool(ADMIN_TOKEN) and token is not None and hmac.compare_digest(token, ADMIN_TOKEN)
+
+
+def running_task(loop: asyncio.AbstractEventLoop) -> Optional[asyncio.Task]:
+    # 다른 스레드에서 이벤트 루프가 지금 실행 중인 태스크를 읽는다 (asyncio 내부 테이블).
+    current_tasks = getattr(asyncio.tasks, "_current_tasks", None)
+    return current_tasks.get(loop) if current_tasks is not None else None
+
+
+class ProfileSession:
+    """
+    One profiling run.
+
+    Without a path prefix every thread is sampled (a time window). With one,
+    or for a single request, only samples taken while the event loop is
+    running a selected request's task are kept, so other traffic on the
+    same worker does not show up. Threadpool threads cannot be attributed
+    to a task; they are sampled while at least one selected request is in
+    flight.
+    """
+
+    def __init__(self, profile_id: str, interval: float, max_seconds: float, path_prefix: Optional[str] = None,
+                 select_requests: bool = False):
+        self.id = profile_id
+        self.path_prefix = path_prefix
+        self.select_requests = select_requests or path_prefix is not None
+        self.tasks: Set[asyncio.Task] = set()
+        self.requests = 0
+        self.loop = asyncio.get_running_loop()
+        self.loop_thread = threading.get_ident()
+        self.profiler = SamplingProfiler(
+            interval=interval, max_overhead=PROFILE_MAX_OVERHEAD, max_seconds=max_seconds,
+            thread_filter=self._keep if self.select_requests else None,
+        )
+
+    def selects(self, path: str) -> bool:
+        return self.path_prefix is not None and path.startswith(self.path_prefix)
+
+    def _keep(self, ident: int, frame) -> bool:
+        if ident == self.loop_thread:
+            return running_task(self.loop) in self.tasks
+        return bool(self.tasks)
+
+    def add_task(self, task: asyncio.Task):
+        self.tasks = self.tasks | {task}
+        self.requests += 1
+
+    def remove_task(self, task: asyncio.Task):
+        # 샘플러 스레드가 읽는 중에도 안전하도록 집합을 통째로 바꾼다.
+        self.tasks = self.tasks - {task}
+
+    def finish(self) -> Dict:
+        """
+        Stop sampling and save the profile under PROFILE_DIR. Blocks until
+        the sampler thread has exited, so call it from a worker thread.
+
+        Returns:
+            Dict: The summary, with the profile id and the number of selected requests.
+        """
+        self.profiler.stop()
+        save_profile(self.profiler, PROFILE_DIR, self.id, PROFILE_TOP)
+        report = self.profiler.report(PROFILE_TOP)
+        report.update(id=self.id, path_prefix=self.path_prefix, requests=self.requests if self.select_requests else None)
+        return report
+
+
+class ProfilingState:
+    """
+    Process-wide holder of the running profile. One profile runs at a time
+    so the sampling overhead stays bounded.
+    """
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super(ProfilingState, cls).__new__(cls, *args, **kwargs)
+            cls._instance.session = None
+        return cls._instance
+
+    def start(self, kind: str, interval_ms: float, max_seconds: float, path_prefix: Optional[str] = None,
+              select_requests: bool = False) -> ProfileSession:
+        """
+        Start a profile.
+
+        Args:
+            kind (str): A word for the profile id, e.g. "window" or "request".
+            interval_ms (float): Milliseconds between samples.
+            max_seconds (float): The longest the sampler may run.
+            path_prefix (str, optional): Only sample requests whose path starts with this.
+            select_requests (bool, optional): Only sample tasks added with add_task.
+
+        Returns:
+            ProfileSession: The running session.
+
+        Raises:
+            ProfilerBusy: If another profile is running.
+        """
+        if self.session is not None:
+            raise ProfilerBusy(f"Profile {self.session.id} is running")
+        profile_id = f"{kind}-{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}"
+        self.session = ProfileSession(profile_id, interval_ms / 1000, max_seconds, path_prefix, select_requests)
+        self.session.profiler.start()
+        return self.session
+
+    def end(self, session: ProfileSession):
+        if self.session is session:
+            self.session = None
+
+
+def profile_path(profile_id: str, extension: str) -> Optional[str]:
+    """
+    Get the path of a saved profile file.
+
+    Args:
+        profile_id (str): The id returned when the profile was taken.
+        extension (str): "collapsed" or "json".
+
+    Returns:
+        str: The path, or None if the id is malformed or the file does not exist.
+    """
+    if not PROFILE_ID_PATTERN.match(profile_id):
+        return None
+    path = os.path.join(PROFILE_DIR, f"{profile_id}.{extension}")
+    return path if os.path.isfile(path) else None
+
+
+class ProfilingMiddleware:
+    """
+    Add requests to the running path-filtered profile, and profile single
+    requests that carry X-Profile together with a valid X-Admin-Token. The
+    profile id is returned in X-Profile-Id; fetch it from /admin/profile/{id}.
+
+    When ADMIN_TOKEN is unset and no profile is running, requests pass
+    straight through.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.state = ProfilingState()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not ADMIN_TOKEN:
+            await self.app(scope, receive, send)
+            return
+
+        session = self.state.session
+        if session is not None and session.selects(scope["path"]):
+            task = asyncio.current_task()
+            session.add_task(task)
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                session.remove_task(task)
+            return
+
+        headers = Headers(scope=scope)
+        if PROFILE_HEADER not in headers or not is_admin(headers.get(ADMIN_TOKEN_HEADER)):
+            await self.app(scope, receive, send)
+            return
+        try:
+            session = self.state.start("request", PROFILE_REQUEST_INTERVAL_MS, PROFILE_MAX_SECONDS, select_requests=True)
+        except ProfilerBusy:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[PROFILE_ID_HEADER] = session.id
+            await send(message)
+
+        task = asyncio.current_task()
+        session.add_task(task)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            session.remove_task(task)
+            try:
+                # 샘플러 종료와 파일 저장은 루프를 막지 않도록 스레드에서 한다.
+                await run_in_threadpool(session.finish)
+            finally:
+                self.state.end(session)
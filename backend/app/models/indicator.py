@@ -0,0 +1,24 @@
+from datetime import date
+from typing import List, Optional
+from pydantic import BaseModel
+
+# 기술적 지표 모델 (값이 없으면 None)
+class IndicatorPoint(BaseModel):
+    bas_dt: date
+    close: Optional[float]
+    return_1d: Optional[float]
+    ma_5: Optional[float]
+    ma_20: Optional[float]
+    ma_60: Optional[float]
+    volatility_20: Optional[float]
+    rsi_14: Optional[float]
+    volume_z_20: Optional[float]
+
+class IndicatorSeries(BaseModel):
+    short_code: str
+    item_name: Optional[str]
+    points: List[IndicatorPoint]
+
+class IndicatorSnapshot(IndicatorPoint):
+    short_code: str
+    item_name: Optional[str]
@@ -0,0 +1,20 @@
+from datetime import date
+from typing import List, Optional
+from pydantic import BaseModel
+
+# 시장 순위 모델
+class LeaderboardEntry(BaseModel):
+    rank: int
+    short_code: str
+    item_name: str
+    market_category: str
+    clpr: Optional[int]
+    flt_rt: Optional[float]
+    trqu: Optional[int]
+    mrkt_tot_amt: Optional[int]
+
+class MarketTop(BaseModel):
+    bas_dt: date
+    metric: str
+    top: List[LeaderboardEntry]
+    bottom: List[LeaderboardEntry]
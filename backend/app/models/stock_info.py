@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from typing import List, Dict
 from pydantic import BaseModel
 
@@ -9,6 +10,34 @@ class StockInfo(BaseModel):
     corporate_number: str
     corporate_name: str
 
+# 일괄 조회 키. 코드는 대소문자 구분 없이, 종목명은 정확히 일치해야 한다.
+class StockLookupKeys(BaseModel):
+    short_codes: List[str] = []
+    isin_codes: List[str] = []
+    item_names: List[str] = []
+
+class StockLookup(BaseModel):
+    stocks: List[StockInfo]
+    unresolved: StockLookupKeys
+
+# 고속 응답용 경량 레코드. StockInfo와 같은 필드를 같은 순서로 가지며
+# orjson이 dataclass를 직접 직렬화하므로 검증 단계를 거치지 않는다.
+# dataclass(slots=True)는 Python 3.10부터라서 __slots__를 직접 선언한다.
+@dataclass
+class StockInfoRecord:
+    __slots__ = ("short_code", "isin_code", "market_category", "item_name", "corporate_number", "corporate_name")
+    short_code: str
+    isin_code: str
+    market_category: str
+    item_name: str
+    corporate_number: str
+    corporate_name: str
+
+    @classmethod
+    def from_dict(cls, row: Dict) -> "StockInfoRecord":
+        return cls(row["short_code"], row["isin_code"], row["market_category"],
+                   row["item_name"], row["corporate_number"], row["corporate_name"])
+
 # 주식 데이터 모델
 class StockItem(BaseModel):
     basDt: str
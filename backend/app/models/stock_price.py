@@ -0,0 +1,18 @@
+from datetime import date
+from typing import Optional
+from pydantic import BaseModel
+
+# 일별 시세 모델 (stock_price 테이블)
+class StockPrice(BaseModel):
+    bas_dt: date
+    short_code: str
+    clpr: Optional[int]
+    vs: Optional[int]
+    flt_rt: Optional[float]
+    mkp: Optional[int]
+    hipr: Optional[int]
+    lopr: Optional[int]
+    trqu: Optional[int]
+    tr_prc: Optional[int]
+    lstg_st_cnt: Optional[int]
+    mrkt_tot_amt: Optional[int]
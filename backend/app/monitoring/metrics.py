@@ -0,0 +1,308 @@
+"""
+Process-local metrics in the Prometheus text exposition format.
+
+Metrics are plain in-memory counters guarded by a lock, so recording one
+costs a dictionary lookup and a few additions. Values that already live
+elsewhere (cache and pool statistics) are read by collectors only when
+/metrics is scraped.
+"""
+import math
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# 초 단위. 메모리 응답(~0.1ms)부터 느린 DB 조회까지 구분되도록 잡았다.
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Sample(NamedTuple):
+    name: str
+    labels: Dict[str, str]
+    value: float
+
+
+class MetricFamily(NamedTuple):
+    name: str
+    type: str
+    documentation: str
+    samples: List[Sample]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def render(families: Iterable[MetricFamily]) -> str:
+    """
+    Render metric families in the Prometheus text format.
+
+    Args:
+        families (Iterable[MetricFamily]): The families to render.
+
+    Returns:
+        str: The exposition text, ending with a newline.
+    """
+    lines = []
+    for family in families:
+        lines.append(f"# HELP {family.name} {_escape(family.documentation)}")
+        lines.append(f"# TYPE {family.name} {family.type}")
+        for sample in family.samples:
+            if sample.labels:
+                labels = ",".join(f'{key}="{_escape(str(value))}"' for key, value in sample.labels.items())
+                lines.append(f"{sample.name}{{{labels}}} {_format_value(sample.value)}")
+            else:
+                lines.append(f"{sample.name} {_format_value(sample.value)}")
+    return "\n".join(lines) + "\n"
+
+
+class Registry:
+    """
+    The metrics and collectors exposed by one process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, "_Metric"] = {}
+        self._collectors: List[Callable[[], Iterable[MetricFamily]]] = []
+
+    def register(self, metric: "_Metric"):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+
+    def add_collector(self, collector: Callable[[], Iterable[MetricFamily]]):
+        """
+        Add a function that builds metric families at scrape time.
+
+        Args:
+            collector (Callable): Returns the families to expose. A collector
+                that raises is skipped for that scrape.
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def collect(self) -> List[MetricFamily]:
+        with self._lock:
+            metrics, collectors = list(self._metrics.values()), list(self._collectors)
+        families = [metric.collect() for metric in metrics]
+        for collector in collectors:
+            try:
+                families.extend(collector())
+            except Exception as e:
+                print(f"Error collecting metrics: {e}")
+        return families
+
+
+REGISTRY = Registry()
+
+
+class _Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 registry: Optional[Registry] = REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: Dict[Tuple[str, ...], object] = {}
+        if registry is not None:
+            registry.register(self)
+
+    def labels(self, *values: str):
+        """
+        Get the child metric for one combination of label values.
+
+        Args:
+            *values (str): The label values, in labelnames order.
+
+        Returns:
+            The child, which has the same recording methods as the metric.
+        """
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _label_dict(self, values: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, values))
+
+    def collect(self) -> MetricFamily:
+        raise NotImplementedError
+
+
+class _Value:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+
+class Counter(_Metric):
+    """A value that only goes up, such as a request or row count."""
+    type = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+    def collect(self) -> MetricFamily:
+        samples = [
+            Sample(f"{self.name}_total", self._label_dict(values), child.value)
+            for values, child in list(self._children.items())
+        ]
+        return MetricFamily(self.name, self.type, self.documentation, samples)
+
+
+class Gauge(_Metric):
+    """A value that can go up and down, such as requests in progress."""
+    type = "gauge"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        self.labels().dec(amount)
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+    def collect(self) -> MetricFamily:
+        samples = [
+            Sample(self.name, self._label_dict(values), child.value)
+            for values, child in list(self._children.items())
+        ]
+        return MetricFamily(self.name, self.type, self.documentation, samples)
+
+
+class _HistogramValue:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self._lock = threading.Lock()
+        self.buckets = buckets
+        # 마지막 칸은 +Inf
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+
+class Histogram(_Metric):
+    """Observations counted into cumulative buckets, such as request latency in seconds."""
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS, registry: Optional[Registry] = REGISTRY):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def collect(self) -> MetricFamily:
+        samples = []
+        for values, child in list(self._children.items()):
+            labels = self._label_dict(values)
+            with child._lock:
+                counts, total = list(child.counts), child.sum
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                samples.append(Sample(f"{self.name}_bucket", dict(labels, le=_format_value(bound)), cumulative))
+            samples.append(Sample(f"{self.name}_sum", labels, total))
+            samples.append(Sample(f"{self.name}_count", labels, cumulative))
+        return MetricFamily(self.name, self.type, self.documentation, samples)
+
+
+# 여러 모듈이 같이 기록하는 지표
+HTTP_REQUEST_SECONDS = Histogram(
+    "stock_http_request_duration_seconds", "Time to serve a request, until the last body byte is sent.",
+    ["method", "route", "status"]
+)
+DB_QUERY_SECONDS = Histogram(
+    "stock_db_query_duration_seconds", "Time a DAO query takes, excluding the connection checkout.", ["query"]
+)
+DB_QUERY_ROWS = Counter("stock_db_query_rows", "Rows returned by DAO queries.", ["query"])
+DB_ACQUIRE_SECONDS = Histogram(
+    "stock_db_connection_acquire_seconds", "Time spent waiting for a pooled database connection.", ["pool"]
+)
+
+
+def observe_query(name: str, seconds: float, rows: Optional[int] = None):
+    """
+    Record one DAO query.
+
+    Args:
+        name (str): The query name, usually the DAO method.
+        seconds (float): How long the query took.
+        rows (int, optional): The number of rows it returned.
+    """
+    DB_QUERY_SECONDS.labels(name).observe(seconds)
+    if rows is not None:
+        DB_QUERY_ROWS.labels(name).inc(rows)
+
+
+def gauge_family(name: str, documentation: str, values: Dict[Tuple[Tuple[str, str], ...], float]) -> MetricFamily:
+    """
+    Build a gauge family from already computed values.
+
+    Args:
+        name (str): The metric name.
+        documentation (str): The help text.
+        values (Dict): Sample values keyed by their ((label, value), ...) pairs.
+
+    Returns:
+        MetricFamily: The gauge family.
+    """
+    return MetricFamily(name, "gauge", documentation, [Sample(name, dict(labels), value) for labels, value in values.items()])
+
+
+def counter_family(name: str, documentation: str, values: Dict[Tuple[Tuple[str, str], ...], float]) -> MetricFamily:
+    """
+    Build a counter family from totals kept elsewhere (see gauge_family).
+
+    Returns:
+        MetricFamily: The counter family.
+    """
+    return MetricFamily(
+        name, "counter", documentation, [Sample(f"{name}_total", dict(labels), value) for labels, value in values.items()]
+    )
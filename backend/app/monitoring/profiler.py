@@ -0,0 +1,302 @@
+"""
+Sampling profiler for live processes.
+
+A background thread reads the stacks of the other threads with
+sys._current_frames() at a fixed interval and counts identical stacks.
+Nothing is hooked into the profiled code, so it runs at full speed; the
+only cost is the sampler holding the GIL while it walks the stacks, and
+the sampler stretches its interval to keep that share under max_overhead.
+
+The result is written in the collapsed-stack format that flamegraph.pl,
+speedscope and inferno read ("root;caller;callee count" per line), plus a
+JSON summary of the functions that were sampled most.
+
+This module only uses the standard library so the ingestion process can
+use it as well (see db/profile_ingest.py).
+"""
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+DEFAULT_INTERVAL = 0.01
+MIN_INTERVAL = 0.001
+DEFAULT_MAX_OVERHEAD = 0.02
+MAX_DEPTH = 128
+# 서로 다른 스택이 이보다 많아지면 새 스택은 하나로 모아 메모리 사용을 제한한다.
+MAX_STACKS = 20000
+TRUNCATED = "[truncated]"
+# 일을 기다리는 스레드의 맨 위 프레임 (파일, 함수). 기본으로 샘플에서 뺀다.
+IDLE_LEAVES = {("selectors.py", "select"), ("thread.py", "_worker")}
+IDLE_WAITS = {("threading.py", "wait"), ("queue.py", "get")}
+
+
+def frame_label(code) -> str:
+    """
+    Label a code object as "function (dir/file.py:first_line)".
+
+    Args:
+        code: The frame's code object.
+
+    Returns:
+        str: The label used in collapsed stacks.
+    """
+    path = "/".join(code.co_filename.replace("\\", "/").split("/")[-2:])
+    return f"{code.co_name} ({path}:{code.co_firstlineno})"
+
+
+def is_idle(frame) -> bool:
+    """
+    Tell whether a thread is parked waiting for work: an event loop in
+    select() or a pool worker blocked on its queue.
+
+    Args:
+        frame: The innermost frame of the thread.
+
+    Returns:
+        bool: True if the thread is idle.
+    """
+    code = frame.f_code
+    leaf = (os.path.basename(code.co_filename), code.co_name)
+    if leaf in IDLE_LEAVES:
+        return True
+    # Queue.get -> Condition.wait 로 잠든 작업 스레드
+    caller = frame.f_back
+    if leaf in IDLE_WAITS and caller is not None:
+        return (os.path.basename(caller.f_code.co_filename), caller.f_code.co_name) == ("queue.py", "get")
+    return False
+
+
+class SamplingProfiler:
+    """
+    Samples the stacks of all other threads until stopped.
+
+    Use as a context manager, or call start() and stop().
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, max_overhead: float = DEFAULT_MAX_OVERHEAD,
+                 max_seconds: Optional[float] = None, include_idle: bool = False,
+                 thread_filter: Optional[Callable[[int, object], bool]] = None, max_stacks: int = MAX_STACKS):
+        """
+        Args:
+            interval (float, optional): Seconds between samples; at least MIN_INTERVAL.
+            max_overhead (float, optional): The largest share of wall time the
+                sampler may spend walking stacks. The interval grows when a
+                sample takes longer than that allows.
+            max_seconds (float, optional): Stop sampling after this long even
+                if stop() is never called.
+            include_idle (bool, optional): Also count threads that are parked
+                waiting for work (see is_idle). They are counted in
+                idle_samples either way.
+            thread_filter (Callable, optional): Called with (thread id, frame)
+                for every thread at every sample; threads for which it returns
+                False are skipped.
+            max_stacks (int, optional): The largest number of distinct stacks kept.
+        """
+        self.interval = max(interval, MIN_INTERVAL)
+        self.max_overhead = max_overhead
+        self.max_seconds = max_seconds
+        self.include_idle = include_idle
+        self.thread_filter = thread_filter
+        self.max_stacks = max_stacks
+
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.idle_samples = 0
+        self.sampler_seconds = 0.0
+        self.started_at: Optional[datetime] = None
+        self.duration = 0.0
+
+        self._labels: Dict[object, str] = {}
+        self._thread_names: Dict[int, str] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "SamplingProfiler":
+        if self._thread is not None:
+            raise RuntimeError("Profiler already started")
+        self.started_at = datetime.now()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> "SamplingProfiler":
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        return self
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def __enter__(self) -> "SamplingProfiler":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _run(self):
+        own = threading.get_ident()
+        started = time.perf_counter()
+        deadline = started + self.max_seconds if self.max_seconds else None
+        wait = self.interval
+        while not self._stop.wait(wait):
+            sample_started = time.perf_counter()
+            self._sample(own)
+            cost = time.perf_counter() - sample_started
+            self.sampler_seconds += cost
+            # 샘플 한 번의 비용이 간격의 max_overhead를 넘으면 간격을 늘린다.
+            wait = max(self.interval, cost / self.max_overhead)
+            if deadline is not None and sample_started >= deadline:
+                break
+        self.duration = time.perf_counter() - started
+
+    def _thread_name(self, ident: int) -> str:
+        name = self._thread_names.get(ident)
+        if name is None:
+            self._thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+            name = self._thread_names.get(ident, f"thread-{ident}")
+        return name
+
+    def _sample(self, own: int):
+        labels = self._labels
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            if self.thread_filter is not None and not self.thread_filter(ident, frame):
+                continue
+            if is_idle(frame):
+                self.idle_samples += 1
+                if not self.include_idle:
+                    continue
+            stack = []
+            while frame is not None and len(stack) < MAX_DEPTH:
+                code = frame.f_code
+                label = labels.get(code)
+                if label is None:
+                    label = labels[code] = frame_label(code)
+                stack.append(label)
+                frame = frame.f_back
+            stack.append(self._thread_name(ident))
+            key = ";".join(reversed(stack))
+            if key not in self.stacks and len(self.stacks) >= self.max_stacks:
+                key = f"{stack[-1]};{TRUNCATED}"
+            self.stacks[key] += 1
+        self.samples += 1
+
+    def collapsed(self) -> str:
+        """
+        Get the samples in the collapsed-stack format, most frequent first.
+
+        Returns:
+            str: One "thread;outer;...;inner count" line per distinct stack.
+        """
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def report(self, top: int = 20) -> Dict:
+        """
+        Summarize the run.
+
+        Args:
+            top (int, optional): How many functions to list.
+
+        Returns:
+            Dict: Timing and overhead of the run and the top functions by
+            self and total samples (see summarize).
+        """
+        duration = self.duration or 0.0
+        return {
+            "started_at": self.started_at.isoformat(timespec="seconds") if self.started_at else None,
+            "duration_s": round(duration, 3),
+            "interval_ms": round(self.interval * 1000, 3),
+            "samples": self.samples,
+            "idle_samples": self.idle_samples,
+            "stacks": len(self.stacks),
+            "overhead_percent": round(self.sampler_seconds / duration * 100, 2) if duration else 0.0,
+            **summarize(self.stacks, top),
+        }
+
+
+def summarize(stacks: Counter, top: int = 20) -> Dict:
+    """
+    Rank functions by how often they were sampled.
+
+    Args:
+        stacks (Counter): Sample counts keyed by collapsed stack.
+        top (int, optional): How many functions to list.
+
+    Returns:
+        Dict: "stack_samples" (the number of thread stacks sampled),
+        "top_self" (functions at the top of the stack) and "top_total"
+        (functions anywhere on the stack), each a list of
+        {"function", "samples", "percent"}.
+    """
+    total = sum(stacks.values())
+    self_counts: Counter = Counter()
+    total_counts: Counter = Counter()
+    for stack, count in stacks.items():
+        # 첫 프레임은 스레드 이름
+        frames = stack.split(";")[1:]
+        if not frames:
+            continue
+        self_counts[frames[-1]] += count
+        for frame in set(frames):
+            total_counts[frame] += count
+
+    def ranked(counts: Counter) -> List[Dict]:
+        return [
+            {"function": function, "samples": count, "percent": round(count / total * 100, 1)}
+            for function, count in counts.most_common(top)
+        ]
+
+    return {"stack_samples": total, "top_self": ranked(self_counts), "top_total": ranked(total_counts)}
+
+
+def save_profile(profiler: SamplingProfiler, directory: str, name: str, top: int = 20) -> Tuple[str, str]:
+    """
+    Write a finished profile as <name>.collapsed and <name>.json.
+
+    Args:
+        profiler (SamplingProfiler): The stopped profiler.
+        directory (str): The output directory, created if missing.
+        name (str): The file name without extension.
+        top (int, optional): How many functions the summary lists.
+
+    Returns:
+        Tuple[str, str]: The paths of the collapsed stacks and of the summary.
+    """
+    os.makedirs(directory, exist_ok=True)
+    collapsed_path = os.path.join(directory, f"{name}.collapsed")
+    summary_path = os.path.join(directory, f"{name}.json")
+    with open(collapsed_path, "w") as file:
+        file.write(profiler.collapsed())
+    with open(summary_path, "w") as file:
+        json.dump(dict(profiler.report(top), id=name), file, ensure_ascii=False, indent=2)
+    return collapsed_path, summary_path
+
+
+def format_report(report: Dict) -> str:
+    """
+    Format a report as text for the console.
+
+    Args:
+        report (Dict): A result of SamplingProfiler.report.
+
+    Returns:
+        str: The timing line and the top functions by self and total samples.
+    """
+    lines = [
+        f"{report['samples']} samples in {report['duration_s']} s every {report['interval_ms']} ms "
+        f"({report['stack_samples']} thread stacks, {report['idle_samples']} idle, "
+        f"sampler overhead {report['overhead_percent']}%)"
+    ]
+    for title, key in (("self", "top_self"), ("total", "top_total")):
+        lines.append(f"\nTop functions by {title} samples:")
+        for entry in report[key]:
+            lines.append(f"{entry['samples']:>8} {entry['percent']:>6.1f}%  {entry['function']}")
+    return "\n".join(lines)
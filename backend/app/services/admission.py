@@ -0,0 +1,199 @@
+import asyncio
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from monitoring.metrics import Counter, Gauge, Histogram
+
+# 동시에 스트리밍할 수 있는 내보내기 수. 내보내기는 끝날 때까지 풀 연결을 하나씩 잡고 있다. 0이면 제한하지 않는다.
+MAX_CONCURRENT_EXPORTS = int(os.getenv("STOCK_MAX_CONCURRENT_EXPORTS", "2"))
+EXPORT_RETRY_AFTER_SECONDS = int(os.getenv("STOCK_EXPORT_RETRY_AFTER", "30"))
+# 동시에 실행할 수 있는 DB 조회 수. 기본값은 연결 풀에서 내보내기 몫을 뺀 크기. 0이면 제한하지 않는다.
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+MAX_CONCURRENT_QUERIES = int(os.getenv(
+    "STOCK_MAX_CONCURRENT_QUERIES", str(max(1, DB_POOL_MAX_SIZE - max(MAX_CONCURRENT_EXPORTS, 0)))
+))
+# 자리가 날 때까지 기다릴 수 있는 조회 수. 넘치면 바로 거절한다.
+MAX_QUEUED_QUERIES = int(os.getenv("STOCK_MAX_QUEUED_QUERIES", "50"))
+# 대기열에서 기다리는 최대 시간 (초). 받아들인 요청의 지연 시간 상한이 된다.
+QUEUE_TIMEOUT = float(os.getenv("STOCK_QUEUE_TIMEOUT", "0.5"))
+RETRY_AFTER_SECONDS = int(os.getenv("STOCK_RETRY_AFTER", "1"))
+
+ADMISSION_QUEUE_DEPTH = Gauge("stock_admission_queue_depth", "Database queries waiting for a slot.")
+ADMISSION_IN_FLIGHT = Gauge("stock_admission_in_flight", "Database queries holding a slot.")
+ADMISSION_WAIT_SECONDS = Histogram(
+    "stock_admission_wait_seconds", "Time admitted database queries waited for a slot.",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+ADMISSION_SHED = Counter("stock_admission_shed", "Database queries rejected because the database was saturated.", ["reason"])
+EXPORTS_IN_PROGRESS = Gauge("stock_exports_in_progress", "Exports holding a database connection.")
+EXPORTS_REJECTED = Counter("stock_exports_rejected", "Exports rejected because every export slot was taken.")
+
+
+class Overloaded(RuntimeError):
+    """Raised when a database query is shed instead of queued."""
+
+    def __init__(self, reason: str, retry_after: int = RETRY_AFTER_SECONDS):
+        super().__init__(f"Too many concurrent database queries ({reason}), retry in {retry_after} s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Process-wide limit on concurrent database queries with a bounded FIFO
+    wait queue.
+
+    A query runs at once while fewer than max_concurrent are running.
+    Otherwise it waits in line, at most timeout seconds; when the line is
+    full or the wait times out it is rejected with Overloaded, so callers
+    fail fast instead of piling up on the connection pool and threadpool.
+    Slots are handed straight to the next waiter on release, so a newcomer
+    cannot overtake the queue.
+    """
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super(AdmissionController, cls).__new__(cls, *args, **kwargs)
+            cls._instance.configure(MAX_CONCURRENT_QUERIES, MAX_QUEUED_QUERIES, QUEUE_TIMEOUT)
+        return cls._instance
+
+    def configure(self, max_concurrent: int, max_queued: int, timeout: float):
+        """
+        Set the limits. Only call this while no query holds a slot.
+
+        Args:
+            max_concurrent (int): Queries allowed to run at once; 0 disables admission control.
+            max_queued (int): Queries allowed to wait for a slot.
+            timeout (float): Seconds a query may wait before it is rejected.
+        """
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.timeout = timeout
+        self.active = 0
+        self.waiters = deque()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_concurrent > 0
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """
+        Hold a query slot for the duration of the block.
+
+        Raises:
+            Overloaded: If the wait queue is full or the wait timed out.
+        """
+        if not self.enabled:
+            yield
+            return
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self):
+        if self.active < self.max_concurrent and not self.waiters:
+            self._set_active(self.active + 1)
+            ADMISSION_WAIT_SECONDS.observe(0)
+            return
+        if len(self.waiters) >= self.max_queued:
+            self._shed("queue_full")
+
+        started = time.perf_counter()
+        future = asyncio.get_running_loop().create_future()
+        self.waiters.append(future)
+        ADMISSION_QUEUE_DEPTH.set(len(self.waiters))
+        try:
+            # 자리를 넘겨받으면 release()가 future를 완료한다 (active는 그대로).
+            await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError:
+            # 3.12+의 wait_for는 자리를 넘겨받은 뒤에도 시간이 지나면 TimeoutError를 낸다.
+            # 이미 자리를 받았다면 거절하지 않고 그대로 쓴다.
+            if not (future.done() and not future.cancelled()):
+                self._shed("timeout")
+        except asyncio.CancelledError:
+            # 자리를 넘겨받은 직후에 취소됐다면 다음 대기자에게 돌려준다.
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+        finally:
+            if future in self.waiters:
+                self.waiters.remove(future)
+            ADMISSION_QUEUE_DEPTH.set(len(self.waiters))
+        ADMISSION_WAIT_SECONDS.observe(time.perf_counter() - started)
+
+    def release(self):
+        while self.waiters:
+            future = self.waiters.popleft()
+            if not future.done():
+                future.set_result(None)
+                ADMISSION_QUEUE_DEPTH.set(len(self.waiters))
+                return
+        self._set_active(self.active - 1)
+
+    def _set_active(self, active: int):
+        self.active = active
+        ADMISSION_IN_FLIGHT.set(active)
+
+    def _shed(self, reason: str):
+        ADMISSION_SHED.labels(reason).inc()
+        raise Overloaded(reason)
+
+
+class ExportSlot:
+    """One held export slot. release() may be called more than once."""
+
+    def __init__(self, limiter: "ExportLimiter"):
+        self.limiter = limiter
+        self.released = False
+
+    def release(self):
+        if not self.released:
+            self.released = True
+            self.limiter.release()
+
+
+class ExportLimiter:
+    """
+    Process-wide limit on concurrent exports.
+
+    An export keeps a pooled connection for as long as the client reads,
+    so exports do not queue: when every slot is taken the request is
+    rejected right away, and the rest of the pool stays free for the
+    queries behind AdmissionController.
+    """
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super(ExportLimiter, cls).__new__(cls, *args, **kwargs)
+            cls._instance.max_concurrent = MAX_CONCURRENT_EXPORTS
+            cls._instance.active = 0
+        return cls._instance
+
+    def acquire(self) -> ExportSlot:
+        """
+        Take an export slot without waiting.
+
+        Returns:
+            ExportSlot: The slot; release it when the export ends.
+
+        Raises:
+            Overloaded: If every export slot is taken.
+        """
+        if self.max_concurrent > 0 and self.active >= self.max_concurrent:
+            EXPORTS_REJECTED.inc()
+            raise Overloaded("export_limit", EXPORT_RETRY_AFTER_SECONDS)
+        self.active += 1
+        EXPORTS_IN_PROGRESS.set(self.active)
+        return ExportSlot(self)
+
+    def release(self):
+        self.active -= 1
+        EXPORTS_IN_PROGRESS.set(self.active)
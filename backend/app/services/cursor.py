@@ -0,0 +1,50 @@
+import base64
+import json
+from typing import List, Optional, Tuple
+
+
+class InvalidCursor(ValueError):
+    """Raised when a client sends a cursor that was not issued by this API."""
+
+
+def encode_cursor(values: List) -> str:
+    """
+    Encode keyset values into an opaque cursor.
+
+    Args:
+        values (List): The sort key of the last row on the page.
+
+    Returns:
+        str: A URL-safe cursor string.
+    """
+    raw = json.dumps(values, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], types: Tuple[type, ...]) -> Optional[List]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor (str, optional): The cursor sent by the client.
+        types (Tuple[type, ...]): The expected type of each keyset value.
+
+    Returns:
+        List: The keyset values, or None when no cursor was given.
+
+    Raises:
+        InvalidCursor: If the cursor is malformed.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError) as e:
+        raise InvalidCursor(f"Malformed cursor: {e}")
+    if not isinstance(values, list) or len(values) != len(types):
+        raise InvalidCursor("Malformed cursor")
+    for value, expected in zip(values, types):
+        if not isinstance(value, expected) or isinstance(value, bool):
+            raise InvalidCursor("Malformed cursor")
+    return values
@@ -0,0 +1,40 @@
+from datetime import date
+from typing import AsyncIterator, Optional
+
+from dao.export_dao import ExportDAO, build_export_query
+
+EXPORT_DATASETS = ["stock_info", "prices"]
+EXPORT_FORMATS = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+
+
+class ExportService:
+    def __init__(self, dao: ExportDAO):
+        self.dao = dao
+
+    def export(self, dataset: str, export_format: str, start: Optional[date] = None,
+               end: Optional[date] = None) -> AsyncIterator[bytes]:
+        """
+        Stream a whole dataset as CSV or NDJSON.
+
+        Listings are ordered by short_code, prices by (short_code, bas_dt).
+
+        Args:
+            dataset (str): "stock_info" or "prices".
+            export_format (str): "csv" or "ndjson".
+            start (date, optional): For prices, the first bas_dt. Defaults to the first loaded day.
+            end (date, optional): For prices, the last bas_dt. Defaults to the last loaded day.
+
+        Returns:
+            AsyncIterator[bytes]: The body chunks.
+
+        Raises:
+            ValueError: If the dataset or format is unknown, or start is after end.
+        """
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {export_format}")
+        if start is not None and end is not None and start > end:
+            raise ValueError("'from' must not be after 'to'")
+        query, args = build_export_query(dataset, start, end)
+        if export_format == "csv":
+            return self.dao.stream_csv(query, *args)
+        return self.dao.stream_ndjson(query, *args)
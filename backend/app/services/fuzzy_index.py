@@ -0,0 +1,186 @@
+"""
+Typo-tolerant name matching with a SymSpell-style deletion index.
+
+Every indexed term stores the strings obtained by deleting up to
+MAX_FUZZY_DISTANCE characters from its first PREFIX_LENGTH characters. Two
+strings within edit distance d share such a deletion, so a query only looks
+up its own deletions and verifies the few candidates with a bounded edit
+distance instead of comparing against every row.
+
+Hangul is decomposed into jamo first, so 종묵 -> 종목 is one edit.
+"""
+import os
+from typing import Dict, List, Optional, Set, Tuple
+
+from services.hangul import decompose
+
+FUZZY_FIELDS = ["item_name", "corporate_name"]
+MAX_FUZZY_DISTANCE = int(os.getenv("FUZZY_MAX_DISTANCE", "2"))
+# 삭제 변형은 앞 PREFIX_LENGTH 자모로만 만든다. 길수록 후보가 줄지만 색인이 커진다.
+PREFIX_LENGTH = 10
+
+
+def fuzzy_term(text: Optional[str]) -> str:
+    """
+    Normalize a name for fuzzy matching.
+
+    Args:
+        text (str): The name.
+
+    Returns:
+        str: The lowercased name without whitespace, Hangul decomposed into jamo.
+    """
+    if not text:
+        return ""
+    return decompose("".join(text.lower().split()))
+
+
+def deletes(term: str, distance: int) -> Set[str]:
+    """
+    Generate every string made by deleting up to distance characters.
+
+    Args:
+        term (str): The string.
+        distance (int): The maximum number of deletions.
+
+    Returns:
+        Set[str]: The deletions, including the term itself.
+    """
+    results = {term}
+    frontier = {term}
+    for _ in range(distance):
+        next_frontier = set()
+        for value in frontier:
+            for i in range(len(value)):
+                deleted = value[:i] + value[i + 1:]
+                if deleted not in results:
+                    next_frontier.add(deleted)
+        results |= next_frontier
+        frontier = next_frontier
+    return results
+
+
+def edit_distance(a: str, b: str, limit: int) -> Optional[int]:
+    """
+    Optimal string alignment distance (Levenshtein plus adjacent
+    transpositions), giving up once it must exceed limit.
+
+    Args:
+        a (str): The first string.
+        b (str): The second string.
+        limit (int): The largest distance of interest.
+
+    Returns:
+        int: The distance, or None if it is greater than limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return None
+    # 공통 접두사/접미사는 거리에 영향이 없으므로 잘라낸다.
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end_a, end_b = len(a), len(b)
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    # 잘라낸 경계의 전치를 놓치지 않도록 한 글자 여유를 둔다.
+    start = max(start - 1, 0)
+    a, b = a[start:min(end_a + 1, len(a))], b[start:min(end_b + 1, len(b))]
+    if not a or not b:
+        distance = max(len(a), len(b))
+        return distance if distance <= limit else None
+
+    # 대각선에서 limit보다 멀리 떨어진 칸은 결과가 limit를 넘으므로 계산하지 않는다.
+    too_far = limit + 1
+    previous2 = None
+    previous = [j if j <= limit else too_far for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        current = [too_far] * (len(b) + 1)
+        if i <= limit:
+            current[0] = i
+        row_min = too_far
+        for j in range(max(1, i - limit), min(len(b), i + limit) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if previous2 is not None and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, previous2[j - 2] + 1)
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        # 한 행의 최솟값이 한도를 넘으면 이후 행도 넘는다.
+        if row_min > limit:
+            return None
+        previous2, previous = previous, current
+    distance = previous[len(b)]
+    return distance if distance <= limit else None
+
+
+def effective_distance(term: str, max_distance: int) -> int:
+    # 짧은 검색어에 큰 거리를 허용하면 거의 모든 종목이 걸리므로 길이의 1/3까지만 허용
+    return min(max_distance, len(term) // 3)
+
+
+class FuzzyIndex:
+    """
+    Deletion index over the FUZZY_FIELDS of a list of rows. Row ids are
+    positions in that list.
+    """
+
+    def __init__(self, rows: List[Dict], max_distance: int = MAX_FUZZY_DISTANCE):
+        self.max_distance = max_distance
+        self.terms: List[str] = []
+        self.term_rows: List[List[int]] = []
+        # 삭제 변형 -> term id
+        self.deletes: Dict[str, List[int]] = {}
+
+        term_ids: Dict[str, int] = {}
+        for row_id, row in enumerate(rows):
+            for field in FUZZY_FIELDS:
+                term = fuzzy_term(row.get(field))
+                if not term:
+                    continue
+                term_id = term_ids.get(term)
+                if term_id is None:
+                    term_id = term_ids[term] = len(self.terms)
+                    self.terms.append(term)
+                    self.term_rows.append([])
+                    for deleted in deletes(term[:PREFIX_LENGTH], max_distance):
+                        self.deletes.setdefault(deleted, []).append(term_id)
+                if not self.term_rows[term_id] or self.term_rows[term_id][-1] != row_id:
+                    self.term_rows[term_id].append(row_id)
+
+    def search(self, query: str, max_distance: int) -> List[Tuple[int, int]]:
+        """
+        Find rows whose item_name or corporate_name is within max_distance
+        edits of the query.
+
+        Args:
+            query (str): The search query.
+            max_distance (int): The largest edit distance, in jamo for Hangul.
+                Capped at the distance the index was built for.
+
+        Returns:
+            List[Tuple[int, int]]: (distance, row id) pairs, closest first
+            and then in row order. A row matching through both fields is
+            listed once with its smaller distance.
+        """
+        term = fuzzy_term(query)
+        if not term:
+            return []
+        distance = effective_distance(term, min(max_distance, self.max_distance))
+
+        candidates: Set[int] = set()
+        for deleted in deletes(term[:PREFIX_LENGTH], distance):
+            posting = self.deletes.get(deleted)
+            if posting:
+                candidates.update(posting)
+
+        best: Dict[int, int] = {}
+        for term_id in candidates:
+            found = edit_distance(term, self.terms[term_id], distance)
+            if found is None:
+                continue
+            for row_id in self.term_rows[term_id]:
+                if found < best.get(row_id, distance + 1):
+                    best[row_id] = found
+        return sorted((found, row_id) for row_id, found in best.items())
@@ -0,0 +1,87 @@
+"""
+Hangul helpers shared by the search indexes.
+"""
+
+# 초성 목록 (유니코드 한글 음절 순서)
+CHOSEONG = [
+    "ㄱ", "ㄲ", "ㄴ", "ㄷ", "ㄸ", "ㄹ", "ㅁ", "ㅂ", "ㅃ", "ㅅ",
+    "ㅆ", "ㅇ", "ㅈ", "ㅉ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ",
+]
+JUNGSEONG = [
+    "ㅏ", "ㅐ", "ㅑ", "ㅒ", "ㅓ", "ㅔ", "ㅕ", "ㅖ", "ㅗ", "ㅘ", "ㅙ",
+    "ㅚ", "ㅛ", "ㅜ", "ㅝ", "ㅞ", "ㅟ", "ㅠ", "ㅡ", "ㅢ", "ㅣ",
+]
+# 받침 없음("") 포함 28개
+JONGSEONG = [
+    "", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ",
+    "ㄿ", "ㅀ", "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ",
+]
+CHOSEONG_SET = set(CHOSEONG)
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+SYLLABLES_PER_CHOSEONG = len(JUNGSEONG) * len(JONGSEONG)
+
+
+def to_choseong(text: str) -> str:
+    """
+    Convert Hangul syllables to their initial consonants (초성).
+
+    Args:
+        text (str): The text to convert.
+
+    Returns:
+        str: The text with each Hangul syllable replaced by its 초성.
+    """
+    chars = []
+    for char in text:
+        code = ord(char)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            chars.append(CHOSEONG[(code - HANGUL_BASE) // SYLLABLES_PER_CHOSEONG])
+        else:
+            chars.append(char)
+    return "".join(chars)
+
+
+def is_choseong_query(text: str) -> bool:
+    """
+    Check whether the query consists only of initial consonants.
+
+    Args:
+        text (str): The normalized query.
+
+    Returns:
+        bool: True if every non-space character is a 초성.
+    """
+    has_choseong = False
+    for char in text:
+        if char in CHOSEONG_SET:
+            has_choseong = True
+        elif not char.isspace():
+            return False
+    return has_choseong
+
+
+def decompose(text: str) -> str:
+    """
+    Decompose Hangul syllables into their jamo (초성, 중성, 종성).
+
+    A typo usually changes one jamo rather than a whole syllable, so edit
+    distances over the decomposed text match how names are mistyped.
+
+    Args:
+        text (str): The text to decompose.
+
+    Returns:
+        str: The text with each Hangul syllable replaced by its jamo.
+    """
+    chars = []
+    for char in text:
+        code = ord(char)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            offset = code - HANGUL_BASE
+            chars.append(CHOSEONG[offset // SYLLABLES_PER_CHOSEONG])
+            chars.append(JUNGSEONG[(offset % SYLLABLES_PER_CHOSEONG) // len(JONGSEONG)])
+            chars.append(JONGSEONG[offset % len(JONGSEONG)])
+        else:
+            chars.append(char)
+    return "".join(chars)
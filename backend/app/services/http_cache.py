@@ -0,0 +1,129 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+def make_etag(version: str) -> str:
+    """
+    Build a weak ETag from a data version.
+
+    The ETag is weak so compressed and uncompressed bodies of the same
+    listing share it.
+
+    Args:
+        version (str): The data version token.
+
+    Returns:
+        str: The ETag header value.
+    """
+    return f'W/"{hashlib.sha1(version.encode("utf-8")).hexdigest()[:20]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag (weak comparison).
+
+    Args:
+        if_none_match (str, optional): The request header value.
+        etag (str): The current ETag.
+
+    Returns:
+        bool: True if the client's copy is current.
+    """
+    if not if_none_match:
+        return False
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+class VersionedResponseCache:
+    """
+    LRU cache of encoded responses for the current data version.
+
+    When a newer version is seen the current entries are set aside as the
+    previous version, so a cached body is never served as current once the
+    data it was built from has changed. The previous version's entries are
+    only handed out by get_stale, for a limited time after they were
+    superseded, to answer requests the database cannot take.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._version = None
+        self._entries = OrderedDict()
+        self._previous_version = None
+        self._previous_entries = OrderedDict()
+        self._superseded_at = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+
+    def _roll(self, version: str):
+        # 이전 버전 하나만 남겨 둔다.
+        if self._version is not None:
+            self._previous_version = self._version
+            self._previous_entries = self._entries
+            self._superseded_at = time.monotonic()
+            self._entries = OrderedDict()
+        self._version = version
+
+    def get(self, version: str, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            if version != self._version:
+                self._roll(version)
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+
+    def get_stale(self, key: Hashable, max_age: float) -> Optional[Tuple[str, Any]]:
+        """
+        Get an entry of the previous data version.
+
+        Args:
+            key (Hashable): The cache key.
+            max_age (float): Seconds after being superseded during which the
+                previous version may still be served.
+
+        Returns:
+            Tuple[str, Any]: The previous version and the cached value, or
+            None if there is no such entry or it is too old.
+        """
+        with self._lock:
+            if key not in self._previous_entries or time.monotonic() - self._superseded_at > max_age:
+                return None
+            self.stale_hits += 1
+            return self._previous_version, self._previous_entries[key]
+
+    def put(self, version: str, key: Hashable, value: Any):
+        with self._lock:
+            if version != self._version:
+                self._roll(version)
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._version = None
+            self._entries.clear()
+            self._previous_version = None
+            self._previous_entries = OrderedDict()
+
+    def stats(self) -> Dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses,
+                "stale_entries": len(self._previous_entries), "stale_hits": self.stale_hits}
@@ -0,0 +1,165 @@
+import asyncio
+import os
+from datetime import date, timedelta
+from typing import List, Dict, Optional
+
+import numpy as np
+from fastapi.concurrency import run_in_threadpool
+
+from analytics import indicators
+from dao.stock_price_dao import StockPriceDAO
+
+INDICATOR_FIELDS = ["close", "return_1d", "ma_5", "ma_20", "ma_60", "volatility_20", "rsi_14", "volume_z_20"]
+# 60일 이동평균을 계산할 수 있도록 달력 기준 180일을 읽는다.
+LOOKBACK_DAYS = int(os.getenv("INDICATOR_LOOKBACK_DAYS", "180"))
+
+
+def _to_python(value: float) -> Optional[float]:
+    return None if np.isnan(value) else float(value)
+
+
+class IndicatorFrame:
+    """
+    Whole-market indicator arrays shaped (stocks, days) for one latest bas_dt.
+    """
+
+    def __init__(self, bas_dt: date, records: List, item_names: Dict[str, str]):
+        self.bas_dt = bas_dt
+        self.item_names = item_names
+
+        short_codes = np.array([record[0] for record in records], dtype=object)
+        bas_dts = np.array([record[1] for record in records], dtype="datetime64[D]")
+        self.codes, code_index = np.unique(short_codes.astype(str), return_inverse=True)
+        self.dates, date_index = np.unique(bas_dts, return_inverse=True)
+        self.row_by_code = {code: row for row, code in enumerate(self.codes)}
+
+        shape = (len(self.codes), len(self.dates))
+        close = np.full(shape, np.nan)
+        volume = np.full(shape, np.nan)
+        close[code_index, date_index] = np.array([record[2] for record in records], dtype=float)
+        volume[code_index, date_index] = np.array([record[3] for record in records], dtype=float)
+
+        self.values = {
+            "close": close,
+            "return_1d": indicators.returns(close),
+            "ma_5": indicators.moving_average(close, 5),
+            "ma_20": indicators.moving_average(close, 20),
+            "ma_60": indicators.moving_average(close, 60),
+            "volatility_20": indicators.volatility(close, 20),
+            "rsi_14": indicators.rsi(close, 14),
+            "volume_z_20": indicators.zscore(volume, 20),
+        }
+
+    def series(self, short_code: str, days: int) -> Optional[Dict]:
+        row = self.row_by_code.get(short_code)
+        if row is None:
+            return None
+        start = max(len(self.dates) - days, 0)
+        points = []
+        for column in range(start, len(self.dates)):
+            point = {"bas_dt": self.dates[column].item()}
+            for field in INDICATOR_FIELDS:
+                point[field] = _to_python(self.values[field][row, column])
+            points.append(point)
+        return {"short_code": short_code, "item_name": self.item_names.get(short_code), "points": points}
+
+    def screen(self, filters: Dict[str, tuple], sort_by: str, descending: bool, limit: int) -> List[Dict]:
+        latest = {field: values[:, -1] for field, values in self.values.items()}
+        mask = np.ones(len(self.codes), dtype=bool)
+        for field, (low, high) in filters.items():
+            column = latest[field]
+            if low is not None:
+                mask &= column >= low
+            if high is not None:
+                mask &= column <= high
+        rows = np.flatnonzero(mask & ~np.isnan(latest[sort_by]))
+        order = np.argsort(latest[sort_by][rows], kind="stable")
+        if descending:
+            order = order[::-1]
+        results = []
+        for row in rows[order[:limit]]:
+            short_code = str(self.codes[row])
+            result = {"short_code": short_code, "item_name": self.item_names.get(short_code), "bas_dt": self.bas_dt}
+            for field in INDICATOR_FIELDS:
+                result[field] = _to_python(latest[field][row])
+            results.append(result)
+        return results
+
+
+class IndicatorCache:
+    """
+    Process-wide holder of the current IndicatorFrame, keyed by the latest bas_dt.
+    """
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super(IndicatorCache, cls).__new__(cls, *args, **kwargs)
+            cls._instance.frame = None
+            cls._instance.lock = asyncio.Lock()
+        return cls._instance
+
+
+class IndicatorService:
+    def __init__(self, dao: StockPriceDAO, cache: Optional[IndicatorCache] = None):
+        self.dao = dao
+        self.cache = cache or IndicatorCache()
+
+    async def refresh(self) -> bool:
+        """
+        Recompute the indicators if a newer bas_dt has been loaded.
+
+        Returns:
+            bool: True if the indicators were recomputed.
+        """
+        async with self.cache.lock:
+            latest = await self.dao.fetch_latest_bas_dt()
+            frame = self.cache.frame
+            if latest is None or (frame is not None and frame.bas_dt == latest):
+                return False
+            records = await self.dao.fetch_market_history(latest - timedelta(days=LOOKBACK_DAYS), latest)
+            item_names = await self.dao.fetch_item_names(latest)
+            # 배열 계산은 CPU 작업이므로 이벤트 루프 밖에서 수행
+            self.cache.frame = await run_in_threadpool(IndicatorFrame, latest, records, item_names)
+            print(f"Indicators computed for {len(self.cache.frame.codes)} stocks up to {latest}")
+            return True
+
+    async def _frame(self) -> Optional[IndicatorFrame]:
+        if self.cache.frame is None:
+            await self.refresh()
+        return self.cache.frame
+
+    async def get_indicators(self, short_code: str, days: int) -> Optional[Dict]:
+        """
+        Get the recent indicator series of one stock.
+
+        Args:
+            short_code (str): The stock short code.
+            days (int): The number of most recent trading days.
+
+        Returns:
+            Dict: The series, or None if the stock has no price history.
+        """
+        frame = await self._frame()
+        if frame is None:
+            return None
+        return frame.series(short_code, days)
+
+    async def screen(self, filters: Dict[str, tuple], sort_by: str, descending: bool, limit: int) -> List[Dict]:
+        """
+        Screen the whole market on the latest indicator values.
+
+        Args:
+            filters (Dict[str, tuple]): (min, max) bounds by indicator field.
+                None leaves a side unbounded.
+            sort_by (str): The indicator field to sort by.
+            descending (bool): Sort from the highest value.
+            limit (int): The maximum number of stocks.
+
+        Returns:
+            List[Dict]: The latest indicator values of the matching stocks.
+        """
+        frame = await self._frame()
+        if frame is None:
+            return []
+        return frame.screen(filters, sort_by, descending, limit)
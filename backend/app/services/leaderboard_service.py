@@ -0,0 +1,100 @@
+import asyncio
+from datetime import date
+from typing import List, Dict, Optional
+
+import numpy as np
+from fastapi.concurrency import run_in_threadpool
+
+from dao.stock_price_dao import StockPriceDAO
+
+# API 필드명 -> stock_price 컬럼
+LEADERBOARD_METRICS = {
+    "fltRt": "flt_rt",
+    "trqu": "trqu",
+    "mrktTotAmt": "mrkt_tot_amt",
+}
+MAX_LEADERBOARD_SIZE = 100
+
+
+def _ranked(rows: List[Dict], order) -> List[Dict]:
+    return [dict(rows[index], rank=rank) for rank, index in enumerate(order, start=1)]
+
+
+class Leaderboards:
+    """
+    Top-N and bottom-N rankings of one trading day for every metric.
+    """
+
+    def __init__(self, bas_dt: date, rows: List[Dict]):
+        self.bas_dt = bas_dt
+        self.boards = {}
+        for metric, column in LEADERBOARD_METRICS.items():
+            values = np.array([np.nan if row[column] is None else float(row[column]) for row in rows])
+            valid = np.flatnonzero(~np.isnan(values))
+            size = min(MAX_LEADERBOARD_SIZE, len(valid))
+            if size == 0:
+                self.boards[metric] = ([], [])
+                continue
+            # 전체 정렬 대신 argpartition으로 상/하위 후보만 골라 정렬
+            top = valid[np.argpartition(-values[valid], size - 1)[:size]]
+            top = top[np.argsort(-values[top], kind="stable")]
+            bottom = valid[np.argpartition(values[valid], size - 1)[:size]]
+            bottom = bottom[np.argsort(values[bottom], kind="stable")]
+            self.boards[metric] = (_ranked(rows, top), _ranked(rows, bottom))
+
+
+class LeaderboardCache:
+    """
+    Process-wide holder of the latest day's leaderboards.
+    """
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super(LeaderboardCache, cls).__new__(cls, *args, **kwargs)
+            cls._instance.leaderboards = None
+            cls._instance.lock = asyncio.Lock()
+        return cls._instance
+
+
+class LeaderboardService:
+    def __init__(self, dao: StockPriceDAO, cache: Optional[LeaderboardCache] = None):
+        self.dao = dao
+        self.cache = cache or LeaderboardCache()
+
+    async def refresh(self) -> bool:
+        """
+        Recompute the leaderboards if a newer bas_dt has been loaded.
+
+        Returns:
+            bool: True if the leaderboards were recomputed.
+        """
+        async with self.cache.lock:
+            latest = await self.dao.fetch_latest_bas_dt()
+            current = self.cache.leaderboards
+            if latest is None or (current is not None and current.bas_dt == latest):
+                return False
+            rows = await self.dao.fetch_day(latest)
+            self.cache.leaderboards = await run_in_threadpool(Leaderboards, latest, rows)
+            print(f"Leaderboards computed for {len(rows)} stocks on {latest}")
+            return True
+
+    async def get_top(self, metric: str, n: int) -> Optional[Dict]:
+        """
+        Get the top and bottom stocks of the latest trading day.
+
+        Args:
+            metric (str): One of LEADERBOARD_METRICS.
+            n (int): The number of stocks on each side, at most MAX_LEADERBOARD_SIZE.
+
+        Returns:
+            Dict: The bas_dt, metric and top/bottom entries, or None if no
+            prices have been loaded.
+        """
+        if self.cache.leaderboards is None:
+            await self.refresh()
+        leaderboards = self.cache.leaderboards
+        if leaderboards is None:
+            return None
+        top, bottom = leaderboards.boards[metric]
+        return {"bas_dt": leaderboards.bas_dt, "metric": metric, "top": top[:n], "bottom": bottom[:n]}
@@ -0,0 +1,188 @@
+import asyncio
+import os
+import time
+from typing import Dict, List, Optional
+
+from dao.async_stock_info_dao import async_pool_stats
+from dao.connection_pool import connection_pool_stats
+from dao.ingestion_run_dao import IngestionRunDAO
+from monitoring.metrics import REGISTRY, MetricFamily, Registry, Sample, counter_family, gauge_family, render
+from services.http_cache import VersionedResponseCache
+from services.query_cache import SearchResultCache
+from services.stock_search_index import StockSearchIndex
+
+# ingestion_run은 적재 때만 바뀌므로 스크레이프마다 조회하지 않는다.
+INGESTION_METRICS_TTL = float(os.getenv("METRICS_INGESTION_TTL", "30"))
+# DB가 느려도 /metrics 응답은 이 시간 안에 끝낸다 (이전 값을 그대로 보낸다).
+INGESTION_QUERY_TIMEOUT = float(os.getenv("METRICS_INGESTION_TIMEOUT", "2"))
+# 적재 프로세스가 metrics에 남기는 API 요청 지연 시간 (ms) -> summary quantile
+API_REQUEST_QUANTILES = {"0.5": "api_page_ms_p50", "0.95": "api_page_ms_p95", "1": "api_page_ms_max"}
+RUN_ROW_COUNTS = ["inserted", "updated", "unchanged", "prices"]
+
+
+def ms_to_seconds(value: float) -> float:
+    # 적재 프로세스는 0.1ms 단위로 반올림해서 남긴다.
+    return round(value / 1000, 4)
+
+
+def cache_families(response_cache: VersionedResponseCache,
+                   search_index: Optional[StockSearchIndex]) -> List[MetricFamily]:
+    """
+    Expose the hit counters and sizes of the in-process caches.
+
+    Args:
+        response_cache (VersionedResponseCache): The encoded /stocks response cache.
+        search_index (StockSearchIndex, optional): The search index, if enabled.
+
+    Returns:
+        List[MetricFamily]: The cache metrics.
+    """
+    search = SearchResultCache().stats()
+    responses = response_cache.stats()
+    families = [
+        counter_family("stock_search_cache_requests", "Search result cache lookups by outcome.", {
+            (("result", "hit"),): search["hits"],
+            (("result", "prefix_hit"),): search["prefix_hits"],
+            (("result", "coalesced"),): search["coalesced"],
+            (("result", "miss"),): search["misses"],
+        }),
+        gauge_family("stock_search_cache_entries", "Queries held in the search result cache.", {(): search["entries"]}),
+        gauge_family("stock_search_cache_bytes", "Estimated memory held by the search result cache.", {(): search["bytes"]}),
+        counter_family("stock_response_cache_requests", "Encoded /stocks response cache lookups by outcome.", {
+            (("result", "hit"),): responses["hits"],
+            (("result", "miss"),): responses["misses"],
+            (("result", "stale"),): responses["stale_hits"],
+        }),
+        gauge_family("stock_response_cache_entries", "Responses held in the encoded response cache.", {(): responses["entries"]}),
+    ]
+    if search_index is not None:
+        families.append(gauge_family(
+            "stock_search_index_rows", "Rows in the in-memory search index; 0 until it is loaded.",
+            {(): len(search_index.rows)}
+        ))
+    return families
+
+
+def pool_families() -> List[MetricFamily]:
+    """
+    Expose the state of the database connection pools that have been created.
+
+    Returns:
+        List[MetricFamily]: Connections by state, pool capacity and checkout timeouts.
+    """
+    connections, capacity, timeouts = {}, {}, {}
+    stats = async_pool_stats()
+    if stats is not None:
+        connections[(("pool", "asyncpg"), ("state", "idle"))] = stats["idle"]
+        connections[(("pool", "asyncpg"), ("state", "in_use"))] = stats["size"] - stats["idle"]
+        capacity[(("pool", "asyncpg"),)] = stats["max_size"]
+    stats = connection_pool_stats()
+    if stats is not None:
+        connections[(("pool", "psycopg2"), ("state", "idle"))] = stats["idle"]
+        connections[(("pool", "psycopg2"), ("state", "in_use"))] = stats["in_use"]
+        capacity[(("pool", "psycopg2"),)] = stats["max_size"]
+        timeouts[(("pool", "psycopg2"),)] = stats["timeouts"]
+    return [
+        gauge_family("stock_db_pool_connections", "Open pooled database connections by state.", connections),
+        gauge_family("stock_db_pool_max_connections", "Largest number of connections a pool may open.", capacity),
+        counter_family("stock_db_pool_timeouts", "Connection checkouts that gave up waiting.", timeouts),
+    ]
+
+
+def ingestion_families(runs: List[Dict]) -> List[MetricFamily]:
+    """
+    Build metrics from the latest ingestion run of each status.
+
+    Args:
+        runs (List[Dict]): The runs returned by IngestionRunDAO.fetch_latest_runs.
+
+    Returns:
+        List[MetricFamily]: Run counts, the time, duration, row counts and
+        phase timings of the latest runs, and their upstream API latency.
+    """
+    run_counts, finished, durations, rows, phases, retries = {}, {}, {}, {}, {}, {}
+    api_samples = []
+    for run in runs:
+        status = (("status", run["status"]),)
+        metrics = run["metrics"]
+        run_counts[status] = run["runs"]
+        if run["finished_at"] is not None:
+            # 스케줄러가 로컬 시간(datetime.now())으로 기록한다.
+            finished[status] = run["finished_at"].timestamp()
+        if run["duration_ms"] is not None:
+            durations[status] = ms_to_seconds(run["duration_ms"])
+        for kind in RUN_ROW_COUNTS:
+            if run[kind] is not None:
+                rows[status + (("kind", kind),)] = run[kind]
+        for key, value in metrics.items():
+            # probe_ms, download_ms, parse_ms, stock_info_merge_ms, commit_ms 등
+            if key.endswith("_ms") and not key.startswith("api_") and isinstance(value, (int, float)):
+                phases[status + (("phase", key[:-3]),)] = ms_to_seconds(value)
+        if metrics.get("api_requests"):
+            name, labels = "stock_ingestion_api_request_seconds", dict(status)
+            for quantile, key in API_REQUEST_QUANTILES.items():
+                if key in metrics:
+                    api_samples.append(Sample(name, dict(labels, quantile=quantile), ms_to_seconds(metrics[key])))
+            api_samples.append(Sample(f"{name}_sum", labels, ms_to_seconds(metrics.get("api_page_ms_sum", 0))))
+            api_samples.append(Sample(f"{name}_count", labels, metrics["api_requests"]))
+            retries[status] = metrics.get("api_retries", 0)
+    return [
+        counter_family("stock_ingestion_runs", "Recorded ingestion runs by status.", run_counts),
+        gauge_family("stock_ingestion_last_run_timestamp_seconds", "When the latest run of each status finished, in Unix time.", finished),
+        gauge_family("stock_ingestion_last_run_duration_seconds", "Duration of the latest run of each status.", durations),
+        gauge_family("stock_ingestion_last_run_rows", "Rows the latest run of each status wrote or left unchanged.", rows),
+        gauge_family("stock_ingestion_last_run_phase_seconds", "Duration of each phase of the latest run of each status.", phases),
+        MetricFamily("stock_ingestion_api_request_seconds", "summary",
+                     "Latency of the public-data API requests of the latest run of each status.", api_samples),
+        gauge_family("stock_ingestion_api_retries", "Retried public-data API requests of the latest run of each status.", retries),
+    ]
+
+
+class IngestionMetricsCache:
+    """
+    Process-wide holder of the last ingestion metrics read from the database.
+    """
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super(IngestionMetricsCache, cls).__new__(cls, *args, **kwargs)
+            cls._instance.families = []
+            cls._instance.expires_at = 0.0
+            cls._instance.lock = asyncio.Lock()
+        return cls._instance
+
+
+class MetricsService:
+    def __init__(self, ingestion_dao: IngestionRunDAO, registry: Registry = REGISTRY):
+        self.ingestion_dao = ingestion_dao
+        self.registry = registry
+        self.cache = IngestionMetricsCache()
+
+    async def get_ingestion_families(self) -> List[MetricFamily]:
+        """
+        Get the ingestion metrics, reading ingestion_run at most once per
+        INGESTION_METRICS_TTL seconds.
+
+        Returns:
+            List[MetricFamily]: The ingestion metrics. If the database cannot
+            be read, the last known values (or none) are returned.
+        """
+        async with self.cache.lock:
+            if time.monotonic() >= self.cache.expires_at:
+                try:
+                    runs = await asyncio.wait_for(self.ingestion_dao.fetch_latest_runs(), INGESTION_QUERY_TIMEOUT)
+                    self.cache.families = ingestion_families(runs)
+                except Exception as e:
+                    print(f"Error fetching ingestion metrics: {e}")
+                self.cache.expires_at = time.monotonic() + INGESTION_METRICS_TTL
+            return self.cache.families
+
+    async def render(self) -> str:
+        """
+        Render every metric of this process and of the ingestion process.
+
+        Returns:
+            str: The metrics in the Prometheus text format.
+        """
+        return render(self.registry.collect() + await self.get_ingestion_families())
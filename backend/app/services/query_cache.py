@@ -0,0 +1,266 @@
+import asyncio
+import os
+import sys
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from services.stock_search_index import RANK_EXACT_CODE, RANK_NAME_PREFIX, RANK_SUBSTRING, bisect_after
+
+# 한 검색어의 전체 결과가 이보다 많으면 캐시하지 않고 DB에서 페이지 단위로 조회한다.
+MAX_CACHED_ROWS = int(os.getenv("SEARCH_CACHE_MAX_ROWS", "2000"))
+MAX_CACHE_BYTES = int(os.getenv("SEARCH_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+# 결과가 너무 많았던 검색어는 기억해 두고 다음 페이지부터는 바로 DB로 보낸다.
+MAX_OVERSIZED_QUERIES = 1024
+
+MATCH_FIELDS = ["short_code", "isin_code", "market_category", "item_name", "corporate_number", "corporate_name"]
+
+
+def cache_key(query: str) -> str:
+    # DB 검색은 ILIKE/lower() 비교이므로 대소문자만 다른 검색어는 결과가 같다.
+    return query.lower()
+
+
+def estimate_size(rows: List[Dict]) -> int:
+    """
+    Roughly estimate the memory held by a result set.
+
+    Args:
+        rows (List[Dict]): The cached rows.
+
+    Returns:
+        int: The estimated size in bytes.
+    """
+    size = sys.getsizeof(rows)
+    for row in rows:
+        size += sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row.values())
+    return size
+
+
+def rank_row(key: str, row: Dict) -> Optional[int]:
+    """
+    Rank a row against a lowercased query the way the search SQL does.
+
+    Args:
+        key (str): The lowercased query.
+        row (Dict): A stock_info row.
+
+    Returns:
+        int: The match rank, or None if the row does not match.
+    """
+    values = {field: (row.get(field) or "").lower() for field in MATCH_FIELDS}
+    if not any(key in value for value in values.values()):
+        return None
+    if key == values["short_code"] or key == values["isin_code"]:
+        return RANK_EXACT_CODE
+    if values["item_name"].startswith(key):
+        return RANK_NAME_PREFIX
+    return RANK_SUBSTRING
+
+
+def row_key(row: Dict) -> Tuple[int, str, str]:
+    return (row["rank"], row["item_name"] or "", row["short_code"] or "")
+
+
+def narrow(rows: List[Dict], key: str) -> List[Dict]:
+    """
+    Answer a query from the cached results of a query it extends.
+
+    Every row matching the longer query also matches its prefix, so
+    filtering the prefix's complete result set gives the complete result
+    set of the longer query. Ranks are recomputed for the new query.
+
+    Args:
+        rows (List[Dict]): The complete result set of a prefix of the query.
+        key (str): The lowercased query.
+
+    Returns:
+        List[Dict]: The matching rows in search order.
+    """
+    narrowed = []
+    for row in rows:
+        rank = rank_row(key, row)
+        if rank is not None:
+            narrowed.append(dict(row, rank=rank))
+    narrowed.sort(key=row_key)
+    return narrowed
+
+
+def slice_after(rows: List[Dict], after: Optional[Tuple], size: int) -> List[Dict]:
+    """
+    Take one keyset page from a complete, ordered result set.
+
+    Args:
+        rows (List[Dict]): Rows ordered by (rank, item_name, short_code).
+        after (Tuple, optional): The key of the last row of the previous page.
+        size (int): The number of rows to return.
+
+    Returns:
+        List[Dict]: Up to `size` rows after the cursor.
+    """
+    start = bisect_after(rows, tuple(after), row_key) if after is not None else 0
+    return rows[start:start + size]
+
+
+class SearchResultCache:
+    """
+    Process-wide LRU cache of complete search result sets, in front of the
+    database search.
+
+    - Concurrent misses for the same query share one database call.
+    - A query that extends a cached query (삼 -> 삼성) is answered by
+      filtering the cached rows in memory.
+    - Entries are bounded by total estimated size and dropped when the
+      stock_info data version changes.
+    """
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super(SearchResultCache, cls).__new__(cls, *args, **kwargs)
+            cls._instance.max_bytes = MAX_CACHE_BYTES
+            cls._instance.version = None
+            cls._instance._generation = 0
+            cls._instance._entries = OrderedDict()
+            cls._instance._size = 0
+            cls._instance._inflight = {}
+            cls._instance._oversized = set()
+            cls._instance.hits = 0
+            cls._instance.prefix_hits = 0
+            cls._instance.misses = 0
+            cls._instance.coalesced = 0
+        return cls._instance
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def invalidate(self, version: Optional[str] = None):
+        """
+        Drop every entry unless the data version is unchanged.
+
+        Args:
+            version (str, optional): The current stock_info data version.
+                None always clears the cache.
+        """
+        if version is not None and version == self.version:
+            return
+        self.version = version
+        self._generation += 1
+        self._entries.clear()
+        self._oversized.clear()
+        self._size = 0
+
+    def _get(self, key: str) -> Optional[List[Dict]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def _put(self, key: str, rows: List[Dict]):
+        size = estimate_size(rows)
+        if size > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._size -= old[1]
+        self._entries[key] = (rows, size)
+        self._size += size
+        while self._size > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._size -= evicted_size
+
+    def lookup(self, query: str) -> Optional[List[Dict]]:
+        """
+        Find the complete result set of a query without touching the database.
+
+        Args:
+            query (str): The search query.
+
+        Returns:
+            List[Dict]: The ranked rows, or None if neither the query nor a
+            prefix of it is cached.
+        """
+        key = cache_key(query)
+        rows = self._get(key)
+        if rows is not None:
+            self.hits += 1
+            return rows
+        # 가장 긴 접두어부터 찾는다. 후보가 적을수록 필터링이 싸다.
+        for length in range(len(key) - 1, 0, -1):
+            prefix_rows = self._get(key[:length])
+            if prefix_rows is not None:
+                self.prefix_hits += 1
+                rows = narrow(prefix_rows, key)
+                self._put(key, rows)
+                return rows
+        return None
+
+    async def get_or_load(self, query: str, loader: Callable[[], Awaitable[List[Dict]]]) -> Optional[List[Dict]]:
+        """
+        Return the complete result set of a query, loading it at most once
+        for all concurrent callers. If the caller doing the load is
+        cancelled, the callers waiting on it load the query again themselves.
+
+        Args:
+            query (str): The search query.
+            loader (Callable): Coroutine function fetching up to
+                MAX_CACHED_ROWS + 1 ranked rows from the database.
+
+        Returns:
+            List[Dict]: The ranked rows, or None if the query matches more
+            than MAX_CACHED_ROWS rows and has to be paged in the database.
+        """
+        rows = self.lookup(query)
+        if rows is not None:
+            return rows
+        key = cache_key(query)
+        if key in self._oversized:
+            return None
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # 먼저 조회하던 요청이 취소됐다. 이 요청이 직접 다시 조회한다.
+                return await self.get_or_load(query, loader)
+
+        self.misses += 1
+        generation = self._generation
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            rows = await loader()
+            # 조회 중에 적재가 끝났다면 이전 버전 결과는 캐시하지 않는다.
+            current = generation == self._generation
+            if len(rows) > MAX_CACHED_ROWS:
+                rows = None
+                if current and len(self._oversized) < MAX_OVERSIZED_QUERIES:
+                    self._oversized.add(key)
+            elif current:
+                self._put(key, rows)
+            future.set_result(rows)
+            return rows
+        except Exception as e:
+            future.set_exception(e)
+            # 기다리는 요청이 없으면 "exception was never retrieved" 경고가 나므로 소비해 둔다.
+            future.exception()
+            raise
+        finally:
+            if not future.done():
+                # 조회하던 요청이 취소됐다 (클라이언트 연결 종료 등). 기다리는 요청이 멈추지 않도록 알린다.
+                future.cancel()
+            del self._inflight[key]
+
+    def stats(self) -> Dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._size,
+            "hits": self.hits,
+            "prefix_hits": self.prefix_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+        }
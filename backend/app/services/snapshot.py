@@ -0,0 +1,129 @@
+"""
+On-disk snapshot of stock_info for fast startup.
+
+Layout:
+    MAGIC (8 bytes) | header length (uint32, little endian) | header | body
+
+The header is a JSON object with the data version, row count and column
+names; the body is a JSON array of rows in column order. Files are
+replaced atomically, so a reader never sees a partial snapshot.
+"""
+import mmap
+import os
+import struct
+from typing import Dict, List, Optional, Tuple
+
+import orjson
+
+from dao.stock_info_queries import STOCK_INFO_COLUMNS
+
+# 비워 두면 스냅샷을 쓰지도 읽지도 않는다.
+SNAPSHOT_PATH = os.getenv("STOCK_SNAPSHOT_PATH", "/app/data/stock_info.snapshot")
+MAGIC = b"STKSNAP1"
+PREFIX = struct.Struct("<8sI")
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot file is missing parts or has an unknown format."""
+
+
+def _read_header(buffer) -> Tuple[Dict, int]:
+    if len(buffer) < PREFIX.size:
+        raise SnapshotError("Snapshot is truncated")
+    magic, header_size = PREFIX.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise SnapshotError("Not a stock_info snapshot")
+    body_start = PREFIX.size + header_size
+    if len(buffer) < body_start:
+        raise SnapshotError("Snapshot header is truncated")
+    return orjson.loads(buffer[PREFIX.size:body_start]), body_start
+
+
+def read_snapshot_version(path: str = SNAPSHOT_PATH) -> Optional[str]:
+    """
+    Read only the data version of a snapshot.
+
+    Args:
+        path (str, optional): The snapshot file.
+
+    Returns:
+        str: The data version, or None if there is no readable snapshot.
+    """
+    try:
+        with open(path, "rb") as file:
+            prefix = file.read(PREFIX.size)
+            if len(prefix) < PREFIX.size:
+                return None
+            _, header_size = PREFIX.unpack(prefix)
+            header, _ = _read_header(prefix + file.read(header_size))
+        return header.get("version")
+    except (OSError, ValueError, SnapshotError):
+        return None
+
+
+def read_snapshot(path: str = SNAPSHOT_PATH) -> Optional[Tuple[List[Dict], str]]:
+    """
+    Load the rows of a snapshot through a read-only memory map.
+
+    Args:
+        path (str, optional): The snapshot file.
+
+    Returns:
+        Tuple[List[Dict], str]: The stock_info rows and their data version,
+        or None if there is no usable snapshot.
+    """
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                header, body_start = _read_header(view)
+                # mmap을 닫기 전에 모든 memoryview를 해제해야 한다.
+                with view[body_start:] as body:
+                    values = orjson.loads(body)
+    except (OSError, ValueError, SnapshotError) as e:
+        print(f"Ignoring unreadable snapshot {path}: {e}")
+        return None
+    columns = header.get("columns")
+    if columns != STOCK_INFO_COLUMNS or len(values) != header.get("count"):
+        print(f"Ignoring snapshot {path}: columns or row count do not match")
+        return None
+    return [dict(zip(columns, row)) for row in values], header.get("version")
+
+
+def write_snapshot(rows: List[Dict], version: str, path: str = SNAPSHOT_PATH) -> bool:
+    """
+    Write a snapshot unless the file already holds this data version.
+
+    Args:
+        rows (List[Dict]): The stock_info rows.
+        version (str): The data version the rows were read at.
+        path (str, optional): The snapshot file.
+
+    Returns:
+        bool: True if a new snapshot was written.
+    """
+    if not path or read_snapshot_version(path) == version:
+        return False
+    header = orjson.dumps({"version": version, "count": len(rows), "columns": STOCK_INFO_COLUMNS})
+    body = orjson.dumps([[row.get(column) for column in STOCK_INFO_COLUMNS] for row in rows])
+    # 워커 여러 개가 동시에 써도 되도록 프로세스별 임시 파일에 쓴 뒤 교체한다.
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(temp_path, "wb") as file:
+            file.write(PREFIX.pack(MAGIC, len(header)))
+            file.write(header)
+            file.write(body)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except OSError as e:
+        print(f"Error writing snapshot {path}: {e}")
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        return False
+    print(f"Snapshot written: {len(rows)} rows (version {version})")
+    return True
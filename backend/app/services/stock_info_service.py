@@ -1,29 +1,255 @@
-from dao.stock_info_dao import StockInfoDAO
-from typing import List, Dict
+import inspect
+from fastapi.concurrency import run_in_threadpool
+from services.cursor import encode_cursor, decode_cursor
+from services.stock_search_index import StockSearchIndex, build_key_maps
+from services.hangul import is_choseong_query
+from services.query_cache import SearchResultCache, MAX_CACHED_ROWS, slice_after
+from services.admission import AdmissionController
+from models.stock_info import StockInfoRecord
+from typing import List, Dict, Optional, Tuple
+
+
+class SearchIndexUnavailable(RuntimeError):
+    """Raised when a search needs the in-memory index and it is not loaded."""
+
 
 class StockInfoService:
-    def __init__(self, dao: StockInfoDAO):
+    """
+    Stock information use cases.
+
+    Works with either AsyncStockInfoDAO or the blocking StockInfoDAO. Calls
+    to a blocking DAO are moved to the threadpool so the event loop is never
+    blocked, which keeps the two DAOs comparable behind the same routes.
+
+    With an AdmissionController, the queries made for a request wait for a
+    slot and raise Overloaded when the database is saturated; answers from
+    the search index and the query cache are never held back.
+    """
+
+    def __init__(self, dao, search_index: Optional[StockSearchIndex] = None,
+                 query_cache: Optional[SearchResultCache] = None,
+                 admission: Optional[AdmissionController] = None):
         self.dao = dao
+        self.search_index = search_index
+        self.query_cache = query_cache
+        self.admission = admission
+
+    @property
+    def _index_ready(self) -> bool:
+        return self.search_index is not None and self.search_index.is_ready
 
-    def get_all_stocks(self) -> List[Dict]:
+    @property
+    def data_version(self) -> Optional[str]:
         """
-        Get all stock information.
+        The stock_info data version the search index (or, without an index,
+        the query cache) was built from, or None before the first refresh.
+        """
+        if self._index_ready:
+            return self.search_index.version
+        if self.query_cache is not None:
+            return self.query_cache.version
+        return None
+
+    async def _call(self, method, *args):
+        if inspect.iscoroutinefunction(method):
+            return await method(*args)
+        return await run_in_threadpool(method, *args)
+
+    async def _query(self, method, *args):
+        if self.admission is None:
+            return await self._call(method, *args)
+        async with self.admission.slot():
+            return await self._call(method, *args)
+
+    async def get_all_stocks(self, limit: int, cursor: Optional[str] = None,
+                             fields: Optional[List[str]] = None) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Get one page of stock information ordered by short_code.
+
+        The loaded search index serves the listing from memory; otherwise
+        the database is queried.
+
+        Args:
+            limit (int): The page size.
+            cursor (str, optional): The cursor returned with the previous page.
+            fields (List[str], optional): Return only these columns. Defaults to all.
+
+        Returns:
+            Tuple[List[Dict], Optional[str]]: The page and the cursor of the
+            next page, or None on the last page.
+        """
+        after = decode_cursor(cursor, (str,))
+        if self._index_ready:
+            stock_info = self.search_index.list_stocks(limit + 1, after[0] if after else None)
+        else:
+            stock_info = await self._query(self.dao.fetch_stock_info, limit + 1, after[0] if after else None, fields)
+        page, next_cursor = self._paginate(stock_info, limit, lambda row: [row["short_code"]])
+        return self._project(page, fields), next_cursor
+
+    async def get_all_stock_records(self, limit: int, cursor: Optional[str] = None) -> Tuple[List[StockInfoRecord], Optional[str]]:
+        """
+        Same as get_all_stocks, but returns compact StockInfoRecord objects
+        for the fast serialization path.
 
         Returns:
-            List[Dict]: A list of dictionaries containing stock information.
+            Tuple[List[StockInfoRecord], Optional[str]]: The page and the
+            cursor of the next page, or None on the last page.
         """
-        stock_info = self.dao.fetch_stock_info()
-        return stock_info
-    
-    def search_stocks(self, query: str) -> List[Dict]:
+        after = decode_cursor(cursor, (str,))
+        if self._index_ready:
+            records = [StockInfoRecord.from_dict(row) for row in self.search_index.list_stocks(limit + 1, after[0] if after else None)]
+        else:
+            records = await self._query(self.dao.fetch_stock_info_records, limit + 1, after[0] if after else None)
+        return self._paginate(records, limit, lambda record: [record.short_code])
+
+    async def search_stocks(self, query: str, limit: int, cursor: Optional[str] = None,
+                            fields: Optional[List[str]] = None) -> Tuple[List[Dict], Optional[str]]:
         """
-        Search stocks by query.
+        Search stocks by query, best matches first.
+
+        The in-memory search index answers the query when it is loaded.
+        Otherwise the database is searched through the query cache, which
+        coalesces identical concurrent searches and answers longer queries
+        from the cached results of their prefixes. 초성 queries (e.g. ㅅㅅ)
+        can only be answered by the index.
 
         Args:
             query (str): The search query.
+            limit (int): The page size.
+            cursor (str, optional): The cursor returned with the previous page.
+            fields (List[str], optional): Return only these columns. Defaults to all.
+
+        Returns:
+            Tuple[List[Dict], Optional[str]]: The page and the cursor of the
+            next page, or None on the last page.
+
+        Raises:
+            SearchIndexUnavailable: If the query is a 초성 query and the search
+                index is disabled or not loaded yet.
+        """
+        after = decode_cursor(cursor, (int, str, str))
+        if not self._index_ready and is_choseong_query(query):
+            # SQL의 ILIKE로는 초성 검색을 할 수 없으므로 빈 결과 대신 503을 낸다.
+            raise SearchIndexUnavailable("초성 search needs the stock search index, which is not loaded")
+        if self._index_ready:
+            stock_info = self.search_index.search(query, limit + 1, after)
+        else:
+            stock_info = None
+            if self.query_cache is not None:
+                rows = await self.query_cache.get_or_load(
+                    query, lambda: self._query(self.dao.search_stock_info, query, MAX_CACHED_ROWS + 1)
+                )
+                if rows is not None:
+                    stock_info = slice_after(rows, after, limit + 1)
+            if stock_info is None:
+                stock_info = await self._query(self.dao.search_stock_info, query, limit + 1, after, fields)
+        page, next_cursor = self._paginate(stock_info, limit, lambda row: [row["rank"], row["item_name"], row["short_code"]])
+        return self._project(page, fields), next_cursor
+
+    async def fuzzy_search_stocks(self, query: str, limit: int, cursor: Optional[str] = None,
+                                  fields: Optional[List[str]] = None,
+                                  max_distance: int = 2) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Search stocks by item_name or corporate_name allowing typos, closest
+        matches first.
+
+        Only the in-memory search index can answer fuzzy searches.
+
+        Args:
+            query (str): The search query.
+            limit (int): The page size.
+            cursor (str, optional): The cursor returned with the previous page.
+            fields (List[str], optional): Return only these columns. Defaults to all.
+            max_distance (int, optional): The largest edit distance, counted
+                in jamo for Hangul. Defaults to 2.
+
+        Returns:
+            Tuple[List[Dict], Optional[str]]: The page and the cursor of the
+            next page, or None on the last page.
+
+        Raises:
+            SearchIndexUnavailable: If the search index is disabled or not loaded yet.
+        """
+        after = decode_cursor(cursor, (int, str, str))
+        if not self._index_ready:
+            raise SearchIndexUnavailable("Fuzzy search needs the stock search index, which is not loaded")
+        stock_info = self.search_index.fuzzy_search(query, max_distance, limit + 1, after)
+        page, next_cursor = self._paginate(stock_info, limit, lambda row: [row["rank"], row["item_name"], row["short_code"]])
+        return self._project(page, fields), next_cursor
+
+    async def lookup_stocks(self, short_codes: List[str], isin_codes: List[str],
+                            item_names: List[str]) -> Tuple[List[Dict], Dict[str, List[str]]]:
+        """
+        Resolve lists of codes and exact item names to stocks.
+
+        The search index's hash maps answer the lookup when it is loaded;
+        otherwise one query fetches every candidate row. Codes are matched
+        case-insensitively.
+
+        Args:
+            short_codes (List[str]): Short codes to resolve.
+            isin_codes (List[str]): ISIN codes to resolve.
+            item_names (List[str]): Exact item names to resolve.
+
+        Returns:
+            Tuple[List[Dict], Dict[str, List[str]]]: The resolved stocks in
+            request order without duplicates, and the keys that matched
+            nothing, grouped like the request.
+        """
+        groups = [
+            ("short_code", "short_codes", short_codes, [code.strip().upper() for code in short_codes]),
+            ("isin_code", "isin_codes", isin_codes, [code.strip().upper() for code in isin_codes]),
+            ("item_name", "item_names", item_names, [name.strip() for name in item_names]),
+        ]
+        if self._index_ready:
+            key_maps = self.search_index.key_maps
+        else:
+            rows = await self._query(self.dao.fetch_stock_info_by_keys, *(keys for _, _, _, keys in groups))
+            key_maps = build_key_maps(rows)
+
+        stocks, seen = [], set()
+        unresolved = {group: [] for _, group, _, _ in groups}
+        for field, group, originals, keys in groups:
+            lookup = key_maps[field]
+            for original, key in zip(originals, keys):
+                row = lookup.get(key)
+                if row is None:
+                    unresolved[group].append(original)
+                elif row["short_code"] not in seen:
+                    seen.add(row["short_code"])
+                    stocks.append(row)
+        return stocks, unresolved
+
+    @staticmethod
+    def _paginate(rows: List[Dict], limit: int, key) -> Tuple[List[Dict], Optional[str]]:
+        # limit + 1 행을 조회해서 다음 페이지가 있는지 판단한다.
+        if len(rows) <= limit:
+            return rows, None
+        page = rows[:limit]
+        return page, encode_cursor(key(page[-1]))
+
+    @staticmethod
+    def _project(rows: List[Dict], fields: Optional[List[str]]) -> List[Dict]:
+        # 커서 계산에 쓴 키 컬럼은 페이지를 자른 뒤에 제거한다.
+        if fields is None:
+            return rows
+        return [{field: row[field] for field in fields} for row in rows]
+
+    async def refresh_search_index(self) -> bool:
+        """
+        Reload the search index if the stock_info data version has changed.
 
         Returns:
-            List[Dict]: A list of dictionaries containing stock information.
+            bool: True if the index was rebuilt.
         """
-        stock_info = self.dao.search_stock_info(query)
-        return stock_info
+        version = await self._call(self.dao.fetch_data_version)
+        if self.query_cache is not None:
+            self.query_cache.invalidate(version)
+        if self.search_index is None:
+            return False
+        if self.search_index.is_ready and version == self.search_index.version:
+            return False
+        rows = await self._call(self.dao.fetch_stock_info)
+        # 색인 생성은 CPU 작업이므로 이벤트 루프를 막지 않도록 스레드에서 수행
+        await run_in_threadpool(self.search_index.load, rows, version)
+        return True
@@ -0,0 +1,33 @@
+from datetime import date, timedelta
+from typing import List, Dict, Optional
+
+from dao.stock_price_dao import StockPriceDAO
+
+# 기간을 지정하지 않으면 최근 1년을 반환
+DEFAULT_PRICE_RANGE = timedelta(days=365)
+
+
+class StockPriceService:
+    def __init__(self, dao: StockPriceDAO):
+        self.dao = dao
+
+    async def get_prices(self, short_code: str, start: Optional[date] = None, end: Optional[date] = None) -> List[Dict]:
+        """
+        Get the daily prices of one stock.
+
+        Args:
+            short_code (str): The stock short code.
+            start (date, optional): The first date. Defaults to one year before end.
+            end (date, optional): The last date. Defaults to today.
+
+        Returns:
+            List[Dict]: Daily prices ordered by bas_dt.
+
+        Raises:
+            ValueError: If start is after end.
+        """
+        end = end or date.today()
+        start = start or end - DEFAULT_PRICE_RANGE
+        if start > end:
+            raise ValueError("'from' must not be after 'to'")
+        return await self.dao.fetch_prices(short_code, start, end)
@@ -0,0 +1,293 @@
+from bisect import bisect_right
+from typing import List, Dict, Optional, Set, Tuple
+
+from services.fuzzy_index import FuzzyIndex
+from services.hangul import is_choseong_query, to_choseong
+
+INDEX_FIELDS = ["item_name", "short_code", "isin_code", "market_category", "corporate_number", "corporate_name"]
+# 일괄 조회(/stocks/lookup)에 쓰는 정확히 일치 키
+LOOKUP_FIELDS = ["short_code", "isin_code", "item_name"]
+CHOSEONG_FIELDS = ["item_name", "corporate_name"]
+NGRAM_SIZE = 2
+
+# 검색 결과 순위: 코드 완전 일치 > 종목명 접두 일치 > 부분 일치
+RANK_EXACT_CODE = 0
+RANK_NAME_PREFIX = 1
+RANK_SUBSTRING = 2
+
+
+def normalize(text: Optional[str]) -> str:
+    """
+    Normalize text for indexing and matching.
+
+    Args:
+        text (str): The text to normalize.
+
+    Returns:
+        str: The lowercased text without surrounding whitespace.
+    """
+    if not text:
+        return ""
+    return text.strip().lower()
+
+
+def sort_key(row: Dict) -> Tuple[str, str]:
+    return (row.get("item_name") or "", row.get("short_code") or "")
+
+
+def build_key_maps(rows: List[Dict]) -> Dict[str, Dict[str, Dict]]:
+    """
+    Build exact-match hash maps over the lookup columns.
+
+    Args:
+        rows (List[Dict]): Stock information rows.
+
+    Returns:
+        Dict[str, Dict[str, Dict]]: For each of LOOKUP_FIELDS, a map from
+        the column value to its row.
+    """
+    key_maps = {field: {} for field in LOOKUP_FIELDS}
+    for row in rows:
+        for field in LOOKUP_FIELDS:
+            if row.get(field):
+                key_maps[field][row[field]] = row
+    return key_maps
+
+
+def bisect_after(items: List, target: Tuple, key) -> int:
+    """
+    bisect_right with a key function (bisect's own key= needs Python 3.10).
+
+    Args:
+        items (List): Items sorted by key.
+        target (Tuple): The key to search for.
+        key (Callable): Maps an item to its sort key.
+
+    Returns:
+        int: The index of the first item whose key is greater than target.
+    """
+    low, high = 0, len(items)
+    while low < high:
+        middle = (low + high) // 2
+        if target < key(items[middle]):
+            high = middle
+        else:
+            low = middle + 1
+    return low
+
+
+def ngrams(text: str, size: int = NGRAM_SIZE) -> Set[str]:
+    """
+    Split text into overlapping n-grams.
+
+    Args:
+        text (str): The text to split.
+        size (int, optional): The n-gram length. Defaults to NGRAM_SIZE.
+
+    Returns:
+        set: The distinct n-grams of the text.
+    """
+    if len(text) < size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+class _IndexState:
+    """
+    Immutable snapshot of the index. A refresh builds a new state and swaps
+    it in, so readers never see a half-built index.
+    """
+
+    def __init__(self, rows: List[Dict], version: Optional[str]):
+        # row id 순서가 (item_name, short_code) 순서와 같도록 정렬해 둔다.
+        self.rows = sorted(rows, key=sort_key)
+        self.version = version
+        # row id -> normalized values used for verification
+        self.values: List[List[str]] = []
+        self.choseong_values: List[List[str]] = []
+        # 1글자 검색을 위한 unigram 색인과 n-gram 색인
+        self.unigrams: Dict[str, Set[int]] = {}
+        self.grams: Dict[str, Set[int]] = {}
+        self.choseong_unigrams: Dict[str, Set[int]] = {}
+        self.choseong_grams: Dict[str, Set[int]] = {}
+        # 전체 목록 조회(short_code 순)용
+        self.by_code = sorted(self.rows, key=lambda row: row.get("short_code") or "")
+        self.codes = [row.get("short_code") or "" for row in self.by_code]
+        self.key_maps = build_key_maps(self.rows)
+        self.fuzzy = FuzzyIndex(self.rows)
+
+        for row_id, row in enumerate(self.rows):
+            values = [normalize(row.get(field)) for field in INDEX_FIELDS]
+            choseong_values = [to_choseong(normalize(row.get(field))) for field in CHOSEONG_FIELDS]
+            self.values.append(values)
+            self.choseong_values.append(choseong_values)
+            for value in values:
+                self._add(self.unigrams, set(value), row_id)
+                self._add(self.grams, ngrams(value), row_id)
+            for value in choseong_values:
+                self._add(self.choseong_unigrams, set(value), row_id)
+                self._add(self.choseong_grams, ngrams(value), row_id)
+
+    @staticmethod
+    def _add(postings: Dict[str, Set[int]], keys: Set[str], row_id: int):
+        for key in keys:
+            postings.setdefault(key, set()).add(row_id)
+
+    @staticmethod
+    def _candidates(query: str, unigrams: Dict[str, Set[int]], grams: Dict[str, Set[int]]) -> Set[int]:
+        if len(query) < NGRAM_SIZE:
+            return unigrams.get(query, set())
+        posting_lists = []
+        for gram in ngrams(query):
+            posting = grams.get(gram)
+            if not posting:
+                return set()
+            posting_lists.append(posting)
+        posting_lists.sort(key=len)
+        candidates = set(posting_lists[0])
+        for posting in posting_lists[1:]:
+            candidates &= posting
+            if not candidates:
+                break
+        return candidates
+
+    def _rank(self, query: str, row_id: int, choseong: bool) -> int:
+        if choseong:
+            return RANK_NAME_PREFIX if self.choseong_values[row_id][0].startswith(query) else RANK_SUBSTRING
+        item_name, short_code, isin_code = self.values[row_id][:3]
+        if query == short_code or query == isin_code:
+            return RANK_EXACT_CODE
+        if item_name.startswith(query):
+            return RANK_NAME_PREFIX
+        return RANK_SUBSTRING
+
+    def search(self, query: str) -> List[Tuple[int, int]]:
+        choseong = is_choseong_query(query)
+        if choseong:
+            candidates = self._candidates(query, self.choseong_unigrams, self.choseong_grams)
+            values = self.choseong_values
+        else:
+            candidates = self._candidates(query, self.unigrams, self.grams)
+            values = self.values
+        # n-gram 교집합은 후보일 뿐이므로 실제 부분 문자열 포함 여부를 확인
+        return sorted(
+            (self._rank(query, row_id, choseong), row_id) for row_id in candidates
+            if any(query in value for value in values[row_id])
+        )
+
+
+class StockSearchIndex:
+    """
+    In-memory n-gram index over stock_info used to answer /stocks?query=
+    without touching Postgres.
+    """
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super(StockSearchIndex, cls).__new__(cls, *args, **kwargs)
+            cls._instance._state = None
+        return cls._instance
+
+    @property
+    def is_ready(self) -> bool:
+        return self._state is not None
+
+    @property
+    def version(self) -> Optional[str]:
+        state = self._state
+        return state.version if state else None
+
+    @property
+    def key_maps(self) -> Dict[str, Dict[str, Dict]]:
+        state = self._state
+        return state.key_maps if state else build_key_maps([])
+
+    @property
+    def rows(self) -> List[Dict]:
+        state = self._state
+        return state.rows if state else []
+
+    def load(self, rows: List[Dict], version: Optional[str] = None):
+        """
+        Build the index from stock rows and swap it in.
+
+        Args:
+            rows (List[Dict]): Stock information rows as returned by the DAO.
+            version (str, optional): The data version the rows were read at.
+        """
+        self._state = _IndexState(list(rows), version)
+        print(f"Stock search index loaded: {len(rows)} rows (version {version})")
+
+    def search(self, query: str, limit: Optional[int] = None, after: Optional[Tuple] = None) -> List[Dict]:
+        """
+        Search stocks by substring or 초성 query, best matches first.
+
+        Args:
+            query (str): The search query.
+            limit (int, optional): The maximum number of rows to return.
+            after (Tuple, optional): The (rank, item_name, short_code) key of
+                the last row of the previous page.
+
+        Returns:
+            List[Dict]: A list of dictionaries containing stock information
+            and the match rank.
+        """
+        state = self._state
+        if state is None:
+            raise RuntimeError("Stock search index is not loaded")
+        normalized = normalize(query)
+        if not normalized:
+            return []
+        matches = state.search(normalized)
+        start = 0
+        if after is not None:
+            start = bisect_after(matches, tuple(after), lambda match: (match[0], *sort_key(state.rows[match[1]])))
+        end = len(matches) if limit is None else start + limit
+        return [dict(state.rows[row_id], rank=rank) for rank, row_id in matches[start:end]]
+
+    def fuzzy_search(self, query: str, max_distance: int, limit: Optional[int] = None,
+                     after: Optional[Tuple] = None) -> List[Dict]:
+        """
+        Search stocks by item_name or corporate_name allowing typos, closest
+        matches first.
+
+        Args:
+            query (str): The search query.
+            max_distance (int): The largest edit distance, counted in jamo
+                for Hangul.
+            limit (int, optional): The maximum number of rows to return.
+            after (Tuple, optional): The (distance, item_name, short_code) key
+                of the last row of the previous page.
+
+        Returns:
+            List[Dict]: A list of dictionaries containing stock information
+            and the edit distance as rank.
+        """
+        state = self._state
+        if state is None:
+            raise RuntimeError("Stock search index is not loaded")
+        matches = state.fuzzy.search(query, max_distance)
+        start = 0
+        if after is not None:
+            start = bisect_after(matches, tuple(after), lambda match: (match[0], *sort_key(state.rows[match[1]])))
+        end = len(matches) if limit is None else start + limit
+        return [dict(state.rows[row_id], rank=distance) for distance, row_id in matches[start:end]]
+
+    def list_stocks(self, limit: Optional[int] = None, after_short_code: Optional[str] = None) -> List[Dict]:
+        """
+        List stocks ordered by short_code, one keyset page at a time.
+
+        Args:
+            limit (int, optional): The maximum number of rows to return.
+            after_short_code (str, optional): Return rows after this short_code.
+
+        Returns:
+            List[Dict]: A list of dictionaries containing stock information.
+        """
+        state = self._state
+        if state is None:
+            raise RuntimeError("Stock search index is not loaded")
+        start = bisect_right(state.codes, after_short_code) if after_short_code is not None else 0
+        end = len(state.codes) if limit is None else start + limit
+        return [dict(row) for row in state.by_code[start:end]]
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 앱은 backend/app에서 실행되므로 같은 방식으로 모듈을 가져온다.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from services.query_cache import SearchResultCache
+
+ROWS = [{"rank": 2, "item_name": "삼성전자", "short_code": "005930", "isin_code": "KR7005930003",
+         "corporate_name": "삼성전자"}]
+
+
+@pytest.fixture
+def cache():
+    cache = SearchResultCache()
+    cache.invalidate()
+    yield cache
+    cache.invalidate()
+
+
+def test_waiter_loads_again_when_leader_is_cancelled(cache):
+    async def scenario():
+        started = asyncio.Event()
+        calls = []
+
+        async def slow_loader():
+            calls.append("leader")
+            started.set()
+            await asyncio.sleep(10)
+
+        async def loader():
+            calls.append("waiter")
+            return ROWS
+
+        leader = asyncio.ensure_future(cache.get_or_load("삼성", slow_loader))
+        await started.wait()
+        waiter = asyncio.ensure_future(cache.get_or_load("삼성", loader))
+        await asyncio.sleep(0)
+        leader.cancel()
+        rows = await asyncio.wait_for(waiter, 1)
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return rows, calls
+
+    rows, calls = asyncio.run(scenario())
+    assert rows == ROWS
+    assert calls == ["leader", "waiter"]
+    assert cache.lookup("삼성") == ROWS
+
+
+def test_waiters_share_the_leader_exception(cache):
+    async def scenario():
+        started = asyncio.Event()
+
+        async def failing_loader():
+            started.set()
+            await asyncio.sleep(0.01)
+            raise RuntimeError("db down")
+
+        leader = asyncio.ensure_future(cache.get_or_load("sk", failing_loader))
+        await started.wait()
+        waiter = asyncio.ensure_future(cache.get_or_load("sk", failing_loader))
+        return await asyncio.gather(leader, waiter, return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, RuntimeError) for result in results)
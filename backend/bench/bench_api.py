@@ -0,0 +1,230 @@
+"""
+Latency and throughput benchmark of the stock API.
+
+By default the FastAPI app runs in-process (httpx ASGI transport) on top of
+FakeStockInfoDAO seeded with synthetic market-sized data, so no Postgres or
+network is needed:
+
+    python bench_api.py --concurrency 1,16,64 --requests 2000
+    python bench_api.py --dao postgres            # the DAO configured by POSTGRES_* / STOCK_DAO_MODE
+    python bench_api.py --url http://127.0.0.1:8000   # a running server
+    python bench_api.py --baseline results/baseline-api.json
+
+In-process numbers include the client, which shares the event loop with the
+app; compare runs made the same way.
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.join(BENCH_DIR, "..", "app")
+
+from results import compare_results, load_result, make_result, save_result, summarize_latencies  # noqa: E402
+from synthetic import DEFAULT_STOCK_COUNT, make_stock_info_rows  # noqa: E402
+
+SCENARIOS = ["list_page", "list_full", "search_keystrokes", "search_fuzzy", "lookup"]
+# (method, path, query params, JSON body)
+RequestSpec = Tuple[str, str, Dict, object]
+
+
+def make_typo(rng: random.Random, name: str) -> str:
+    index = rng.randrange(len(name))
+    if rng.random() < 0.5:
+        return name[:index] + name[index + 1:]
+    return name[:index] + rng.choice(name) + name[index:]
+
+
+def build_workloads(rows: List[Dict], encode_cursor: Callable, seed: int = 1) -> Dict[str, List[RequestSpec]]:
+    """
+    Build the request mix of every scenario from the stock rows.
+
+    Args:
+        rows (List[Dict]): The stock_info rows the server holds.
+        encode_cursor (Callable): services.cursor.encode_cursor.
+        seed (int, optional): The random seed.
+
+    Returns:
+        Dict[str, List[RequestSpec]]: The requests of each scenario, in order.
+    """
+    rng = random.Random(seed)
+    by_code = sorted(rows, key=lambda row: row["short_code"])
+    names = [row["item_name"] for row in rows]
+
+    list_page = [
+        ("GET", "/stocks", {"limit": 50, "cursor": encode_cursor([row["short_code"]])}, None)
+        for row in rng.sample(by_code, min(500, len(by_code)))
+    ]
+    list_full = [("GET", "/stocks", {"limit": 1000}, None)] + [
+        ("GET", "/stocks", {"limit": 1000, "cursor": encode_cursor([by_code[i - 1]["short_code"]])}, None)
+        for i in range(1000, len(by_code), 1000)
+    ]
+    # 한 글자씩 입력하면서 매번 검색하는 자동완성 트래픽
+    search_keystrokes = []
+    for name in rng.sample(names, min(300, len(names))):
+        for end in range(1, len(name) + 1):
+            search_keystrokes.append(("GET", "/stocks", {"query": name[:end], "limit": 20}, None))
+    search_fuzzy = [
+        ("GET", "/stocks", {"query": make_typo(rng, name), "mode": "fuzzy", "max_distance": 2, "limit": 20}, None)
+        for name in rng.sample(names, min(500, len(names))) if len(name) > 1
+    ]
+    lookup = [
+        ("POST", "/stocks/lookup", {}, {"short_codes": [row["short_code"] for row in rng.sample(rows, min(200, len(rows)))]})
+        for _ in range(50)
+    ]
+    return {
+        "list_page": list_page,
+        "list_full": list_full,
+        "search_keystrokes": search_keystrokes,
+        "search_fuzzy": search_fuzzy,
+        "lookup": lookup,
+    }
+
+
+async def run_scenario(client, specs: List[RequestSpec], total: int, concurrency: int, warmup: int) -> Dict:
+    """
+    Send total requests, cycling through specs, from concurrency workers.
+
+    Returns:
+        Dict: The latency summary (see results.summarize_latencies).
+    """
+    async def send(spec):
+        method, path, params, body = spec
+        return await client.request(method, path, params=params, json=body)
+
+    for i in range(min(warmup, total)):
+        await send(specs[i % len(specs)])
+
+    latencies: List[float] = []
+    errors = 0
+    next_index = 0
+
+    async def worker():
+        nonlocal next_index, errors
+        while next_index < total:
+            spec = specs[next_index % len(specs)]
+            next_index += 1
+            started = time.perf_counter()
+            try:
+                response = await send(spec)
+                failed = response.status_code >= 400
+            except Exception:
+                failed = True
+            latencies.append((time.perf_counter() - started) * 1000)
+            errors += failed
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize_latencies(latencies, time.perf_counter() - started, errors, concurrency)
+
+
+async def run(args) -> Dict:
+    import httpx
+
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=30)
+        from services.cursor import encode_cursor
+        response = await client.get("/stocks", params={"limit": 1000})
+        rows = response.json()
+        while response.headers.get("X-Next-Cursor"):
+            response = await client.get("/stocks", params={"limit": 1000, "cursor": response.headers["X-Next-Cursor"]})
+            rows.extend(response.json())
+        fuzzy = True
+    else:
+        import main
+        from services.cursor import encode_cursor
+        from services.query_cache import SearchResultCache
+        from services.stock_info_service import StockInfoService
+
+        search_index = await main.get_search_index()
+        if args.dao == "fake":
+            from fake_dao import FakeStockInfoDAO
+            rows = make_stock_info_rows(args.stocks)
+            dao = FakeStockInfoDAO(rows, args.dao_latency_ms)
+
+            async def get_fake_dao():
+                yield dao
+
+            main.app.dependency_overrides[main.get_dao] = get_fake_dao
+            await StockInfoService(dao, search_index, SearchResultCache()).refresh_search_index()
+        else:
+            from dao.async_stock_info_dao import AsyncStockInfoDAO
+            await main.refresh_search_index()
+            rows = await AsyncStockInfoDAO().fetch_stock_info()
+        # lifespan은 실행하지 않는다 (DB 연결, LISTEN 없이 측정).
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://bench", timeout=30)
+        fuzzy = search_index is not None
+
+    workloads = build_workloads(rows, encode_cursor)
+    scenarios = {}
+    async with client:
+        for name in args.scenarios:
+            if name == "search_fuzzy" and not fuzzy:
+                print("Skipping search_fuzzy: needs the search index")
+                continue
+            for concurrency in args.concurrency:
+                summary = await run_scenario(client, workloads[name], args.requests, concurrency, args.warmup)
+                key = f"{name}@c{concurrency}"
+                scenarios[key] = summary
+                print(f"{key:<28} p50 {summary['p50_ms']:8.2f} ms  p99 {summary['p99_ms']:8.2f} ms  "
+                      f"{summary['throughput_rps']:9.1f} req/s  errors {summary['errors']}")
+    return scenarios
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark /stocks listing, search and lookup.")
+    parser.add_argument("--dao", choices=["fake", "postgres"], default="fake")
+    parser.add_argument("--dao-latency-ms", type=float, default=0.5, help="simulated DB round trip of the fake DAO")
+    parser.add_argument("--stocks", type=int, default=DEFAULT_STOCK_COUNT, help="synthetic stocks for the fake DAO")
+    parser.add_argument("--url", help="benchmark a running server instead of the in-process app")
+    parser.add_argument("--no-index", action="store_true", help="disable the in-memory search index")
+    parser.add_argument("--no-response-cache", action="store_true", help="disable the encoded response cache")
+    parser.add_argument("--fast-responses", action="store_true", help="enable STOCK_FAST_RESPONSES")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--concurrency", default="1,16,64", help="comma-separated client counts")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per scenario and concurrency")
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--output", help="result file (default: results/api-<time>.json)")
+    parser.add_argument("--baseline", help="result file to compare against")
+    parser.add_argument("--threshold", type=float, default=10.0, help="regression threshold in percent")
+    args = parser.parse_args()
+    args.scenarios = [name for name in args.scenarios.split(",") if name]
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    args.concurrency = [int(value) for value in args.concurrency.split(",")]
+
+    # main은 import할 때 환경 변수를 읽는다.
+    os.environ["STOCK_SEARCH_INDEX"] = "0" if args.no_index else "1"
+    os.environ["STOCK_FAST_RESPONSES"] = "1" if args.fast_responses else "0"
+    if args.no_response_cache:
+        os.environ["STOCK_RESPONSE_CACHE_SIZE"] = "0"
+    os.environ.setdefault("STOCK_SNAPSHOT_PATH", "")
+    sys.path.insert(0, os.path.abspath(APP_DIR))
+
+    scenarios = asyncio.run(run(args))
+    params = {
+        "dao": "remote" if args.url else args.dao,
+        "dao_latency_ms": args.dao_latency_ms if args.dao == "fake" and not args.url else None,
+        "stocks": args.stocks if args.dao == "fake" and not args.url else None,
+        "search_index": not args.no_index,
+        "response_cache": not args.no_response_cache,
+        "fast_responses": args.fast_responses,
+        "requests": args.requests,
+    }
+    result = make_result("api", params, scenarios)
+    output = args.output or os.path.join(BENCH_DIR, "results", f"api-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    save_result(result, output)
+    if args.baseline:
+        regressions = compare_results(load_result(args.baseline), result, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.threshold}%")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Ingestion throughput benchmark.
+
+Runs the loader (backend/db) against the stub API and a Postgres database.
+It writes synthetic rows, so give it a scratch database:
+
+    python bench_ingest.py --database stock_bench --create-schema
+    python bench_ingest.py --database stock_bench --stocks 3800 --iterations 5 --baseline results/baseline-ingest.json
+
+Scenarios:
+    download              probe + paginated download of both APIs
+    store_new_day         store_market_data for a day not loaded yet
+    store_unchanged       the same day again (nothing to write)
+    store_updated         a day where every tenth listing changed
+    upsert_valid_krx_items  the whole job end to end, one new day per run
+
+The connection settings come from POSTGRES_HOST/POSTGRES_USER/POSTGRES_PASSWORD.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from typing import Callable, Dict, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_DIR = os.path.join(BENCH_DIR, "..", "db")
+
+from results import compare_results, load_result, make_result, save_result  # noqa: E402
+from stub_api import StubApi, start_stub_server  # noqa: E402
+from synthetic import DEFAULT_STOCK_COUNT, trading_days  # noqa: E402
+
+SCENARIOS = ["download", "store_new_day", "store_unchanged", "store_updated", "upsert_valid_krx_items"]
+
+
+def summarize_runs(durations_ms: List[float], rows: int, timings: List[Dict]) -> Dict:
+    """
+    Summarize repeated runs of one ingestion step.
+
+    Args:
+        durations_ms (List[float]): The duration of every run.
+        rows (int): Rows handled per run (listing items plus price items).
+        timings (List[Dict]): The step timings reported by each run.
+
+    Returns:
+        Dict: Duration statistics, rows per second and mean step timings.
+    """
+    mean = statistics.mean(durations_ms)
+    summary = {
+        "iterations": len(durations_ms),
+        "rows": rows,
+        "mean_ms": round(mean, 1),
+        "p50_ms": round(statistics.median(durations_ms), 1),
+        "max_ms": round(max(durations_ms), 1),
+        "rows_per_s": round(rows / (mean / 1000), 1) if mean else 0.0,
+    }
+    for key in sorted({key for timing in timings for key in timing}):
+        values = [timing[key] for timing in timings if key in timing]
+        summary[key if key.endswith("_ms") else f"{key}_ms"] = round(statistics.mean(values), 1)
+    return summary
+
+
+def repeat(iterations: int, prepare: Callable, step: Callable) -> (List[float], List[Dict]):
+    durations, timings = [], []
+    for i in range(iterations):
+        prepare(i)
+        timing = {}
+        started = time.perf_counter()
+        step(timing)
+        durations.append((time.perf_counter() - started) * 1000)
+        timings.append(timing)
+    return durations, timings
+
+
+def first_loaded_day() -> date:
+    from db_utils import get_db_connection
+
+    conn = get_db_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT min(bas_dt) FROM stock_price")
+            return cur.fetchone()[0] or date.today()
+    finally:
+        conn.close()
+
+
+def run(args, api: StubApi) -> Dict[str, Dict]:
+    import fetch_and_store
+    from fetch_and_store import download_market_data, get_latest_bas_dts, store_market_data, upsert_valid_krx_items
+
+    if args.create_schema:
+        import create_table
+        create_table.SQL_FILE_PATH = os.path.join(DB_DIR, "sql", "schema.sql")
+        create_table.run()
+
+    # 같은 DB에서 다시 실행해도 새 날짜가 되도록 이미 적재된 가장 이른 날짜 이전을 쓴다.
+    days = iter(trading_days(first_loaded_day() - timedelta(days=1), 5 * args.iterations))
+    scenarios = {}
+    rows = 2 * len(api.rows)
+
+    def new_day(_):
+        api.bas_dt = next(days)
+
+    def check(counts):
+        if counts is None:
+            raise RuntimeError("store_market_data failed; see the output above")
+
+    downloaded = {}
+
+    def download(timing):
+        started = time.perf_counter()
+        stock_dt, krx_dt = get_latest_bas_dts()
+        timing["probe_ms"] = (time.perf_counter() - started) * 1000
+        downloaded["data"] = download_market_data(stock_dt, krx_dt)
+
+    def store(timing):
+        check(store_market_data(*downloaded["data"], timings=timing))
+
+    def download_then(prepare):
+        def wrapped(i):
+            prepare(i)
+            download({})
+        return wrapped
+
+    steps = {
+        "download": (new_day, download),
+        "store_new_day": (download_then(new_day), store),
+        "store_unchanged": (download_then(lambda _: None), store),
+        "store_updated": (download_then(lambda i: setattr(api, "krx_generation", api.krx_generation + 1)), store),
+        "upsert_valid_krx_items": (new_day, lambda timing: check(upsert_valid_krx_items())),
+    }
+    for name in args.scenarios:
+        prepare, step = steps[name]
+        durations, timings = repeat(args.iterations, prepare, step)
+        scenarios[name] = summarize_runs(durations, rows, timings)
+        summary = scenarios[name]
+        print(f"{name:<24} mean {summary['mean_ms']:9.1f} ms  p50 {summary['p50_ms']:9.1f} ms  "
+              f"{summary['rows_per_s']:10.1f} rows/s")
+    print(f"Stub API requests: {api.requests}, fetcher page size {fetch_and_store.get_fetcher().page_size}")
+    return scenarios
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark market data ingestion against a stub API.")
+    parser.add_argument("--database", required=True, help="scratch database to load into (POSTGRES_DB)")
+    parser.add_argument("--create-schema", action="store_true", help="create the tables first")
+    parser.add_argument("--stocks", type=int, default=DEFAULT_STOCK_COUNT)
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--api-latency-ms", type=float, default=20.0, help="delay of every stub API response")
+    parser.add_argument("--page-size", type=int, default=1000, help="API_PAGE_SIZE of the fetcher")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--output", help="result file (default: results/ingest-<time>.json)")
+    parser.add_argument("--baseline", help="result file to compare against")
+    parser.add_argument("--threshold", type=float, default=10.0, help="regression threshold in percent")
+    args = parser.parse_args()
+    args.scenarios = [name for name in args.scenarios.split(",") if name]
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    api = StubApi(args.stocks, latency_ms=args.api_latency_ms)
+    server = start_stub_server(api)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    # fetch_and_store와 api_fetcher는 import할 때 환경 변수를 읽는다.
+    os.environ.update({
+        "POSTGRES_DB": args.database,
+        "STOCK_API_URL": f"{base_url}/stock",
+        "KRX_API_URL": f"{base_url}/krx",
+        "API_KEY": "bench",
+        "API_CACHE_MODE": "off",
+        "API_PAGE_SIZE": str(args.page_size),
+    })
+    sys.path.insert(0, os.path.abspath(DB_DIR))
+    try:
+        scenarios = run(args, api)
+    finally:
+        server.shutdown()
+
+    params = {
+        "stocks": args.stocks,
+        "iterations": args.iterations,
+        "api_latency_ms": args.api_latency_ms,
+        "page_size": args.page_size,
+    }
+    result = make_result("ingest", params, scenarios)
+    output = args.output or os.path.join(BENCH_DIR, "results", f"ingest-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    save_result(result, output)
+    if args.baseline:
+        regressions = compare_results(load_result(args.baseline), result, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.threshold}%")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
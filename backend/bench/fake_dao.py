@@ -0,0 +1,80 @@
+"""
+In-memory stand-in for AsyncStockInfoDAO.
+
+It answers the same calls with the same row shapes and ordering as the
+Postgres DAO, optionally after a fixed delay that stands in for the
+database round trip, so API benchmarks can run without Postgres.
+"""
+import asyncio
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from dao.stock_info_queries import select_columns
+from models.stock_info import StockInfoRecord
+
+
+class FakeStockInfoDAO:
+    def __init__(self, rows: List[Dict], latency_ms: float = 0.0):
+        self.rows = sorted((dict(row) for row in rows), key=lambda row: row["short_code"])
+        self.latency = latency_ms / 1000
+        self.version = f"{len(self.rows)}-{datetime(2024, 1, 5).isoformat()}"
+        self.queries = 0
+
+    async def _round_trip(self):
+        self.queries += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    @staticmethod
+    def _project(rows: List[Dict], columns: List[str], extra: Tuple[str, ...] = ()) -> List[Dict]:
+        return [{column: row[column] for column in (*columns, *extra)} for row in rows]
+
+    async def fetch_stock_info(self, limit: Optional[int] = None, after_short_code: Optional[str] = None,
+                               columns: Optional[List[str]] = None) -> List[Dict]:
+        await self._round_trip()
+        rows = [row for row in self.rows if after_short_code is None or row["short_code"] > after_short_code]
+        return self._project(rows[:limit], select_columns(columns, required=["short_code"]))
+
+    async def fetch_stock_info_records(self, limit: Optional[int] = None,
+                                       after_short_code: Optional[str] = None) -> List[StockInfoRecord]:
+        return [StockInfoRecord.from_dict(row) for row in await self.fetch_stock_info(limit, after_short_code)]
+
+    async def search_stock_info(self, query: str, limit: Optional[int] = None, after: Optional[Tuple] = None,
+                                columns: Optional[List[str]] = None) -> List[Dict]:
+        await self._round_trip()
+        needle = query.lower()
+        matches = []
+        for row in self.rows:
+            values = [row["short_code"], row["isin_code"], row["market_category"], row["item_name"],
+                      row["corporate_number"], row["corporate_name"]]
+            if not any(needle in value.lower() for value in values):
+                continue
+            # SEARCH_QUERY와 같은 순위
+            if needle in (row["short_code"].lower(), row["isin_code"].lower()):
+                rank = 0
+            elif row["item_name"].lower().startswith(needle):
+                rank = 1
+            else:
+                rank = 2
+            matches.append(dict(row, rank=rank))
+        matches.sort(key=lambda row: (row["rank"], row["item_name"], row["short_code"]))
+        if after is not None:
+            matches = [row for row in matches if (row["rank"], row["item_name"], row["short_code"]) > tuple(after)]
+        selected = select_columns(columns, required=["item_name", "short_code"])
+        return self._project(matches[:limit], selected, ("rank",))
+
+    async def fetch_stock_info_by_keys(self, short_codes: List[str], isin_codes: List[str],
+                                       item_names: List[str]) -> List[Dict]:
+        await self._round_trip()
+        short_codes, isin_codes, item_names = set(short_codes), set(isin_codes), set(item_names)
+        return [
+            dict(row) for row in self.rows
+            if row["short_code"] in short_codes or row["isin_code"] in isin_codes or row["item_name"] in item_names
+        ]
+
+    async def fetch_data_version(self) -> str:
+        await self._round_trip()
+        return self.version
+
+    def close(self):
+        pass
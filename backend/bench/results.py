@@ -0,0 +1,155 @@
+"""
+Benchmark result files and baseline comparison.
+
+A result file is a JSON object:
+
+    {"benchmark": "api", "started_at": ..., "git_commit": ..., "python": ...,
+     "params": {...}, "scenarios": {"<name>": {"p50_ms": ..., ...}}}
+
+Compare two runs with:
+
+    python results.py baseline.json current.json --threshold 10
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# 값이 클수록 나쁜 지표와 작을수록 나쁜 지표
+LOWER_IS_BETTER = ("_ms", "_mb")
+HIGHER_IS_BETTER = ("_rps", "rows_per_s")
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """
+    Linear-interpolated percentile of already sorted values.
+
+    Args:
+        sorted_values (List[float]): The values, ascending.
+        fraction (float): The percentile as a fraction, e.g. 0.99.
+
+    Returns:
+        float: The percentile, or 0.0 for no values.
+    """
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * fraction
+    low, high = math.floor(position), math.ceil(position)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (position - low)
+
+
+def summarize_latencies(latencies_ms: List[float], wall_seconds: float, errors: int = 0,
+                        concurrency: int = 1) -> Dict:
+    """
+    Summarize the request latencies of one scenario.
+
+    Args:
+        latencies_ms (List[float]): Latency of every request, in ms.
+        wall_seconds (float): The wall-clock duration of the scenario.
+        errors (int, optional): The number of failed requests.
+        concurrency (int, optional): The number of concurrent clients.
+
+    Returns:
+        Dict: Request count, errors, latency percentiles and throughput.
+    """
+    values = sorted(latencies_ms)
+    return {
+        "requests": len(values),
+        "errors": errors,
+        "concurrency": concurrency,
+        "mean_ms": round(sum(values) / len(values), 3) if values else 0.0,
+        "p50_ms": round(percentile(values, 0.50), 3),
+        "p90_ms": round(percentile(values, 0.90), 3),
+        "p99_ms": round(percentile(values, 0.99), 3),
+        "max_ms": round(values[-1], 3) if values else 0.0,
+        "throughput_rps": round(len(values) / wall_seconds, 1) if wall_seconds > 0 else 0.0,
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def make_result(benchmark: str, params: Dict, scenarios: Dict[str, Dict]) -> Dict:
+    return {
+        "benchmark": benchmark,
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": params,
+        "scenarios": scenarios,
+    }
+
+
+def save_result(result: Dict, path: str):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(result, file, ensure_ascii=False, indent=2)
+    print(f"Results written to {path}")
+
+
+def load_result(path: str) -> Dict:
+    with open(path, "r") as file:
+        return json.load(file)
+
+
+def compare_results(baseline: Dict, current: Dict, threshold_percent: float = 10.0) -> List[str]:
+    """
+    Print every shared metric of two runs and collect the regressions.
+
+    Args:
+        baseline (Dict): The baseline result.
+        current (Dict): The result to check.
+        threshold_percent (float, optional): The change, in percent, beyond
+            which a worse value counts as a regression.
+
+    Returns:
+        List[str]: One line per regression; empty if there is none.
+    """
+    regressions = []
+    print(f"{'scenario':<24} {'metric':<16} {'baseline':>12} {'current':>12} {'change':>9}")
+    for name, metrics in current.get("scenarios", {}).items():
+        base_metrics = baseline.get("scenarios", {}).get(name)
+        if base_metrics is None:
+            print(f"{name:<24} (not in baseline)")
+            continue
+        for metric, value in metrics.items():
+            base_value = base_metrics.get(metric)
+            if not isinstance(value, (int, float)) or not isinstance(base_value, (int, float)) or not base_value:
+                continue
+            change = (value - base_value) / base_value * 100
+            worse = (metric.endswith(LOWER_IS_BETTER) and change > threshold_percent) or \
+                (metric.endswith(HIGHER_IS_BETTER) and change < -threshold_percent)
+            marker = "  <- regression" if worse else ""
+            print(f"{name:<24} {metric:<16} {base_value:>12.3f} {value:>12.3f} {change:>8.1f}%{marker}")
+            if worse:
+                regressions.append(f"{name}.{metric}: {base_value} -> {value} ({change:+.1f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare a benchmark result with a baseline.")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=10.0, help="regression threshold in percent")
+    args = parser.parse_args()
+    regressions = compare_results(load_result(args.baseline), load_result(args.current), args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.threshold}%")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
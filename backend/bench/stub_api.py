@@ -0,0 +1,150 @@
+"""
+Stub of the public-data stock APIs for benchmarks and local runs.
+
+Serves paginated responses shaped like the real KRX listing and stock price
+APIs, either from synthetic data or from recorded item files:
+
+    python stub_api.py --port 8765
+    python stub_api.py --krx-file krx.json --stock-file stock.json
+
+and point the ingestion at it:
+
+    STOCK_API_URL=http://127.0.0.1:8765/stock KRX_API_URL=http://127.0.0.1:8765/krx API_KEY=x
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from synthetic import DEFAULT_STOCK_COUNT, make_krx_items, make_stock_info_rows, make_stock_items
+
+DEFAULT_BAS_DT = "20240105"
+
+
+def load_items(path: str) -> List[Dict]:
+    """
+    Load recorded API items.
+
+    Args:
+        path (str): A JSON file holding either a full API response or a list of items.
+
+    Returns:
+        List[Dict]: The items.
+    """
+    with open(path, "r") as file:
+        data = json.load(file)
+    if isinstance(data, dict):
+        item = data["response"]["body"]["items"]["item"]
+        return item if isinstance(item, list) else [item]
+    return data
+
+
+class StubApi:
+    """
+    The data behind the stub server. bas_dt and krx_generation can be
+    changed while the server runs to simulate a new trading day or changed
+    listings.
+    """
+
+    def __init__(self, stock_count: int = DEFAULT_STOCK_COUNT, bas_dt: str = DEFAULT_BAS_DT,
+                 latency_ms: float = 0.0, krx_items: Optional[List[Dict]] = None,
+                 stock_items: Optional[List[Dict]] = None):
+        self.rows = make_stock_info_rows(stock_count)
+        self.bas_dt = bas_dt
+        self.latency_ms = latency_ms
+        self.krx_generation = 0
+        self.recorded = {"krx": krx_items, "stock": stock_items}
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._items: Dict = {}
+
+    def items(self, kind: str, bas_dt: str) -> List[Dict]:
+        if self.recorded[kind] is not None:
+            return self.recorded[kind]
+        key = (kind, bas_dt, self.krx_generation if kind == "krx" else 0)
+        with self._lock:
+            if key not in self._items:
+                if kind == "krx":
+                    self._items[key] = make_krx_items(self.rows, bas_dt, self.krx_generation)
+                else:
+                    self._items[key] = make_stock_items(self.rows, bas_dt)
+            return self._items[key]
+
+    def respond(self, path: str, query: Dict[str, List[str]]) -> bytes:
+        with self._lock:
+            self.requests += 1
+        kind = "krx" if "krx" in path else "stock"
+        items = self.items(kind, query.get("basDt", [self.bas_dt])[0])
+        num_of_rows = int(query.get("numOfRows", ["10"])[0])
+        page_no = int(query.get("pageNo", ["1"])[0])
+        page = items[(page_no - 1) * num_of_rows:page_no * num_of_rows]
+        return json.dumps({"response": {
+            "header": {"resultCode": "00", "resultMsg": "NORMAL SERVICE."},
+            "body": {"numOfRows": num_of_rows, "pageNo": page_no, "totalCount": len(items), "items": {"item": page}},
+        }}, ensure_ascii=False).encode("utf-8")
+
+
+def start_stub_server(api: StubApi, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """
+    Start the stub server on a background thread.
+
+    Args:
+        api (StubApi): The data to serve.
+        host (str, optional): The interface to bind.
+        port (int, optional): The port. 0 picks a free one.
+
+    Returns:
+        ThreadingHTTPServer: The running server. Its base URL is
+        http://host:server.server_address[1]; call shutdown() to stop it.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if api.latency_ms:
+                time.sleep(api.latency_ms / 1000)
+            url = urlparse(self.path)
+            body = api.respond(url.path, parse_qs(url.query))
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="stub-api", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve stub KRX/stock API responses.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--stocks", type=int, default=DEFAULT_STOCK_COUNT, help="number of synthetic stocks")
+    parser.add_argument("--bas-dt", default=DEFAULT_BAS_DT, help="latest basDt (YYYYMMDD)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="delay added to every response")
+    parser.add_argument("--krx-file", help="recorded KRX items to serve instead of synthetic data")
+    parser.add_argument("--stock-file", help="recorded stock price items to serve instead of synthetic data")
+    args = parser.parse_args()
+
+    api = StubApi(
+        args.stocks, args.bas_dt, args.latency_ms,
+        krx_items=load_items(args.krx_file) if args.krx_file else None,
+        stock_items=load_items(args.stock_file) if args.stock_file else None,
+    )
+    server = start_stub_server(api, args.host, args.port)
+    print(f"Stub API listening on http://{args.host}:{server.server_address[1]} (/krx, /stock)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Deterministic synthetic market data for the benchmarks.
+
+Names are built from common Korean and English company name parts, so the
+search and fuzzy indexes see a realistic spread of prefixes and n-grams
+rather than "종목1", "종목2", ...
+"""
+import random
+from datetime import date, timedelta
+from typing import Dict, List
+
+# 상장 종목 + ETF/ETN 규모
+DEFAULT_STOCK_COUNT = 3800
+DEFAULT_SEED = 20240728
+
+NAME_HEADS = [
+    "삼성", "현대", "엘지", "에스케이", "카카오", "네이버", "한화", "롯데", "신세계", "포스코", "두산", "씨제이",
+    "한국", "대한", "동원", "아모레", "셀트리온", "한미", "유한", "녹십자", "종근당", "코웨이", "오리온", "농심",
+    "하이트", "대상", "효성", "코오롱", "영풍", "고려", "동국", "세아", "금호", "대림", "태광", "에코프로",
+    "KB", "NH", "DB", "BNK", "JB", "HD", "GS", "LS", "SK", "KT", "KODEX", "TIGER", "KBSTAR", "ARIRANG",
+]
+NAME_BODIES = [
+    "전자", "화학", "바이오", "제약", "건설", "중공업", "금융", "지주", "홀딩스", "테크", "반도체", "에너지",
+    "디스플레이", "솔루션", "시스템", "머티리얼즈", "로직스", "증권", "보험", "생명", "화재", "철강", "해운",
+    "항공", "식품", "제지", "섬유", "물산", "상사", "통신", "엔터", "게임즈", "파마", "헬스케어", "인베스트",
+    "리츠", " 200", " 코스닥150", " 미국S&P500", " 2차전지", " 반도체TOP10",
+]
+NAME_TAILS = ["", "", "", "", "우", "2우B", "스팩1호", "인터내셔널", "글로벌", "코리아", "랩스", " 레버리지", " 인버스"]
+MARKETS = ["KOSPI", "KOSDAQ", "KONEX"]
+
+
+def make_names(count: int, seed: int = DEFAULT_SEED) -> List[str]:
+    """
+    Generate distinct company-like names.
+
+    Args:
+        count (int): The number of names.
+        seed (int, optional): The random seed.
+
+    Returns:
+        List[str]: The names, sorted.
+    """
+    rng = random.Random(seed)
+    names = set()
+    while len(names) < count:
+        name = rng.choice(NAME_HEADS) + rng.choice(NAME_BODIES) + rng.choice(NAME_TAILS)
+        if name in names:
+            # 조합이 모자라면 번호를 붙여 구분한다.
+            name = f"{name}{len(names)}"
+        names.add(name)
+    return sorted(names)
+
+
+def make_stock_info_rows(count: int = DEFAULT_STOCK_COUNT, seed: int = DEFAULT_SEED) -> List[Dict]:
+    """
+    Generate stock_info rows.
+
+    Args:
+        count (int, optional): The number of stocks.
+        seed (int, optional): The random seed.
+
+    Returns:
+        List[Dict]: Rows with the stock_info columns, ordered by short_code.
+    """
+    rng = random.Random(seed)
+    rows = []
+    for i, name in enumerate(make_names(count, seed)):
+        short_code = f"{(i * 7919) % 1000000:06d}"
+        rows.append({
+            "short_code": short_code,
+            "isin_code": f"KR7{short_code}00{i % 10}",
+            "market_category": rng.choice(MARKETS),
+            "item_name": name,
+            "corporate_number": f"{1101110000000 + i:013d}",
+            "corporate_name": f"{name.split()[0]}(주)" if rng.random() < 0.5 else f"주식회사 {name.split()[0]}",
+        })
+    return sorted(rows, key=lambda row: row["short_code"])
+
+
+def make_krx_items(rows: List[Dict], bas_dt: str, generation: int = 0) -> List[Dict]:
+    """
+    Build KRX listing API items for stock_info rows.
+
+    Args:
+        rows (List[Dict]): Rows from make_stock_info_rows().
+        bas_dt (str): The base date (YYYYMMDD).
+        generation (int, optional): Bump to change the corporate names of
+            every tenth stock, which makes the next load update those rows.
+
+    Returns:
+        List[Dict]: Items shaped like the KRX API response.
+    """
+    items = []
+    for i, row in enumerate(rows):
+        corporate_name = row["corporate_name"]
+        if generation and i % 10 == 0:
+            corporate_name = f"{corporate_name} {generation}"
+        items.append({
+            "basDt": bas_dt, "srtnCd": row["short_code"], "isinCd": row["isin_code"],
+            "mrktCtg": row["market_category"], "itmsNm": row["item_name"],
+            "crno": row["corporate_number"], "corpNm": corporate_name,
+        })
+    return items
+
+
+def make_stock_items(rows: List[Dict], bas_dt: str) -> List[Dict]:
+    """
+    Build daily stock price API items for stock_info rows.
+
+    Args:
+        rows (List[Dict]): Rows from make_stock_info_rows().
+        bas_dt (str): The base date (YYYYMMDD). Prices are a deterministic
+            function of the stock and the date.
+
+    Returns:
+        List[Dict]: Items shaped like the stock price API response.
+    """
+    items = []
+    for i, row in enumerate(rows):
+        rng = random.Random(i * 100003 + int(bas_dt))
+        close = rng.randint(1000, 500000)
+        change = rng.randint(-close // 10, close // 10)
+        listed = rng.randint(10 ** 6, 10 ** 9)
+        items.append({
+            "basDt": bas_dt, "srtnCd": row["short_code"], "isinCd": row["isin_code"],
+            "itmsNm": row["item_name"], "mrktCtg": row["market_category"],
+            "clpr": str(close), "vs": str(change), "fltRt": f"{change / max(close - change, 1) * 100:.2f}",
+            "mkp": str(close - change), "hipr": str(close + abs(change)), "lopr": str(close - abs(change)),
+            "trqu": str(rng.randint(0, 10 ** 7)), "trPrc": str(rng.randint(0, 10 ** 11)),
+            "lstgStCnt": str(listed), "mrktTotAmt": str(close * listed),
+        })
+    return items
+
+
+def trading_days(end: date, count: int) -> List[str]:
+    """
+    List weekdays ending at end, oldest first.
+
+    Args:
+        end (date): The last day.
+        count (int): The number of days.
+
+    Returns:
+        List[str]: The days as YYYYMMDD strings.
+    """
+    days = []
+    day = end
+    while len(days) < count:
+        if day.weekday() < 5:
+            days.append(day.strftime("%Y%m%d"))
+        day -= timedelta(days=1)
+    return days[::-1]
@@ -0,0 +1,240 @@
+import json
+import math
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from response_cache import get_response_cache
+
+# 재시도할 HTTP 상태 코드 (요청 과다, 서버 오류)
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class FetchError(Exception):
+    """Raised when a public-data API call fails after all retries."""
+
+
+def extract_items(body):
+    """
+    Extract the item list from a public-data API response body.
+
+    Args:
+        body (dict): The 'body' part of the API response.
+
+    Returns:
+        list: The items. A single item is wrapped in a list and an empty
+        result becomes an empty list.
+    """
+    items = body.get('items') or {}
+    item = items.get('item') if isinstance(items, dict) else None
+    if not item:
+        return []
+    if isinstance(item, dict):
+        return [item]
+    return item
+
+
+class ApiFetcher:
+    """
+    HTTP client for the public-data stock APIs.
+
+    Reuses pooled connections through one requests.Session, applies a
+    timeout to every call, retries transient failures with exponential
+    backoff and full jitter, and fetches the pages of a paginated result
+    in parallel once the first page has reported totalCount. With a
+    ResponseCache, date-pinned requests are answered from disk, and in
+    replay mode no network request is made at all.
+    """
+
+    def __init__(self, max_workers=8, timeout=30.0, max_retries=4, backoff_base=0.5, backoff_max=8.0,
+                 page_size=1000, cache=None):
+        self.cache = cache
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.page_size = page_size
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='api-fetcher')
+
+        self._stats_lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Clear the request statistics, e.g. at the start of an ingestion run."""
+        with self._stats_lock:
+            self._page_times = []
+            self._retries = 0
+            self._cache_hits = 0
+
+    def stats(self):
+        """
+        Get the request statistics since the last reset_stats().
+
+        Returns:
+            dict: The number of HTTP requests, retries and cache hits, and the
+            total, median, 95th percentile and maximum HTTP request latency in ms.
+        """
+        with self._stats_lock:
+            times = sorted(self._page_times)
+            retries, cache_hits = self._retries, self._cache_hits
+        stats = {'api_requests': len(times), 'api_retries': retries, 'api_cache_hits': cache_hits}
+        if times:
+            stats.update(
+                api_page_ms_sum=round(sum(times), 1),
+                api_page_ms_p50=round(times[len(times) // 2], 1),
+                api_page_ms_p95=round(times[min(len(times) - 1, int(len(times) * 0.95))], 1),
+                api_page_ms_max=round(times[-1], 1),
+            )
+        return stats
+
+    def _backoff(self, attempt, retry_after=None):
+        if retry_after is not None:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def request_page(self, api_url, params):
+        """
+        Request one page, retrying transient failures.
+
+        Args:
+            api_url (str): The URL of the API endpoint.
+            params (dict): The parameters to be sent in the query string.
+
+        Returns:
+            dict: The 'body' part of the API response.
+
+        Raises:
+            FetchError: If the call keeps failing or returns an error result code.
+        """
+        if self.cache is not None:
+            content = self.cache.get(api_url, params)
+            if content is not None:
+                with self._stats_lock:
+                    self._cache_hits += 1
+                return self._parse(content)
+            if self.cache.replay:
+                raise FetchError(f"No cached response for {api_url} {params.get('basDt', '')} (replay mode)")
+
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            if attempt > 0:
+                with self._stats_lock:
+                    self._retries += 1
+                time.sleep(self._backoff(attempt - 1, getattr(last_error, 'retry_after', None)))
+            started = time.perf_counter()
+            try:
+                response = self.session.get(api_url, params=params, timeout=self.timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                last_error = e
+                continue
+            finally:
+                with self._stats_lock:
+                    self._page_times.append((time.perf_counter() - started) * 1000)
+            if response.status_code in RETRYABLE_STATUS_CODES:
+                last_error = FetchError(f"HTTP {response.status_code} from {api_url}")
+                last_error.retry_after = response.headers.get('Retry-After')
+                continue
+            try:
+                response.raise_for_status()
+            except requests.exceptions.HTTPError as e:
+                raise FetchError(f"Request failed: {e}")
+            body = self._parse(response.content)
+            if self.cache is not None:
+                # 정상 응답만 저장한다.
+                self.cache.put(api_url, params, response.content)
+            return body
+        raise FetchError(f"Request to {api_url} failed after {self.max_retries + 1} attempts: {last_error}")
+
+    @staticmethod
+    def _parse(content):
+        try:
+            data = json.loads(content)
+            header = data['response']['header']
+            body = data['response']['body']
+        except (ValueError, KeyError, TypeError) as e:
+            raise FetchError(f"Unexpected response structure: {e}")
+        if header.get('resultCode') != '00':
+            raise FetchError(f"Invalid response code: {header.get('resultCode')} {header.get('resultMsg')}")
+        return body
+
+    def fetch_all(self, api_url, params):
+        """
+        Fetch every page of a result set.
+
+        The first page is requested alone to learn totalCount; the remaining
+        pages are then requested in parallel.
+
+        Args:
+            api_url (str): The URL of the API endpoint.
+            params (dict): The query parameters. numOfRows and pageNo are
+                overridden by the fetcher.
+
+        Returns:
+            list: The items of all pages, in page order.
+        """
+        first_params = dict(params, numOfRows=self.page_size, pageNo=1)
+        first_body = self.request_page(api_url, first_params)
+        items = extract_items(first_body)
+        total_count = int(first_body.get('totalCount') or 0)
+        page_count = math.ceil(total_count / self.page_size) if total_count else 1
+
+        futures = [
+            self.executor.submit(self.request_page, api_url, dict(params, numOfRows=self.page_size, pageNo=page_no))
+            for page_no in range(2, page_count + 1)
+        ]
+        for future in futures:
+            items.extend(extract_items(future.result()))
+        return items
+
+    def run_concurrently(self, *calls):
+        """
+        Run independent calls at the same time.
+
+        Each call is a (function, args...) tuple. Calls get their own threads
+        so that they can in turn use the page executor without starving it.
+
+        Returns:
+            list: The results, in the order of the calls.
+        """
+        with ThreadPoolExecutor(max_workers=len(calls), thread_name_prefix='api-call') as executor:
+            futures = [executor.submit(call[0], *call[1:]) for call in calls]
+            return [future.result() for future in futures]
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+        self.session.close()
+
+
+_fetcher = None
+
+
+def get_fetcher():
+    """
+    Get the shared fetcher configured from environment variables.
+
+    Returns:
+        ApiFetcher: The process-wide fetcher.
+    """
+    global _fetcher
+    if _fetcher is None:
+        _fetcher = ApiFetcher(
+            max_workers=int(os.getenv("API_MAX_WORKERS", "8")),
+            timeout=float(os.getenv("API_TIMEOUT", "30")),
+            max_retries=int(os.getenv("API_MAX_RETRIES", "4")),
+            page_size=int(os.getenv("API_PAGE_SIZE", "1000")),
+            cache=get_response_cache(),
+        )
+    return _fetcher
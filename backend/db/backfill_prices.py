@@ -0,0 +1,96 @@
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+from db_utils import get_db_connection, notify_data_changed
+from fetch_and_store import STOCK_API_URL, API_KEY, fetch_all_data, get_params
+from price_store import bulk_upsert_stock_prices, to_stock_price_row
+
+
+def iter_business_days(start, end):
+    """
+    Yield weekdays between start and end, inclusive.
+
+    Args:
+        start (date): The first date.
+        end (date): The last date.
+    """
+    day = start
+    while day <= end:
+        if day.weekday() < 5:
+            yield day
+        day += timedelta(days=1)
+
+
+def fetch_prices_for_date(bas_dt):
+    """
+    Fetch the full daily price list for one date.
+
+    Args:
+        bas_dt (date): The trading date.
+
+    Returns:
+        tuple: (bas_dt, items). items is None on holidays or errors.
+    """
+    params = get_params(api_key=API_KEY, base_dt=bas_dt.strftime("%Y%m%d"))
+    return bas_dt, fetch_all_data(api_url=STOCK_API_URL, params=params)
+
+
+def backfill_prices(start, end, workers=4):
+    """
+    Load daily prices for a date range into stock_price.
+
+    Dates are downloaded concurrently and each date is committed as soon
+    as it arrives, so an interrupted backfill keeps the dates it finished.
+
+    Args:
+        start (date): The first date.
+        end (date): The last date.
+        workers (int, optional): The number of dates downloaded at once. Defaults to 4.
+
+    Returns:
+        dict: The number of loaded dates, skipped dates and changed rows.
+    """
+    conn = get_db_connection()
+    cur = conn.cursor()
+    summary = {'loaded_dates': 0, 'skipped_dates': 0, 'changed_rows': 0}
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='backfill') as executor:
+            futures = [executor.submit(fetch_prices_for_date, day) for day in iter_business_days(start, end)]
+            for future in as_completed(futures):
+                bas_dt, items = future.result()
+                if not items:
+                    summary['skipped_dates'] += 1
+                    continue
+                try:
+                    changed = bulk_upsert_stock_prices(cur, [to_stock_price_row(item) for item in items])
+                    conn.commit()
+                except Exception as e:
+                    conn.rollback()
+                    print(f"Error loading prices for {bas_dt}: {e}")
+                    summary['skipped_dates'] += 1
+                    continue
+                summary['loaded_dates'] += 1
+                summary['changed_rows'] += changed
+                print(f"Loaded {len(items)} prices for {bas_dt} ({changed} changed)")
+        if summary['changed_rows']:
+            notify_data_changed(cur)
+            conn.commit()
+    finally:
+        cur.close()
+        conn.close()
+    print(f"Backfill finished: {summary}")
+    return summary
+
+
+def parse_date(value):
+    return datetime.strptime(value, "%Y%m%d").date()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill daily stock prices into stock_price.")
+    parser.add_argument("--from", dest="start", type=parse_date, required=True, help="First basDt (YYYYMMDD)")
+    parser.add_argument("--to", dest="end", type=parse_date, required=True, help="Last basDt (YYYYMMDD)")
+    parser.add_argument("--workers", type=int, default=4, help="Dates downloaded concurrently")
+    args = parser.parse_args()
+    backfill_prices(args.start, args.end, args.workers)
@@ -1,4 +1,5 @@
-from db_utils import get_db_connection, table_exists, apply_schema_changes, get_desired_schema
+from db_utils import get_db_connection, table_exists, apply_schema_changes, get_desired_schema, get_sql_statements, \
+    is_table_statement, get_desired_extensions, apply_extensions, get_desired_indexes, apply_index_changes
 import re
 
 
@@ -10,9 +11,10 @@ cur = conn.cursor()
 SQL_FILE_PATH = '/app/db/sql/schema.sql'
 
 def execute_sql_file(cursor, file_path):
-    with open(file_path, 'r') as file:
-        sql = file.read()
-        cursor.execute(sql)
+    # 확장과 색인은 run()에서 따로 적용한다 (색인은 트랜잭션 밖에서 CONCURRENTLY로).
+    for statement in get_sql_statements(file_path):
+        if is_table_statement(statement):
+            cursor.execute(statement)
 
 def get_table_names_from_schema(file_path):
     """
@@ -40,12 +42,18 @@ def run():
         table_names = get_table_names_from_schema(SQL_FILE_PATH)
         desired_schemas = get_desired_schema(SQL_FILE_PATH)
         print("desired_schemas",desired_schemas)
+        conn.autocommit = True
+        apply_extensions(cur, get_desired_extensions(SQL_FILE_PATH))
+        conn.autocommit = False
         for table_name in table_names:
             if table_exists(cur, table_name):
                 apply_schema_changes(cur, desired_schemas, table_name)
             else:
                 execute_sql_file(cur, SQL_FILE_PATH)
         conn.commit()
+        # 테이블 변경을 커밋한 뒤 색인을 만든다. 기존 테이블의 조회는 막지 않는다.
+        conn.autocommit = True
+        apply_index_changes(cur, get_desired_indexes(SQL_FILE_PATH))
     except Exception as e:
         print(f"Error: {e}")
     finally:
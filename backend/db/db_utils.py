@@ -1,15 +1,71 @@
+import csv
+import io
+import json
 import psycopg2
+import psycopg2.errors
 import os
 import re
+import time
 def get_db_connection():
     conn = psycopg2.connect(
-        host="db",  # docker-compose 서비스 이름
+        host=os.getenv("POSTGRES_HOST", "db"),  # docker-compose 서비스 이름
         database=os.getenv("POSTGRES_DB"),
         user=os.getenv("POSTGRES_USER"),
         password=os.getenv("POSTGRES_PASSWORD")
     )
     return conn
 
+def copy_rows(cursor, table_name, columns, rows):
+    """
+    Stream rows into a table with COPY FROM STDIN.
+
+    Args:
+        cursor: The database cursor.
+        table_name (str): The target table.
+        columns (list): The target columns, in row order.
+        rows (iterable): Tuples of values. None is written as NULL.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        # 빈 문자열과 NULL을 구분하기 위해 NULL은 \N으로 기록
+        writer.writerow(['\\N' if value is None else value for value in row])
+    buffer.seek(0)
+    cursor.copy_expert(
+        f"COPY {table_name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+        buffer
+    )
+
+
+# API 서버(backend/app)의 NotificationListener와 같은 채널 이름을 써야 한다.
+DATA_CHANGED_CHANNEL = "stock_data_changed"
+
+
+def notify_data_changed(cursor):
+    """
+    Tell the API workers that stock data changed.
+
+    The payload carries the stock_info data version (the same token the API
+    computes) and the latest loaded bas_dt. NOTIFY is only delivered when the
+    transaction commits, so listeners never see a rolled-back version.
+
+    Args:
+        cursor: The database cursor of the loading transaction.
+
+    Returns:
+        str: The notification payload.
+    """
+    cursor.execute("""
+    SELECT (SELECT count(*) FROM stock_info), (SELECT max(update_datetime) FROM stock_info),
+        (SELECT max(bas_dt) FROM stock_price);
+    """)
+    count, last_update, latest_bas_dt = cursor.fetchone()
+    payload = json.dumps({
+        "version": f"{count}-{last_update.isoformat() if last_update else ''}",
+        "bas_dt": latest_bas_dt.isoformat() if latest_bas_dt else None,
+    })
+    cursor.execute("SELECT pg_notify(%s, %s);", (DATA_CHANGED_CHANNEL, payload))
+    return payload
 
 
 def table_exists(cursor, table_name):
@@ -71,7 +127,7 @@ def get_desired_schema(sql_file_path):
     schemas = {}
     table_name = None
     table_start_pattern = re.compile(r'CREATE TABLE IF NOT EXISTS (\w+) \(', re.IGNORECASE)
-    table_end_pattern = re.compile(r'\);')
+    table_end_pattern = re.compile(r'\)(\s+PARTITION BY .*)?;', re.IGNORECASE)
 
     with open(sql_file_path, 'r') as file:
         lines = file.readlines()
@@ -91,7 +147,7 @@ def get_desired_schema(sql_file_path):
                     continue
                 
                 column_name, data_type = parts[0], parts[1].lower()  # Convert to lowercase for consistency
-                if column_name=="UNIQUE":
+                if column_name in ("UNIQUE", "PRIMARY"):
                     continue
                 is_nullable = 'NO' if 'NOT NULL' in line else 'YES'
                 column_default = None
@@ -103,6 +159,8 @@ def get_desired_schema(sql_file_path):
                     data_type = 'character varying'
                 if "timestamp" in data_type:
                     data_type = 'timestamp without time zone'
+                if data_type.startswith("numeric"):
+                    data_type = 'numeric'
                 schemas[table_name][column_name] = {
                     'data_type': data_type,
                     'is_nullable': is_nullable,
@@ -162,3 +220,246 @@ def apply_schema_changes(cursor, desired_schemas, table_name):
                 print(4, sql)
                 cursor.execute(sql)
 
+
+# 색인 생성 중 잠금을 오래 기다리지 않도록 한다. 기다리는 동안 뒤따르는 조회가 막히기 때문.
+SCHEMA_LOCK_TIMEOUT = os.getenv("SCHEMA_LOCK_TIMEOUT", "5s")
+INDEX_BUILD_ATTEMPTS = int(os.getenv("INDEX_BUILD_ATTEMPTS", "3"))
+MAX_IDENTIFIER_LENGTH = 63
+
+extension_pattern = re.compile(r'CREATE EXTENSION IF NOT EXISTS (\w+)', re.IGNORECASE)
+index_pattern = re.compile(
+    r'CREATE (UNIQUE )?INDEX (?:CONCURRENTLY )?(?:IF NOT EXISTS )?(\w+) ON (?:ONLY )?(\w+) (.+)',
+    re.IGNORECASE | re.DOTALL
+)
+
+
+def get_sql_statements(sql_file_path):
+    """
+    Split a SQL file into statements.
+
+    Args:
+        sql_file_path (str): The path to the SQL file.
+
+    Returns:
+        list: The statements without comments, whitespace collapsed and
+        without the trailing semicolon.
+    """
+    with open(sql_file_path, 'r') as file:
+        sql = re.sub(r'--[^\n]*', '', file.read())
+    return [' '.join(statement.split()) for statement in sql.split(';') if statement.strip()]
+
+
+def is_table_statement(statement):
+    """
+    Check whether a schema statement belongs to the table phase.
+
+    Extensions and indexes are applied separately: extensions before the
+    tables, indexes concurrently after them.
+
+    Args:
+        statement (str): A statement from get_sql_statements().
+
+    Returns:
+        bool: False for CREATE EXTENSION and CREATE INDEX statements.
+    """
+    return not (extension_pattern.match(statement) or index_pattern.match(statement))
+
+
+def get_desired_extensions(sql_file_path):
+    """
+    Parse the extensions declared in the SQL file.
+
+    Args:
+        sql_file_path (str): The path to the SQL file containing the desired schema.
+
+    Returns:
+        list: The extension names, in file order.
+    """
+    return [
+        match.group(1) for match in map(extension_pattern.match, get_sql_statements(sql_file_path)) if match
+    ]
+
+
+def get_desired_indexes(sql_file_path):
+    """
+    Parse the indexes declared in the SQL file.
+
+    Args:
+        sql_file_path (str): The path to the SQL file containing the desired schema.
+
+    Returns:
+        dict: Index name -> {'table', 'unique', 'body'}, where body is the
+        part after the table name, e.g. "USING gin (item_name gin_trgm_ops)".
+    """
+    indexes = {}
+    for statement in get_sql_statements(sql_file_path):
+        match = index_pattern.match(statement)
+        if match:
+            unique, name, table_name, body = match.groups()
+            indexes[name] = {'table': table_name, 'unique': bool(unique), 'body': body}
+    return indexes
+
+
+def get_current_indexes(cursor):
+    """
+    Get the indexes of the current schema.
+
+    Args:
+        cursor: The database cursor.
+
+    Returns:
+        dict: Index name -> {'table', 'definition', 'valid', 'partitioned'}.
+        An index left behind by a failed CREATE INDEX CONCURRENTLY, or a
+        partitioned index missing some partitions, is not valid.
+    """
+    cursor.execute("""
+    SELECT index_class.relname, table_class.relname, pg_get_indexdef(index_class.oid),
+        pg_index.indisvalid, index_class.relkind = 'I'
+    FROM pg_index
+    JOIN pg_class index_class ON index_class.oid = pg_index.indexrelid
+    JOIN pg_class table_class ON table_class.oid = pg_index.indrelid
+    WHERE index_class.relnamespace = current_schema()::regnamespace;
+    """)
+    return {
+        name: {'table': table_name, 'definition': definition, 'valid': valid, 'partitioned': partitioned}
+        for name, table_name, definition, valid, partitioned in cursor.fetchall()
+    }
+
+
+def get_partitions(cursor, table_name):
+    """
+    Get the partitions of a partitioned table.
+
+    Args:
+        cursor: The database cursor.
+        table_name (str): The partitioned table.
+
+    Returns:
+        list: The partition names, or an empty list for a plain table.
+    """
+    cursor.execute("""
+    SELECT child.relname
+    FROM pg_inherits
+    JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+    JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+    WHERE parent.relname = %s AND parent.relnamespace = current_schema()::regnamespace
+        AND parent.relkind = 'p'
+    ORDER BY child.relname;
+    """, (table_name,))
+    return [row[0] for row in cursor.fetchall()]
+
+
+def normalize_index_definition(definition):
+    # pg_get_indexdef()와 schema.sql의 표기 차이(스키마 접두어, 대소문자, 공백)를 없앤다.
+    definition = re.sub(r'\b(CONCURRENTLY|IF NOT EXISTS|ONLY)\s+', '', definition, flags=re.IGNORECASE)
+    definition = re.sub(r'\bpublic\.', '', definition)
+    definition = re.sub(r'\s*USING btree\b', '', definition, flags=re.IGNORECASE)
+    return re.sub(r'\s+', '', definition).lower()
+
+
+def apply_extensions(cursor, extensions):
+    """
+    Create the declared extensions that are missing.
+
+    Needs an autocommit connection, so that an extension that is not
+    installed on the server only skips the indexes that depend on it.
+
+    Args:
+        cursor: The database cursor.
+        extensions (list): The extension names.
+    """
+    for extension in extensions:
+        try:
+            cursor.execute(f"CREATE EXTENSION IF NOT EXISTS {extension};")
+        except psycopg2.Error as e:
+            print(f"Error creating extension {extension}: {e}")
+
+
+def _partition_index_name(index_name, table_name, partition_name):
+    suffix = index_name[len(table_name) + 1:] if index_name.startswith(table_name + '_') else index_name
+    return f"{partition_name}_{suffix}"[:MAX_IDENTIFIER_LENGTH]
+
+
+def _drop_invalid_index(cursor, index_name):
+    current = get_current_indexes(cursor).get(index_name)
+    if current is not None and not current['valid'] and not current['partitioned']:
+        print(f"Dropping invalid index {index_name}")
+        cursor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name};")
+
+
+def build_index_concurrently(cursor, index_name, table_name, unique, body):
+    """
+    Build an index without blocking reads or writes on the table.
+
+    A build that hits the lock timeout leaves an invalid index behind; it is
+    dropped and the build is retried with a backoff.
+
+    Args:
+        cursor: The database cursor of an autocommit connection.
+        index_name (str): The index to build.
+        table_name (str): The indexed table. Must not be partitioned.
+        unique (bool): Whether to build a unique index.
+        body (str): The index method and columns, e.g. "USING gin (item_name gin_trgm_ops)".
+
+    Returns:
+        bool: True if the index was built.
+    """
+    # 이전 실행이 남긴 잘못된 색인이 있으면 IF NOT EXISTS가 그대로 두므로 먼저 지운다.
+    _drop_invalid_index(cursor, index_name)
+    sql = f"CREATE {'UNIQUE ' if unique else ''}INDEX CONCURRENTLY IF NOT EXISTS {index_name} ON {table_name} {body};"
+    for attempt in range(INDEX_BUILD_ATTEMPTS):
+        try:
+            started = time.monotonic()
+            cursor.execute(sql)
+            print(f"Built index {index_name} in {time.monotonic() - started:.1f}s")
+            return True
+        except psycopg2.errors.LockNotAvailable as e:
+            print(f"Lock timeout building index {index_name} (attempt {attempt + 1}): {e}")
+            _drop_invalid_index(cursor, index_name)
+            if attempt + 1 < INDEX_BUILD_ATTEMPTS:
+                time.sleep(2 ** attempt)
+    return False
+
+
+def apply_index_changes(cursor, desired_indexes):
+    """
+    Create the declared indexes that are missing or invalid.
+
+    Indexes are matched by name. Plain tables are indexed with CREATE INDEX
+    CONCURRENTLY. A partitioned table gets an index on the parent only, then
+    each partition is indexed concurrently and attached. An existing index
+    whose definition differs from the file is reported, not rebuilt; rename
+    it in the file to replace it. Indexes that are not declared are left alone.
+
+    Needs an autocommit connection, since CREATE INDEX CONCURRENTLY cannot
+    run inside a transaction block.
+
+    Args:
+        cursor: The database cursor of an autocommit connection.
+        desired_indexes (dict): The indexes returned by get_desired_indexes().
+    """
+    cursor.execute("SELECT set_config('lock_timeout', %s, false);", (SCHEMA_LOCK_TIMEOUT,))
+    current_indexes = get_current_indexes(cursor)
+    for index_name, index in desired_indexes.items():
+        table_name, unique, body = index['table'], index['unique'], index['body']
+        current = current_indexes.get(index_name)
+        if current is not None and current['valid']:
+            desired = f"CREATE {'UNIQUE ' if unique else ''}INDEX {index_name} ON {table_name} {body}"
+            if normalize_index_definition(current['definition']) != normalize_index_definition(desired):
+                print(f"Index {index_name} differs from the schema file, keeping it: {current['definition']}")
+            continue
+        try:
+            partitions = get_partitions(cursor, table_name)
+            if not partitions:
+                build_index_concurrently(cursor, index_name, table_name, unique, body)
+                continue
+            # 부모에는 카탈로그에만 색인을 만들고, 파티션별로 동시 생성 후 붙인다.
+            cursor.execute(
+                f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS {index_name} ON ONLY {table_name} {body};"
+            )
+            for partition in partitions:
+                partition_index = _partition_index_name(index_name, table_name, partition)
+                if build_index_concurrently(cursor, partition_index, partition, unique, body):
+                    cursor.execute(f"ALTER INDEX {index_name} ATTACH PARTITION {partition_index};")
+        except psycopg2.Error as e:
+            print(f"Error creating index {index_name}: {e}")
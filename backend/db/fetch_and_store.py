@@ -1,14 +1,12 @@
-import requests
 import psycopg2
 from psycopg2 import sql
 from datetime import datetime, timedelta
 import os
+import time
 
-from db_utils import get_db_connection
-
-# 데이터베이스 연결 설정
-conn = get_db_connection()
-cur = conn.cursor()
+from db_utils import get_db_connection, copy_rows, notify_data_changed
+from api_fetcher import FetchError, extract_items, get_fetcher
+from price_store import bulk_upsert_stock_prices, to_stock_price_row
 
 # API URLs and keys
 STOCK_API_URL=os.getenv("STOCK_API_URL")
@@ -24,31 +22,39 @@ def fetch_data(api_url, params):
     - params (dict): The parameters to be sent in the query string.
     
     Returns:
-    - dict: The JSON response from the API if successful and valid.
-    - None: If an exception occurs or the response is invalid.
+    - list: The items of the requested page if successful and non-empty.
+    - None: If the request fails or no items are returned.
     """
     try:
-        response = requests.get(api_url, params=params)
-        response.raise_for_status()  # Raise an HTTPError for bad responses (4xx and 5xx)
-
-        data = response.json()
+        items = extract_items(get_fetcher().request_page(api_url, params))
+    except FetchError as e:
+        print(f"Request failed: {e}")
+        return None
+    if not items:
+        print("No items found in the response.")
+        return None
+    return items
 
-        # Check for valid response code and non-empty items
-        if data['response']['header']['resultCode'] != '00':
-            print(f"Invalid response code: {data['response']['header']['resultCode']}")
-            return None
-        if not data['response']['body']['items']['item']:
-            print("No items found in the response.")
-            return None
+def fetch_all_data(api_url, params):
+    """
+    Fetch every page for the given parameters, requesting pages in parallel.
 
-        return data['response']['body']['items']['item']
+    Args:
+        api_url (str): The URL of the API endpoint.
+        params (dict): The parameters to be sent in the query string.
 
-    except requests.exceptions.RequestException as e:
+    Returns:
+        list: All items, or None if the request fails or nothing is returned.
+    """
+    try:
+        items = get_fetcher().fetch_all(api_url, params)
+    except FetchError as e:
         print(f"Request failed: {e}")
         return None
-    except KeyError as e:
-        print(f"Unexpected response structure: {e}")
+    if not items:
+        print("No items found in the response.")
         return None
+    return items
 
 def get_params(api_key, base_dt=None, num_of_rows=4000, page_no=1):
     """
@@ -73,136 +79,243 @@ def get_params(api_key, base_dt=None, num_of_rows=4000, page_no=1):
         param['basDt'] = base_dt
     return param
 
-def get_valid_krx_data():
+def get_latest_bas_dts():
     """
-    Fetch valid KRX data by comparing with stock data.
-    
+    Probe the latest basDt of the STOCK and KRX APIs with one-row requests.
+
     Returns:
-        list: A list of valid KRX items.
-    
+        tuple: (stock_base_dt, krx_base_dt) as YYYYMMDD strings.
+
     Raises:
         Exception: If the API request fails or no data is received.
     """
     base_dt_params = get_params(api_key=API_KEY, num_of_rows=1)
-    stock_dt_data = fetch_data(api_url=STOCK_API_URL, params=base_dt_params)
-    krx_dt_data = fetch_data(api_url=KRX_API_URL, params=base_dt_params)
+    stock_dt_data, krx_dt_data = get_fetcher().run_concurrently(
+        (fetch_data, STOCK_API_URL, base_dt_params),
+        (fetch_data, KRX_API_URL, base_dt_params)
+    )
     
     if not stock_dt_data or not krx_dt_data:
         raise Exception("API error: No data received")
 
-    stock_base_dt = stock_dt_data[0]['basDt']
-    krx_base_dt = krx_dt_data[0]['basDt']
-    
+    return stock_dt_data[0]['basDt'], krx_dt_data[0]['basDt']
+
+def download_market_data(stock_base_dt, krx_base_dt):
+    """
+    Download the full daily stock data and KRX listing for the given dates.
+
+    Args:
+        stock_base_dt (str): The STOCK API basDt (YYYYMMDD).
+        krx_base_dt (str): The KRX API basDt (YYYYMMDD).
+
+    Returns:
+        tuple: (stock_data, valid_krx_items). See get_latest_market_data.
+
+    Raises:
+        Exception: If the API request fails or no data is received.
+    """
     stock_params = get_params(api_key=API_KEY, base_dt=stock_base_dt)
     krx_params = get_params(api_key=API_KEY, base_dt=krx_base_dt)
 
-    stock_data = fetch_data(api_url=STOCK_API_URL, params=stock_params)
-    krx_data = fetch_data(api_url=KRX_API_URL, params=krx_params)
+    stock_data, krx_data = get_fetcher().run_concurrently(
+        (fetch_all_data, STOCK_API_URL, stock_params),
+        (fetch_all_data, KRX_API_URL, krx_params)
+    )
 
     if not stock_data or not krx_data:
         raise Exception("API error: No data received for stock or krx data")
 
     stock_items = {item['itmsNm'] for item in stock_data}
     valid_krx_items = [item for item in krx_data if item['itmsNm'] in stock_items]
-    return valid_krx_items
+    return stock_data, valid_krx_items
+
+def get_latest_market_data():
+    """
+    Fetch the latest daily stock data and the KRX items listed in it.
 
-def get_existing_items(cursor):
+    The STOCK and KRX APIs are queried at the same time, both for the
+    latest basDt probe and for the full, paginated result sets.
+
+    Returns:
+        tuple: (stock_data, valid_krx_items). stock_data holds the daily
+        price items (see StockItem) and valid_krx_items the KRX listing
+        items that also appear in stock_data.
+
+    Raises:
+        Exception: If the API request fails or no data is received.
     """
-    Fetch existing items from the database.
+    return download_market_data(*get_latest_bas_dts())
+
+def get_valid_krx_data():
+    """
+    Fetch valid KRX data by comparing with stock data.
+    
+    Returns:
+        list: A list of valid KRX items.
+    
+    Raises:
+        Exception: If the API request fails or no data is received.
+    """
+    return get_latest_market_data()[1]
+
+STOCK_INFO_COLUMNS = ["short_code", "isin_code", "market_category", "item_name", "corporate_number", "corporate_name"]
+
+def to_stock_info_row(item):
+    """
+    Map a KRX API item to a stock_info row.
 
     Args:
-        cursor: The database cursor.
+        item (dict): An item from the KRX listing API.
 
     Returns:
-        dict: A dictionary with item_name as keys and other attributes as values.
+        tuple: The values in STOCK_INFO_COLUMNS order.
     """
-    query = "SELECT item_name, short_code, isin_code, market_category, corporate_number, corporate_name FROM stock_info"
-    cursor.execute(query)
-    rows = cursor.fetchall()
-    existing_items = {row[0]: {
-        'short_code': row[1],
-        'isin_code': row[2],
-        'market_category': row[3],
-        'corporate_number': row[4],
-        'corporate_name': row[5]
-    } for row in rows}
-    return existing_items
+    return (
+        item['srtnCd'],
+        item['isinCd'],
+        item['mrktCtg'],
+        item['itmsNm'],
+        item['crno'],
+        item['corpNm']
+    )
 
-def upsert_stock_info(cursor, item, existing_item=None):
+def copy_to_staging(cursor, rows):
     """
-    Upsert stock information into the stock_info table.
+    Stream rows into a temporary staging table with COPY.
 
     Args:
         cursor: The database cursor.
-        item (dict): A dictionary containing the stock information.
-        existing_item (dict): A dictionary containing the existing stock information, if any.
-    """
-    if existing_item:
-        # Update if any attribute is different
-        if (item['short_code'] != existing_item['short_code'] or
-            item['isin_code'] != existing_item['isin_code'] or
-            item['market_category'] != existing_item['market_category'] or
-            item['corporate_number'] != existing_item['corporate_number'] or
-            item['corporate_name'] != existing_item['corporate_name']):
-            query = """
-            UPDATE stock_info SET
-                short_code = %s,
-                isin_code = %s,
-                market_category = %s,
-                corporate_number = %s,
-                corporate_name = %s,
-                update_datetime = CURRENT_TIMESTAMP
-            WHERE item_name = %s;
-            """
-            cursor.execute(query, (
-                item['short_code'],
-                item['isin_code'],
-                item['market_category'],
-                item['corporate_number'],
-                item['corporate_name'],
-                item['item_name']
-            ))
-    else:
-        # Insert if the item does not exist
-        query = """
+        rows (list): stock_info rows in STOCK_INFO_COLUMNS order.
+    """
+    cursor.execute("""
+    CREATE TEMP TABLE stock_info_staging (
+        short_code TEXT,
+        isin_code TEXT,
+        market_category TEXT,
+        item_name TEXT,
+        corporate_number TEXT,
+        corporate_name TEXT
+    ) ON COMMIT DROP;
+    """)
+    copy_rows(cursor, 'stock_info_staging', STOCK_INFO_COLUMNS, rows)
+
+def merge_staging(cursor):
+    """
+    Apply the staged rows to stock_info in one set-based upsert.
+
+    Rows are matched on item_name; existing rows are only rewritten when a
+    column actually changed.
+
+    Args:
+        cursor: The database cursor.
+
+    Returns:
+        tuple: The number of inserted and updated rows.
+    """
+    cursor.execute("""
+    WITH upserted AS (
         INSERT INTO stock_info (short_code, isin_code, market_category, item_name, corporate_number, corporate_name)
-        VALUES (%s, %s, %s, %s, %s, %s);
-        """
-        cursor.execute(query, (
-            item['short_code'],
-            item['isin_code'],
-            item['market_category'],
-            item['item_name'],
-            item['corporate_number'],
-            item['corporate_name']
-        ))
+        SELECT DISTINCT ON (item_name) short_code, isin_code, market_category, item_name, corporate_number, corporate_name
+        FROM stock_info_staging
+        ORDER BY item_name
+        ON CONFLICT (item_name) DO UPDATE SET
+            short_code = EXCLUDED.short_code,
+            isin_code = EXCLUDED.isin_code,
+            market_category = EXCLUDED.market_category,
+            corporate_number = EXCLUDED.corporate_number,
+            corporate_name = EXCLUDED.corporate_name,
+            update_datetime = CURRENT_TIMESTAMP
+        WHERE (stock_info.short_code, stock_info.isin_code, stock_info.market_category,
+               stock_info.corporate_number, stock_info.corporate_name)
+            IS DISTINCT FROM (EXCLUDED.short_code, EXCLUDED.isin_code, EXCLUDED.market_category,
+               EXCLUDED.corporate_number, EXCLUDED.corporate_name)
+        RETURNING (xmax = 0) AS inserted
+    )
+    SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted) FROM upserted;
+    """)
+    return cursor.fetchone()
 
-def upsert_valid_krx_items():
+def bulk_upsert_stock_info(cursor, rows, timings=None):
+    """
+    Upsert stock_info rows through a COPY-loaded staging table.
+
+    Args:
+        cursor: The database cursor.
+        rows (list): stock_info rows in STOCK_INFO_COLUMNS order.
+        timings (dict, optional): Filled with the COPY and merge durations in ms.
+
+    Returns:
+        dict: The number of inserted, updated and unchanged rows.
     """
-    Upsert valid KRX items into the stock_info table.
+    # 같은 종목명이 여러 번 오면 마지막 값만 사용 (ON CONFLICT는 한 행을 두 번 갱신할 수 없음)
+    timings = timings if timings is not None else {}
+    unique_rows = list({row[3]: row for row in rows}.values())
+    started = time.perf_counter()
+    copy_to_staging(cursor, unique_rows)
+    timings['stock_info_copy_ms'] = round((time.perf_counter() - started) * 1000, 1)
+    # 변경 비교(IS DISTINCT FROM)와 upsert가 한 문장에서 같이 처리된다.
+    started = time.perf_counter()
+    inserted, updated = merge_staging(cursor)
+    timings['stock_info_merge_ms'] = round((time.perf_counter() - started) * 1000, 1)
+    return {
+        'inserted': inserted,
+        'updated': updated,
+        'unchanged': len(unique_rows) - inserted - updated
+    }
+
+def store_market_data(stock_data, valid_krx_items, timings=None):
     """
+    Upsert KRX items into stock_info and the day's prices into stock_price,
+    in one transaction. If anything changed, API workers are notified when
+    the transaction commits.
+
+    Args:
+        stock_data (list): Daily price items from the STOCK API.
+        valid_krx_items (list): KRX listing items that appear in stock_data.
+        timings (dict, optional): Filled with the duration of each step in ms.
+
+    Returns:
+        dict: The number of inserted, updated and unchanged stock_info rows
+        and of changed stock_price rows, or None on failure.
+    """
+    timings = timings if timings is not None else {}
     conn = get_db_connection()
     cur = conn.cursor()
-    valid_krx_items = get_valid_krx_data()
-    existing_items = get_existing_items(cur)
 
     try:
-        for item in valid_krx_items:
-            existing_item = existing_items.get(item['itmsNm'])
-            upsert_stock_info(cur, {
-                'short_code': item['srtnCd'],
-                'isin_code': item['isinCd'],
-                'market_category': item['mrktCtg'],
-                'item_name': item['itmsNm'],
-                'corporate_number': item['crno'],
-                'corporate_name': item['corpNm']
-            }, existing_item)
+        started = time.perf_counter()
+        stock_info_rows = [to_stock_info_row(item) for item in valid_krx_items]
+        stock_price_rows = [to_stock_price_row(item) for item in stock_data]
+        timings['parse_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        started = time.perf_counter()
+        counts = bulk_upsert_stock_info(cur, stock_info_rows, timings)
+        timings['stock_info_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        started = time.perf_counter()
+        counts['prices'] = bulk_upsert_stock_prices(cur, stock_price_rows, timings)
+        timings['stock_price_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        if counts['inserted'] or counts['updated'] or counts['prices']:
+            # 커밋될 때 API 워커들에게 전달되어 캐시를 다시 만든다.
+            notify_data_changed(cur)
+        started = time.perf_counter()
         conn.commit()
+        timings['commit_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        print(f"Upserted stock_info: {counts}")
+        return counts
     except Exception as e:
         conn.rollback()
         print(f"Error during upsert: {e}")
+        return None
     finally:
         cur.close()
         conn.close()
 
+def upsert_valid_krx_items():
+    """
+    Download the latest market data and store it (see store_market_data).
 
+    Returns:
+        dict: The number of inserted, updated and unchanged stock_info rows
+        and of changed stock_price rows, or None on failure.
+    """
+    stock_data, valid_krx_items = get_latest_market_data()
+    return store_market_data(stock_data, valid_krx_items)
@@ -1,7 +1,8 @@
-import create_table, fetch_and_store
+import create_table, scheduler
 
 try:
     create_table.run()
-    fetch_and_store.upsert_valid_krx_items()
+    # 이미 최신 basDt가 적재되어 있으면 다운로드하지 않는다.
+    scheduler.run_once()
 except Exception as e:
     print(f"Error: {e}")
@@ -0,0 +1,152 @@
+import time
+from datetime import date, datetime
+
+from db_utils import copy_rows
+
+STOCK_PRICE_COLUMNS = [
+    "bas_dt", "short_code", "isin_code", "item_name", "market_category",
+    "clpr", "vs", "flt_rt", "mkp", "hipr", "lopr", "trqu", "tr_prc", "lstg_st_cnt", "mrkt_tot_amt"
+]
+
+
+def parse_bas_dt(value):
+    """
+    Parse a basDt value (YYYYMMDD) into a date.
+
+    Args:
+        value (str): The basDt string from the API.
+
+    Returns:
+        date: The parsed date.
+    """
+    return datetime.strptime(value, "%Y%m%d").date()
+
+
+def to_int(value):
+    """
+    Convert an API number string to int, treating blanks as NULL.
+
+    Args:
+        value (str): A number such as "72000" or "1,234".
+
+    Returns:
+        int: The number, or None if the value is blank.
+    """
+    if value is None:
+        return None
+    value = str(value).replace(',', '').strip()
+    if not value:
+        return None
+    return int(float(value))
+
+
+def to_decimal_text(value):
+    """
+    Validate an API decimal string, treating blanks as NULL.
+
+    Args:
+        value (str): A decimal such as "-1.23".
+
+    Returns:
+        str: The normalized decimal text, or None if the value is blank.
+    """
+    if value is None:
+        return None
+    value = str(value).replace(',', '').strip()
+    if not value:
+        return None
+    float(value)
+    return value
+
+
+def to_stock_price_row(item):
+    """
+    Map a STOCK API item to a stock_price row.
+
+    Args:
+        item (dict): An item shaped like models.stock_info.StockItem.
+
+    Returns:
+        tuple: The values in STOCK_PRICE_COLUMNS order.
+    """
+    return (
+        parse_bas_dt(item['basDt']).isoformat(),
+        item['srtnCd'],
+        item['isinCd'],
+        item['itmsNm'],
+        item['mrktCtg'],
+        to_int(item.get('clpr')),
+        to_int(item.get('vs')),
+        to_decimal_text(item.get('fltRt')),
+        to_int(item.get('mkp')),
+        to_int(item.get('hipr')),
+        to_int(item.get('lopr')),
+        to_int(item.get('trqu')),
+        to_int(item.get('trPrc')),
+        to_int(item.get('lstgStCnt')),
+        to_int(item.get('mrktTotAmt'))
+    )
+
+
+def ensure_price_partitions(cursor, bas_dts):
+    """
+    Create the yearly stock_price partitions that the given dates fall into.
+
+    Partitions are created before loading so rows never land in the
+    default partition, which would block creating the partition later.
+
+    Args:
+        cursor: The database cursor.
+        bas_dts (iterable): Dates (date or ISO string) about to be loaded.
+    """
+    years = set()
+    for bas_dt in bas_dts:
+        if not isinstance(bas_dt, date):
+            bas_dt = date.fromisoformat(bas_dt)
+        years.add(bas_dt.year)
+    for year in sorted(years):
+        cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS stock_price_{year} PARTITION OF stock_price
+        FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01');
+        """)
+
+
+def bulk_upsert_stock_prices(cursor, rows, timings=None):
+    """
+    Upsert daily price rows through a COPY-loaded staging table.
+
+    Args:
+        cursor: The database cursor.
+        rows (list): stock_price rows in STOCK_PRICE_COLUMNS order.
+        timings (dict, optional): Filled with the COPY and merge durations in ms.
+
+    Returns:
+        int: The number of rows inserted or changed.
+    """
+    # (short_code, bas_dt) 기준으로 중복 제거
+    unique_rows = list({(row[1], row[0]): row for row in rows}.values())
+    if not unique_rows:
+        return 0
+    timings = timings if timings is not None else {}
+    started = time.perf_counter()
+    ensure_price_partitions(cursor, {row[0] for row in unique_rows})
+    cursor.execute("""
+    CREATE TEMP TABLE IF NOT EXISTS stock_price_staging
+    (LIKE stock_price INCLUDING DEFAULTS) ON COMMIT DELETE ROWS;
+    """)
+    copy_rows(cursor, 'stock_price_staging', STOCK_PRICE_COLUMNS, unique_rows)
+    timings['stock_price_copy_ms'] = round((time.perf_counter() - started) * 1000, 1)
+    started = time.perf_counter()
+    update_columns = [column for column in STOCK_PRICE_COLUMNS if column not in ('bas_dt', 'short_code')]
+    cursor.execute(f"""
+    INSERT INTO stock_price ({', '.join(STOCK_PRICE_COLUMNS)})
+    SELECT {', '.join(STOCK_PRICE_COLUMNS)} FROM stock_price_staging
+    ON CONFLICT (short_code, bas_dt) DO UPDATE SET
+        {', '.join(f'{column} = EXCLUDED.{column}' for column in update_columns)}
+    WHERE ({', '.join(f'stock_price.{column}' for column in update_columns)})
+        IS DISTINCT FROM ({', '.join(f'EXCLUDED.{column}' for column in update_columns)});
+    """)
+    changed = cursor.rowcount
+    cursor.execute("TRUNCATE stock_price_staging;")
+    timings['stock_price_merge_ms'] = round((time.perf_counter() - started) * 1000, 1)
+    return changed
@@ -0,0 +1,50 @@
+import argparse
+import os
+import sys
+from datetime import datetime
+
+# 프로파일러는 표준 라이브러리만 쓰는 API 쪽 모듈이라 그대로 가져다 쓴다.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from monitoring.profiler import DEFAULT_MAX_OVERHEAD, SamplingProfiler, format_report, save_profile  # noqa: E402
+
+from fetch_and_store import upsert_valid_krx_items  # noqa: E402
+
+PROFILE_DIR = os.getenv("PROFILE_DIR", "/app/data/profiles")
+
+
+def profile_ingest(interval_ms, output_dir, top, include_idle):
+    """
+    Run one download-and-store pass (as scheduler.py --force does, without
+    recording an ingestion_run) under the sampling profiler, save the profile
+    and print where the time went.
+
+    Args:
+        interval_ms (float): Milliseconds between samples.
+        output_dir (str): Where the .collapsed and .json files are written.
+        top (int): How many functions the summary lists.
+        include_idle (bool): Also count threads parked waiting for work.
+
+    Returns:
+        dict: The result of upsert_valid_krx_items.
+    """
+    name = f"ingest-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+    profiler = SamplingProfiler(interval=interval_ms / 1000, max_overhead=DEFAULT_MAX_OVERHEAD,
+                                include_idle=include_idle)
+    with profiler:
+        result = upsert_valid_krx_items()
+    collapsed_path, summary_path = save_profile(profiler, output_dir, name, top)
+    print(f"Result: {result}")
+    print(format_report(profiler.report(top)))
+    print(f"\nSaved {collapsed_path} and {summary_path}")
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Profile one ingestion pass with the sampling profiler.")
+    parser.add_argument("--interval-ms", type=float, default=5, help="Milliseconds between samples")
+    parser.add_argument("--output-dir", default=PROFILE_DIR, help="Directory for the profile files")
+    parser.add_argument("--top", type=int, default=25, help="Functions listed in the summary")
+    parser.add_argument("--include-idle", action="store_true", help="Also count idle threads")
+    args = parser.parse_args()
+    profile_ingest(args.interval_ms, args.output_dir, args.top, args.include_idle)
@@ -0,0 +1,192 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+
+# 캐시 키에서 제외하는 파라미터 (인증키는 응답 내용과 무관하고 디스크에 남기면 안 된다)
+EXCLUDED_PARAMS = {'serviceKey'}
+
+MODE_OFF = 'off'
+# basDt를 지정한 요청은 캐시에서 읽고, 모든 성공 응답을 기록
+MODE_ON = 'on'
+# 네트워크 없이 캐시만 사용 (캐시에 없으면 실패)
+MODE_REPLAY = 'replay'
+MODES = (MODE_OFF, MODE_ON, MODE_REPLAY)
+
+
+def cache_key(api_url, params):
+    """
+    Build the cache key of a request.
+
+    Args:
+        api_url (str): The URL of the API endpoint.
+        params (dict): The query parameters.
+
+    Returns:
+        str: A SHA-256 hex digest of the endpoint and the parameters,
+        without serviceKey.
+    """
+    canonical = json.dumps(
+        [api_url, sorted((str(key), str(value)) for key, value in params.items() if key not in EXCLUDED_PARAMS)],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def is_pinned(params):
+    """
+    Check whether a request asks for a fixed date.
+
+    Responses for a given basDt do not change, while requests without basDt
+    return whatever day is latest and must not be answered from the cache
+    outside of replay mode.
+
+    Args:
+        params (dict): The query parameters.
+
+    Returns:
+        bool: True if the request has a basDt.
+    """
+    return bool(params.get('basDt'))
+
+
+class ResponseCache:
+    """
+    On-disk cache of raw API responses, gzip-compressed and keyed by
+    cache_key().
+
+    The total size is capped; when it is exceeded the least recently used
+    files (by modification time, which is refreshed on every hit) are
+    deleted.
+    """
+
+    def __init__(self, directory, max_bytes=512 * 1024 * 1024, mode=MODE_ON):
+        if mode not in MODES:
+            raise ValueError(f"Unknown API cache mode: {mode}")
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._size = None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def replay(self):
+        return self.mode == MODE_REPLAY
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.json.gz")
+
+    def _files(self):
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith('.json.gz'):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    yield path, stat.st_size, stat.st_mtime
+
+    def size(self):
+        """
+        Get the total size of the cached files.
+
+        Returns:
+            int: The size in bytes.
+        """
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._files())
+            return self._size
+
+    def get(self, api_url, params):
+        """
+        Read a cached response.
+
+        Args:
+            api_url (str): The URL of the API endpoint.
+            params (dict): The query parameters.
+
+        Returns:
+            bytes: The raw response body, or None if it is not cached or
+            the request may not be answered from the cache.
+        """
+        if self.mode == MODE_OFF or (self.mode == MODE_ON and not is_pinned(params)):
+            return None
+        path = self._path(cache_key(api_url, params))
+        try:
+            with gzip.open(path, 'rb') as file:
+                content = file.read()
+            # 조회할 때마다 수정 시각을 갱신해 LRU 순서로 쓴다.
+            os.utime(path)
+        except (OSError, EOFError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return content
+
+    def put(self, api_url, params, content):
+        """
+        Store a raw response and evict old entries beyond the size cap.
+
+        Args:
+            api_url (str): The URL of the API endpoint.
+            params (dict): The query parameters.
+            content (bytes): The raw response body.
+        """
+        if self.mode != MODE_ON:
+            return
+        path = self._path(cache_key(api_url, params))
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            old_size = os.path.getsize(path) if os.path.exists(path) else 0
+            with gzip.open(temp_path, 'wb', compresslevel=6) as file:
+                file.write(content)
+            os.replace(temp_path, path)
+            new_size = os.path.getsize(path)
+        except OSError as e:
+            print(f"Error writing API cache entry: {e}")
+            return
+        total = self.size()
+        with self._lock:
+            self._size = total + new_size - old_size
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """
+        Delete the least recently used entries until the cache fits max_bytes.
+        """
+        with self._lock:
+            files = sorted(self._files(), key=lambda entry: entry[2])
+            total = sum(size for _, size, _ in files)
+            for path, size, _ in files:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
+            self._size = total
+
+
+def get_response_cache():
+    """
+    Build the response cache configured from environment variables.
+
+    Returns:
+        ResponseCache: The cache, or None if API_CACHE_MODE is off.
+    """
+    mode = os.getenv("API_CACHE_MODE", MODE_ON)
+    if mode == MODE_OFF:
+        return None
+    return ResponseCache(
+        directory=os.getenv("API_CACHE_DIR", "/app/data/api_cache"),
+        max_bytes=int(os.getenv("API_CACHE_MAX_BYTES", str(512 * 1024 * 1024))),
+        mode=mode,
+    )
@@ -0,0 +1,152 @@
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+
+from api_fetcher import get_fetcher
+from db_utils import get_db_connection
+from fetch_and_store import get_latest_bas_dts, download_market_data, store_market_data
+from price_store import parse_bas_dt
+
+# basDt 확인 주기 (초). 확인은 1건 조회라 자주 해도 부담이 적다.
+INGEST_INTERVAL_SECONDS = float(os.getenv("INGEST_INTERVAL_SECONDS", "600"))
+# 여러 스케줄러가 떠 있어도 적재는 한 곳에서만 하도록 잡는 advisory lock 키
+INGEST_LOCK_KEY = 724_001
+
+
+def elapsed_ms(started):
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
+def get_last_loaded_bas_dts(cursor):
+    """
+    Get the basDt pair of the last successful ingestion.
+
+    Args:
+        cursor: The database cursor.
+
+    Returns:
+        tuple: (bas_dt, krx_bas_dt) as dates, or None if nothing was loaded yet.
+    """
+    cursor.execute("""
+    SELECT bas_dt, krx_bas_dt FROM ingestion_run
+    WHERE status = 'success'
+    ORDER BY started_at DESC
+    LIMIT 1;
+    """)
+    return cursor.fetchone()
+
+
+def record_run(cursor, run):
+    """
+    Insert one ingestion_run row.
+
+    Args:
+        cursor: The database cursor.
+        run (dict): The run, keyed by ingestion_run column.
+    """
+    run = dict(run, metrics=json.dumps(run.get('metrics') or {}))
+    columns = list(run)
+    cursor.execute(
+        f"INSERT INTO ingestion_run ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))});",
+        [run[column] for column in columns]
+    )
+
+
+def run_once(force=False):
+    """
+    Ingest the latest market data if a new trading day has appeared.
+
+    The latest basDt of both APIs is probed with one-row requests, and the
+    full datasets are only downloaded when it differs from the last
+    successful run. Every download attempt is recorded in ingestion_run.
+
+    Args:
+        force (bool, optional): Download even if basDt has not moved.
+
+    Returns:
+        dict: The recorded run, or None if basDt was unchanged or another
+        scheduler holds the ingestion lock.
+    """
+    conn = get_db_connection()
+    conn.autocommit = True
+    cur = conn.cursor()
+    try:
+        cur.execute("SELECT pg_try_advisory_lock(%s);", (INGEST_LOCK_KEY,))
+        if not cur.fetchone()[0]:
+            print("Another ingestion is running; skipping")
+            return None
+
+        started_at = datetime.now()
+        started = time.perf_counter()
+        metrics = {}
+        run = {'started_at': started_at, 'metrics': metrics}
+        get_fetcher().reset_stats()
+        try:
+            probe_started = time.perf_counter()
+            stock_base_dt, krx_base_dt = get_latest_bas_dts()
+            metrics['probe_ms'] = elapsed_ms(probe_started)
+            run['bas_dt'] = parse_bas_dt(stock_base_dt)
+            run['krx_bas_dt'] = parse_bas_dt(krx_base_dt)
+
+            if not force and get_last_loaded_bas_dts(cur) == (run['bas_dt'], run['krx_bas_dt']):
+                print(f"basDt unchanged ({stock_base_dt}, {krx_base_dt}); skipping download")
+                return None
+
+            download_started = time.perf_counter()
+            stock_data, valid_krx_items = download_market_data(stock_base_dt, krx_base_dt)
+            metrics['download_ms'] = elapsed_ms(download_started)
+            metrics['stock_items'] = len(stock_data)
+            metrics['krx_items'] = len(valid_krx_items)
+
+            store_started = time.perf_counter()
+            counts = store_market_data(stock_data, valid_krx_items, timings=metrics)
+            metrics['store_ms'] = elapsed_ms(store_started)
+            if counts is None:
+                raise Exception("Storing market data failed")
+            run.update(status='success', **counts)
+        except Exception as e:
+            print(f"Ingestion failed: {e}")
+            run.update(status='failed', error=str(e))
+
+        # API 요청별 지연 시간 (probe 포함). 실패한 실행에서도 남긴다.
+        metrics.update(get_fetcher().stats())
+        run['finished_at'] = datetime.now()
+        run['duration_ms'] = int(elapsed_ms(started))
+        record_run(cur, run)
+        print(f"Ingestion {run['status']} in {run['duration_ms']} ms: {metrics}")
+        return run
+    finally:
+        cur.execute("SELECT pg_advisory_unlock_all();")
+        cur.close()
+        conn.close()
+
+
+def run_forever(interval=INGEST_INTERVAL_SECONDS):
+    """
+    Check for a new trading day every `interval` seconds.
+
+    Args:
+        interval (float, optional): Seconds between checks. Defaults to INGEST_INTERVAL_SECONDS.
+    """
+    print(f"Ingestion scheduler started (every {interval:.0f}s)")
+    while True:
+        try:
+            run_once()
+        except Exception as e:
+            # DB 연결 실패 등으로 스케줄러가 죽지 않도록 다음 주기에 다시 시도
+            print(f"Scheduler error: {e}")
+        time.sleep(interval)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest market data whenever a new basDt appears.")
+    parser.add_argument("--once", action="store_true", help="Check once and exit")
+    parser.add_argument("--force", action="store_true", help="Download even if basDt has not moved")
+    parser.add_argument("--interval", type=float, default=INGEST_INTERVAL_SECONDS, help="Seconds between checks")
+    args = parser.parse_args()
+    if args.once or args.force:
+        run_once(force=args.force)
+    else:
+        run_forever(args.interval)
@@ -1,3 +1,6 @@
+-- 확장 (색인보다 먼저 생성)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 -- 테이블 생성 쿼리
 CREATE TABLE IF NOT EXISTS stock_info (
     id SERIAL PRIMARY KEY,
@@ -9,4 +12,57 @@ CREATE TABLE IF NOT EXISTS stock_info (
     corporate_name VARCHAR(255) NOT NULL,
     create_datetime TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     update_datetime TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
\ No newline at end of file
+);
+
+-- 목록 keyset 페이지는 메모리 색인과 같은 순서(코드 포인트)로 정렬한다.
+CREATE INDEX IF NOT EXISTS stock_info_short_code_c_idx ON stock_info (short_code COLLATE "C");
+
+-- 검색(ILIKE '%..%')용 trigram 색인. 색인은 이름으로 비교하므로 정의를 바꾸면 이름도 바꾼다.
+CREATE INDEX IF NOT EXISTS stock_info_short_code_trgm_idx ON stock_info USING gin (short_code gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS stock_info_isin_code_trgm_idx ON stock_info USING gin (isin_code gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS stock_info_market_category_trgm_idx ON stock_info USING gin (market_category gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS stock_info_item_name_trgm_idx ON stock_info USING gin (item_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS stock_info_corporate_number_trgm_idx ON stock_info USING gin (corporate_number gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS stock_info_corporate_name_trgm_idx ON stock_info USING gin (corporate_name gin_trgm_ops);
+
+-- 일별 시세 테이블 (basDt 기준 연도별 파티션, 파티션은 적재 시 생성)
+CREATE TABLE IF NOT EXISTS stock_price (
+    bas_dt DATE NOT NULL,
+    short_code VARCHAR(10) NOT NULL,
+    isin_code VARCHAR(20) NOT NULL,
+    item_name VARCHAR(255) NOT NULL,
+    market_category VARCHAR(10) NOT NULL,
+    clpr BIGINT,
+    vs BIGINT,
+    flt_rt NUMERIC(10,2),
+    mkp BIGINT,
+    hipr BIGINT,
+    lopr BIGINT,
+    trqu BIGINT,
+    tr_prc BIGINT,
+    lstg_st_cnt BIGINT,
+    mrkt_tot_amt BIGINT,
+    PRIMARY KEY (short_code, bas_dt)
+) PARTITION BY RANGE (bas_dt);
+
+CREATE TABLE IF NOT EXISTS stock_price_default PARTITION OF stock_price DEFAULT;
+
+-- 특정 거래일 전 종목 조회(지표, 순위)용
+CREATE INDEX IF NOT EXISTS stock_price_bas_dt_idx ON stock_price (bas_dt);
+
+-- 적재 실행 이력 (scheduler.py). 단계별 소요 시간은 metrics에 기록
+CREATE TABLE IF NOT EXISTS ingestion_run (
+    id SERIAL PRIMARY KEY,
+    started_at TIMESTAMP NOT NULL,
+    finished_at TIMESTAMP,
+    status VARCHAR(20) NOT NULL,
+    bas_dt DATE,
+    krx_bas_dt DATE,
+    duration_ms INTEGER,
+    inserted INTEGER,
+    updated INTEGER,
+    unchanged INTEGER,
+    prices INTEGER,
+    metrics JSONB,
+    error TEXT
+);
@@ -1,9 +1,17 @@
 import { NextResponse } from 'next/server';
 import axios from 'axios';
 
+const NEXT_CURSOR_HEADER = 'x-next-cursor';
+// 백엔드 응답에서 클라이언트로 그대로 전달할 헤더
+const FORWARDED_HEADERS = [NEXT_CURSOR_HEADER, 'etag', 'cache-control'];
+
 export async function GET(request: Request) {
   const { searchParams } = new URL(request.url);
   const query = searchParams.get('query');
+  const limit = searchParams.get('limit') ?? undefined;
+  const cursor = searchParams.get('cursor') ?? undefined;
+  const fields = searchParams.get('fields') ?? undefined;
+  const ifNoneMatch = request.headers.get('if-none-match');
 
   if (!query) {
     return NextResponse.json({ error: 'Query parameter is required' }, { status: 400 });
@@ -11,12 +19,22 @@ export async function GET(request: Request) {
 
   try {
     const response = await axios.get(`http://backend:8000/stocks`, {
-      params: { query }
+      params: { query, limit, cursor, fields },
+      headers: ifNoneMatch ? { 'If-None-Match': ifNoneMatch } : {},
+      validateStatus: (status) => (status >= 200 && status < 300) || status === 304,
     });
-    return NextResponse.json(response.data);
+    const headers: Record<string, string> = {};
+    for (const name of FORWARDED_HEADERS) {
+      if (response.headers[name]) {
+        headers[name] = response.headers[name];
+      }
+    }
+    if (response.status === 304) {
+      return new NextResponse(null, { status: 304, headers });
+    }
+    return NextResponse.json(response.data, { headers });
   } catch (error) {
     console.error("Error fetching stocks from backend:", error);
     return NextResponse.json({ error: 'Error fetching stocks from backend' }, { status: 500 });
   }
 }
-
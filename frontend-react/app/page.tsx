@@ -17,7 +17,7 @@ export default function Home() {
     if (searchQuery.length > 0) {
       try {
         const encodedQuery = encodeURIComponent(searchQuery);
-        const response = await axios.get(`/api/stocks?query=${encodedQuery}`);
+        const response = await axios.get(`/api/stocks?query=${encodedQuery}&limit=10&fields=item_name`);
         setStocks(response.data);
       } catch (error) {
         console.error("Error fetching stocks:", error);